@@ -26,7 +26,7 @@ from pyxtal.tolerance import Tol_matrix
 from pyxtal.version import __version__
 from pyxtal.viz import display_atomic, display_cluster, display_molecular
 from pyxtal.wyckoff_site import atom_site, mol_site
-from pyxtal.wyckoff_split import wyckoff_split
+from pyxtal.wyckoff_split import get_wyckoff_split
 
 # name = "pyxtal"
 
@@ -53,6 +53,51 @@ def print_logo():
     print("Developed by Zhu's group at University of Nevada Las Vegas\n\n")
 
 
+def _from_seeds(seeds, backend, kwargs):
+    """
+    Load a list of seeds, used by `pyxtal.from_seeds`
+    """
+    xtals = []
+    for seed in seeds:
+        try:
+            xtal = pyxtal()
+            xtal.from_seed(seed, backend=backend, **kwargs)
+        except Exception as e:
+            print("Failed to load the seed", e)
+            xtal = None
+        xtals.append(xtal)
+    return xtals
+
+
+def _subgroup_by_ids(xtal, idx, perms, H, eps, group_type, max_cell, min_cell):
+    """
+    Evaluate a list of subgroup ids, used by `pyxtal.subgroup` in parallel
+
+    Returns:
+        the new structures from the valid splitters and the ids of bad splitters
+    """
+    idx, sites, t_types, k_types = xtal._get_subgroup_ids(H, group_type, idx, max_cell, min_cell)
+    new_strucs = []
+    bad_ids = []
+    for id in idx:
+        valid, bad = xtal._get_splitters([id], sites, t_types, k_types, perms)
+        if len(valid) > 0:
+            if perms is None:
+                new_strucs.append(xtal._subgroup_by_splitter(valid[0], eps=eps))
+            else:
+                new_strucs.append(xtal._apply_substitution(valid[0], perms))
+        elif len(bad) > 0:
+            bad_ids.append(id)
+    return new_strucs, bad_ids
+
+
+def _get_transitions_by_path(xtal, path, ref_struc, d_tol, d_tol2, N_images, both):
+    """
+    Evaluate a single path, used by `pyxtal.get_transition` in parallel
+    """
+    return xtal._get_transitions_by_path(path, ref_struc, d_tol, d_tol2, N_images, both)
+
+
 class pyxtal:
     """
     Class for handling atomic crystals based on symmetry constraints
@@ -394,7 +439,8 @@ class pyxtal:
             tol: scale factor for covalent bond distance
             ignore_HH: whether or not ignore short H-H distance in molecules
             add_H: whether or not add H atoms
-            backend: structure parser, default is pymatgen
+            backend: structure parser, default is pymatgen. Use `spglib` to
+                skip the pymatgen symmetrization for atomic crystals
             style: pyxtal for spglib
             standard: whether or not optimize lattice
         """
@@ -421,18 +467,30 @@ class pyxtal:
             if isinstance(seed, dict):
                 self.from_dict()
             elif isinstance(seed, Atoms):  # ASE atoms
-                # from pymatgen.io.ase import AseAtomsAdaptor
-                # pmg_struc = AseAtomsAdaptor.get_structure(seed)
-                from pyxtal.util import ase2pymatgen
+                if backend == "spglib":
+                    cell = (seed.cell[:], seed.get_scaled_positions(), seed.numbers)
+                    self._from_spglib(*cell, tol, a_tol, style=style, hn=hn)
+                else:
+                    # from pymatgen.io.ase import AseAtomsAdaptor
+                    # pmg_struc = AseAtomsAdaptor.get_structure(seed)
+                    from pyxtal.util import ase2pymatgen
 
-                pmg_struc = ase2pymatgen(seed)
-                self._from_pymatgen(pmg_struc, tol, a_tol, style=style)
+                    pmg_struc = ase2pymatgen(seed)
+                    self._from_pymatgen(pmg_struc, tol, a_tol, style=style)
             elif isinstance(seed, Structure):  # Pymatgen
-                self._from_pymatgen(seed, tol, style=style)
+                if backend == "spglib":
+                    cell = (seed.lattice.matrix, seed.frac_coords, seed.atomic_numbers)
+                    self._from_spglib(*cell, tol, a_tol, style=style, hn=hn)
+                else:
+                    self._from_pymatgen(seed, tol, style=style)
             elif isinstance(seed, str):
                 if backend == "pymatgen":
                     pmg_struc = Structure.from_file(seed, primitive=True)
                     self._from_pymatgen(pmg_struc, tol, a_tol, style=style)
+                elif backend == "spglib":
+                    pmg_struc = Structure.from_file(seed, primitive=True)
+                    cell = (pmg_struc.lattice.matrix, pmg_struc.frac_coords, pmg_struc.atomic_numbers)
+                    self._from_spglib(*cell, tol, a_tol, style=style, hn=hn)
                 else:
                     # Need to check
                     self.lattice, self.atom_sites = read_cif(seed)
@@ -517,6 +575,82 @@ class pyxtal:
             # if not sm.StructureMatcher().fit(struc, pmg1):
             #    raise RuntimeError("The structure is inconsistent after conversion")
 
+    def _from_spglib(self, lattice, positions, numbers, tol=1e-3, a_tol=5.0, style="pyxtal", hn=None):
+        """
+        Load structure from the raw arrays with a single spglib call,
+        a lean version of `_from_pymatgen`
+        should not be used directly
+
+        Args:
+            lattice: 3*3 matrix
+            positions: N*3 fractional coordinates
+            numbers: N atomic numbers
+            tol: symmetry tolerance
+            a_tol: angle tolerance
+            style: 'pyxtal' or spglib, differing in the choice of origin
+            hn: hall_number
+        """
+        from pyxtal.util import get_symmetry_sites
+
+        number, _, matrix, sites = get_symmetry_sites(lattice, positions, numbers, tol, a_tol, style, hn)
+        self.valid = True
+        if hn is None:
+            self.group = Group(number, style=style)
+        else:
+            self.group = Group(hn, use_hall=True)
+        self.lattice = Lattice.from_matrix(matrix, ltype=self.group.lattice_type)
+
+        self.species = []
+        self.numIons = []
+        self.atom_sites = []
+        for specie, letter, pos in sites:
+            wp = self.group[letter].copy()
+            pos1 = wp.search_generator(pos, self.group[0], tol=tol)
+            if pos1 is None:
+                pos1, wp, _ = self.group[0].merge(pos, matrix, 1e-3)
+                if pos1 is None:
+                    print("Problem in ", specie, letter, pos)
+                    raise RuntimeError("Cannot extract the right mapping from spglib")
+            site = atom_site(wp, pos1, specie)
+            self.atom_sites.append(site)
+            if site.specie not in self.species:
+                self.species.append(site.specie)
+                self.numIons.append(0)
+            self.numIons[self.species.index(site.specie)] += wp.multiplicity
+
+    @staticmethod
+    def from_seeds(seeds, ncpu=1, backend="spglib", **kwargs):
+        """
+        Load a list of atomic seed structures in batch
+
+        Args:
+            seeds: list of cif/poscar files, Pymatgen or ASE structures
+            ncpu: number of parallel processes
+            backend: structure parser, default is spglib
+            kwargs: other options passed to `from_seed`
+
+        Returns:
+            a list of pyxtal objects (None if failed)
+        """
+        if ncpu == 1:
+            return _from_seeds(seeds, backend, kwargs)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            N_cycle = int(np.ceil(len(seeds) / ncpu))
+            args_list = []
+            for i in range(ncpu):
+                id1 = i * N_cycle
+                id2 = min([id1 + N_cycle, len(seeds)])
+                args_list.append((seeds[id1:id2], backend, kwargs))
+
+            xtals = []
+            with ProcessPoolExecutor(max_workers=ncpu) as executor:
+                results = [executor.submit(_from_seeds, *p) for p in args_list]
+                for result in results:
+                    xtals.extend(result.result())
+            return xtals
+
     def are_valid_numIons(self):
         """
         Check if the numIons are correct for debugging
@@ -696,6 +830,7 @@ class pyxtal:
         max_cell=4,
         min_cell=0,
         N_groups=None,
+        ncpu=1,
     ):
         """
         Generate a structure with lower symmetry
@@ -709,23 +844,108 @@ class pyxtal:
             max_cell (float): maximum cell reconstruction
             min_cell (float): maximum cell reconstruction
             max_subgroups (int): maximum number of trial subgroups
+            ncpu (int): number of parallel processes to evaluate the splitters
+
         Returns:
             a list of pyxtal structures with lower symmetries
         """
+        if ncpu == 1:
+            return list(self.subgroup_generator(perms, H, eps, idx, group_type, max_cell, min_cell, N_groups))
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        idx, sites, t_types, k_types = self._get_subgroup_ids(H, group_type, idx, max_cell, min_cell)
+        if N_groups is not None and len(idx) >= N_groups:
+            idx = sample(idx, N_groups)
+
+        N_cycle = int(np.ceil(len(idx) / ncpu))
+        args_list = []
+        for i in range(ncpu):
+            ids = idx[i * N_cycle : (i + 1) * N_cycle]
+            if len(ids) > 0:
+                args_list.append((self, ids, perms, H, eps, group_type, max_cell, min_cell))
+
+        new_strucs = []
+        bad_ids = []
+        with ProcessPoolExecutor(max_workers=ncpu) as executor:
+            results = [executor.submit(_subgroup_by_ids, *p) for p in args_list]
+            for result in results:
+                (strucs, ids) = result.result()
+                new_strucs.extend(strucs)
+                bad_ids.extend(ids)
+
+        if len(new_strucs) == 0:
+            _, bad_splitters = self._get_splitters(bad_ids, sites, t_types, k_types, perms)
+            for splitter in bad_splitters:
+                trail_struc = self._subgroup_by_splitter(splitter, eps=eps)
+                if trail_struc is not None:
+                    new_strucs.extend(trail_struc.subgroup(perms, group_type=group_type, ncpu=ncpu))
+        return new_strucs
+
+    def subgroup_generator(
+        self,
+        perms=None,
+        H=None,
+        eps=0.05,
+        idx=None,
+        group_type="t",
+        max_cell=4,
+        min_cell=0,
+        N_groups=None,
+    ):
+        """
+        Generate the structures with lower symmetry one by one,
+        see `subgroup` for the arguments
 
+        Yields:
+            pyxtal structures with lower symmetries
+        """
         idx, sites, t_types, k_types = self._get_subgroup_ids(H, group_type, idx, max_cell, min_cell)
         # randomly choose a subgroup from the available list
         if N_groups is not None and len(idx) >= N_groups:
             idx = sample(idx, N_groups)
             # print('max_sub_group', len(idx), max_subgroups)
 
+        valid_splitters, bad_splitters = self._get_splitters(idx, sites, t_types, k_types, perms)
+
+        if len(valid_splitters) == 0:
+            # print("try do one more step")
+            for splitter in bad_splitters:
+                trail_struc = self._subgroup_by_splitter(splitter, eps=eps)
+                if trail_struc is not None:
+                    yield from trail_struc.subgroup_generator(perms, group_type=group_type)
+        else:
+            # print(len(valid_splitters), "valid_splitters are present")
+            for splitter in valid_splitters:
+                # print(splitter)
+                if perms is None:
+                    new_struc = self._subgroup_by_splitter(splitter, eps=eps)
+                else:
+                    new_struc = self._apply_substitution(splitter, perms)
+                # if not new_struc.are_valid_numIons(): print(new_struc); import sys; sys.exit()
+                yield new_struc
+
+    def _get_splitters(self, idx, sites, t_types, k_types, perms=None):
+        """
+        Get the valid and bad splitters from the list of subgroup ids
+
+        Args:
+            idx: list of subgroup ids
+            sites: list of wp labels
+            t_types: list of `t`
+            k_types: list of `k`
+            perms: e.g., {"Si": "C"}
+
+        Returns:
+            valid_splitters and bad_splitters
+        """
         valid_splitters = []
         bad_splitters = []
         for id in idx:
             gtype = (t_types + k_types)[id]
             if gtype == "k":
                 id -= len(t_types)
-            splitter = wyckoff_split(G=self.group, wp1=sites, idx=id, group_type=gtype)
+            splitter = get_wyckoff_split(self.group, id, sites, gtype)
 
             if not splitter.error:
                 if perms is None:
@@ -752,27 +972,7 @@ class pyxtal:
                             bad_splitters.append(splitter)
                     else:
                         valid_splitters.append(splitter)
-
-        if len(valid_splitters) == 0:
-            # print("try do one more step")
-            new_strucs = []
-            for splitter in bad_splitters:
-                trail_struc = self._subgroup_by_splitter(splitter, eps=eps)
-                if trail_struc is not None:
-                    new_strucs.extend(trail_struc.subgroup(perms, group_type=group_type))
-            return new_strucs
-        else:
-            # print(len(valid_splitters), "valid_splitters are present")
-            new_strucs = []
-            for splitter in valid_splitters:
-                # print(splitter)
-                if perms is None:
-                    new_struc = self._subgroup_by_splitter(splitter, eps=eps)
-                else:
-                    new_struc = self._apply_substitution(splitter, perms)
-                # if not new_struc.are_valid_numIons(): print(new_struc); import sys; sys.exit()
-                new_strucs.append(new_struc)
-            return new_strucs
+        return valid_splitters, bad_splitters
 
     def subgroup_by_path(self, gtypes, ids, eps=0, mut_lat=False):
         """
@@ -795,7 +995,7 @@ class pyxtal:
             _sites = struc.mol_sites if self.molecular else struc.atom_sites
             sites = [site.wp.index for site in _sites]
             # print(G.number, id, g_type, sites)
-            splitter = wyckoff_split(G, wp1=sites, idx=id, group_type=g_type)
+            splitter = get_wyckoff_split(G, id, sites, g_type)
             struc = struc._subgroup_by_splitter(splitter, eps=eps, mut_lat=mut_lat)
             if struc is None:
                 return None
@@ -843,7 +1043,7 @@ class pyxtal:
             if gtype == "k":
                 id -= len(t_types)
             # print(self.group.number, sites, id, gtype, idx)
-            splitter = wyckoff_split(G=self.group.number, wp1=sites, idx=id, group_type=gtype)
+            splitter = get_wyckoff_split(self.group.number, id, sites, gtype)
             if not splitter.error:
                 if perms is not None:
                     if len(splitter.H_orbits) == 1:
@@ -1123,18 +1323,20 @@ class pyxtal:
             total_coords (N*3 numpy array) and the list of species
         """
         species = []
-        total_coords = None
+        coords = []
         if self.molecular:
             for site in self.mol_sites:
-                coords, site_species = site.get_coords_and_species(absolute, unitcell=unitcell)
+                site_coords, site_species = site.get_coords_and_species(absolute, unitcell=unitcell)
                 species.extend(site_species)
-                total_coords = coords if total_coords is None else np.append(total_coords, coords, axis=0)
+                coords.append(site_coords)
+            total_coords = np.concatenate(coords) if len(coords) > 0 else None
         else:
             for site in self.atom_sites:
                 species.extend([site.specie] * site.multiplicity)
-                total_coords = site.coords if total_coords is None else np.append(total_coords, site.coords, axis=0)
+                coords.append(site.coords)
+            total_coords = np.concatenate(coords) if len(coords) > 0 else None
 
-            if absolute:
+            if absolute and total_coords is not None:
                 total_coords = total_coords.dot(self.lattice.matrix)
 
         return total_coords, species
@@ -2244,7 +2446,7 @@ class pyxtal:
                     sites.append(site)
         self.atom_sites = sites
 
-    def get_transition(self, ref_struc, d_tol=1.0, d_tol2=0.3, N_images=2, max_path=30, both=False):
+    def get_transition(self, ref_struc, d_tol=1.0, d_tol2=0.3, N_images=2, max_path=30, both=False, ncpu=1):
         """
         Get the splitted wyckoff information along a given path:
 
@@ -2255,6 +2457,7 @@ class pyxtal:
             N_images: number of intermediate images
             max_path: maximum number of paths
             both: whether or not do interpolation along both sides
+            ncpu: number of parallel processes to evaluate the paths
 
         Returns:
             - strucs:
@@ -2274,62 +2477,84 @@ class pyxtal:
             if Skipped > 0:
                 paths = paths[:max_path]  # sample(paths, max_path)
 
-            good_ds = []
-            good_strucs = []
-            good_disps = []
-            good_paths = []
-            good_trans = []
-            good_splitters = []
-
-            for p in paths:
-                r = self.get_transition_by_path(ref_struc, p, d_tol, d_tol2, N_images, both)
-                (strucs, disp, tran, count, sps) = r
-                if count == 0:
-                    # prepare more paths to increase diversity
-                    add_paths = self.group.add_k_transitions(p)
-                    for p0 in add_paths:
-                        r = self.get_transition_by_path(ref_struc, p0, d_tol, d_tol2, N_images, both)
-                        (strucs, disp, tran, count, sps) = r
-                        if strucs is not None:
-                            if strucs[-1].disp < d_tol2:  # stop
-                                return strucs, disp, tran, p0, sps
-                            else:
-                                good_ds.append(strucs[-1].disp)
-                                good_disps.append(disp)
-                                good_paths.append(p0)
-                                good_strucs.append(strucs)
-                                good_trans.append(tran)
-                                good_splitters.append(sps)
-                else:
-                    if strucs is not None:
-                        if strucs[-1].disp < d_tol2:
-                            return strucs, disp, tran, p, sps
-                        else:
-                            good_ds.append(strucs[-1].disp)
-                            good_disps.append(disp)
-                            good_paths.append(p)
-                            good_strucs.append(strucs)
-                            good_trans.append(tran)
-                            good_splitters.append(sps)
-                # Early stop
-                if len(good_ds) > 5:
-                    break
-            if len(good_ds) > 0:
-                # print("Number of candidate path:", len(good_ds))
-                good_ds = np.array(good_ds)
-                id = np.argmin(good_ds)
-                return (
-                    good_strucs[id],
-                    good_disps[id],
-                    good_trans[id],
-                    good_paths[id],
-                    good_splitters[id],
-                )
+            args = (ref_struc, d_tol, d_tol2, N_images, both)
+            goods = []
+            if ncpu == 1:
+                for p in paths:
+                    for res in self._get_transitions_by_path(p, *args):
+                        if res[0][-1].disp < d_tol2:  # stop
+                            return res
+                        goods.append(res)
+                    # Early stop
+                    if len(goods) > 5:
+                        break
+            else:
+                from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+                with ProcessPoolExecutor(max_workers=ncpu) as executor:
+                    jobs = [executor.submit(_get_transitions_by_path, self, p, *args) for p in paths]
+                    futures = {future: i for i, future in enumerate(jobs)}
+                    pending = set(futures)
+                    results = {}
+                    # only check the paths in order as in the serial mode
+                    n_done = 0
+                    try:
+                        while n_done < len(paths) and len(goods) <= 5:  # Early stop
+                            if n_done not in results:
+                                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                                for future in done:
+                                    results[futures[future]] = future.result()
+                                continue
+                            for res in results.pop(n_done):
+                                if res[0][-1].disp < d_tol2:  # stop
+                                    return res
+                                goods.append(res)
+                            n_done += 1
+                    finally:
+                        # cancel the queued paths, the running ones finish on exit
+                        for future in pending:
+                            future.cancel()
+
+            if len(goods) > 0:
+                # print("Number of candidate path:", len(goods))
+                id = np.argmin([res[0][-1].disp for res in goods])
+                return goods[id]
 
             if Skipped > 0:
                 print("Warning: ignore some solutions: ", Skipped)
 
-            return None, None, None, p, None
+            return None, None, None, paths[-1], None
+
+    def _get_transitions_by_path(self, path, ref_struc, d_tol, d_tol2=0.5, N_images=2, both=False):
+        """
+        Get the transitions along a given path, or along its k-transition
+        extensions if the wyckoff sites cannot be matched.
+
+        Args:
+            path: a list of transition path
+            ref_struc: structure with subgroup symmetry
+            d_tol: maximally allowed atomic displacement
+            d_tol2: displacement that allows early termination
+            N_images: number of intermediate images
+            both: interpolation on both sides
+
+        Returns:
+            a list of (strucs, displacements, cell translation, path, splitters)
+        """
+        results = []
+        (strucs, disp, tran, count, sps) = self.get_transition_by_path(ref_struc, path, d_tol, d_tol2, N_images, both)
+        if count == 0:
+            # prepare more paths to increase diversity
+            for p0 in self.group.add_k_transitions(path):
+                r = self.get_transition_by_path(ref_struc, p0, d_tol, d_tol2, N_images, both)
+                (strucs, disp, tran, count, sps) = r
+                if strucs is not None:
+                    results.append((strucs, disp, tran, p0, sps))
+                    if strucs[-1].disp < d_tol2:  # stop
+                        break
+        elif strucs is not None:
+            results.append((strucs, disp, tran, path, sps))
+        return results
 
     def get_transition_by_path(self, ref_struc, path, d_tol, d_tol2=0.5, N_images=2, both=False):
         """
@@ -2990,12 +3215,62 @@ class pyxtal:
 
         self.cutoff = cutoff
 
-    def set_site_coordination(self, cutoff=None, verbose=False, exclude_ii=False):
+    def get_neighbor_list(self, rmax):
         """
-        Compute the coordination number from each atomic site
+        Get the neighbor list of all atoms in the unit cell, following the
+        `ase.neighborlist.neighbor_list` convention. The list is cached until
+        the lattice or atomic coordinates change, and a shorter rmax is
+        simply filtered from the cached list.
+
+        Args:
+            rmax (float): cutoff distance
+
+        Returns:
+            i, j, d, S: center ids, neighbor ids, distances and cell shifts
         """
         from ase.neighborlist import neighbor_list
 
+        atoms = self.to_ase(resort=False)
+        key = (atoms.cell.array.tobytes(), atoms.positions.tobytes(), atoms.numbers.tobytes())
+        cache = getattr(self, "_neighbor_cache", None)
+        if cache is None or cache[0] != key or cache[1] < rmax:
+            self._neighbor_cache = (key, rmax, neighbor_list("ijdS", atoms, rmax), atoms.numbers)
+            cache = self._neighbor_cache
+
+        i, j, d, S = cache[2]
+        if rmax < cache[1]:
+            mask = d < rmax
+            i, j, d, S = i[mask], j[mask], d[mask], S[mask]
+        return i, j, d, S
+
+    def get_bonds(self, cutoff):
+        """
+        Get all bonded pairs from the cached neighbor list
+
+        Args:
+            cutoff (dict): the max bond distance for each pair of elements,
+                e.g., {('Si', 'O'): 2.0}, pairs not in the dict are ignored
+
+        Returns:
+            i, j, d, S: center ids, neighbor ids, distances and cell shifts
+        """
+        from pymatgen.core.periodic_table import Element
+
+        cutoffs = np.zeros([119, 119])
+        for (s1, s2), value in cutoff.items():
+            z1, z2 = Element(s1).Z, Element(s2).Z
+            cutoffs[z1, z2] = cutoffs[z2, z1] = value
+
+        rmax = max(cutoff.values()) if len(cutoff) > 0 else 0
+        i, j, d, S = self.get_neighbor_list(rmax)
+        numbers = self._neighbor_cache[3]
+        mask = d < cutoffs[numbers[i], numbers[j]]
+        return i[mask], j[mask], d[mask], S[mask]
+
+    def set_site_coordination(self, cutoff=None, verbose=False, exclude_ii=False):
+        """
+        Compute the coordination number from each atomic site
+        """
         # if not hasattr(self, 'cutoff'):
         self.set_cutoff(exclude_ii, cutoff)
         my_cutoff = self.cutoff
@@ -3004,8 +3279,7 @@ class pyxtal:
             print("\n The cutoff values for CN calculation are")
             print(my_cutoff)
 
-        atoms = self.to_ase(resort=False)
-        NL = neighbor_list("i", atoms, my_cutoff)
+        NL = self.get_bonds(my_cutoff)[0]
         coords = np.bincount(NL)
 
         count = 0
@@ -3018,134 +3292,210 @@ class pyxtal:
 
     def get_dimensionality(self, cutoff=None):
         """
-        A quick wrapper to compute dimensionality from pymatgen
-        https://pymatgen.org/pymatgen.analysis.dimensionality.html
-        The dimensionality of the structure can be 1/2/3
+        Compute the dimensionality from the bonded network. The atoms are
+        grouped into the connected components of the bond graph, and the
+        dimensionality of each component is the rank of the cell shifts
+        accumulated along its closed loops. The output follows the
+        convention of pymatgen's `get_dimensionality_gorai`, i.e.,
+        1 (molecules/chains), 2 (layered), or 3 (3D).
+
+        Args:
+            cutoff: dict of max bond distances or a single float value
+
+        Returns:
+            the dimensionality (int)
         """
-        from pymatgen.analysis.dimensionality import get_dimensionality_gorai
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import breadth_first_order, connected_components
 
         if cutoff is None:
             if not hasattr(self, "cutoff"):
                 self.set_cutoff()
             cutoff = self.cutoff
-
-        return get_dimensionality_gorai(self.to_pymatgen(), bonds=cutoff)
-
-    def from_CSD(self, csd_code):
+        elif not isinstance(cutoff, dict):
+            species = self.species
+            cutoff = {(s1, s2): cutoff for s1 in species for s2 in species}
+
+        i, j, _, S = self.get_bonds(cutoff)
+        N = len(self._neighbor_cache[3])
+        graph = coo_matrix((np.ones(len(i)), (i, j)), shape=(N, N)).tocsr()
+        _, labels = connected_components(graph, directed=False)
+
+        # unwrap each component to get the cell shift of each atom
+        shifts = {}
+        for k in range(len(i)):
+            shifts[(i[k], j[k])] = S[k]
+        offsets = np.zeros([N, 3], dtype=int)
+        roots = np.unique(labels, return_index=True)[1]
+        for root in roots:
+            ids, parents = breadth_first_order(graph, root, directed=False)
+            for id in ids[1:]:
+                offsets[id] = offsets[parents[id]] + shifts[(parents[id], id)]
+
+        # the loops that cross the cell boundary
+        loops = offsets[i] + S - offsets[j]
+        dim = 0
+        for label in np.unique(labels[i]):
+            vecs = loops[labels[i] == label]
+            dim = max(dim, np.linalg.matrix_rank(vecs))
+        return max(dim, 1)
+
+    def from_CSD(self, csd_code, cache=None):
         """
         Download the crystal from CCDC
         if csd_code is given, return the single pyxtal object
         if csd_family is given, do group analysis and ignore high pressure form
 
+        The entry is first looked up in the local cache (see
+        `pyxtal.database.cache.CSD_cache`), so that neither the network nor
+        the CSD-python api is needed for a hit. The newly downloaded entry
+        is saved to the cache.
+
         Args:
             csd_code: e.g., ``ACSALA01``
+            cache: `CSD_cache` object or folder, ``False`` to disable the cache
+        """
+        from pyxtal.database.cache import CSD_cache
+        from pyxtal.msg import CSDError
+        from pyxtal.util import get_unique_smiles
+
+        if cache is False:
+            cache = None
+        elif cache is None or isinstance(cache, str):
+            cache = CSD_cache(cache)
 
+        cached = None if cache is None else cache.get(csd_code)
+        if cached is not None and cached["xtal"] is not None:
+            self.load_dict(cached["xtal"])
+            self.tag = {
+                "smiles": get_unique_smiles(cached["smiles"]),
+                "csd_code": csd_code,
+                "ccdc_number": cached["ccdc_number"],
+            }
+            return
+
+        if cached is not None:
+            cif, smi, ccdc_number = cached["cif"], cached["smiles"], cached["ccdc_number"]
+        else:
+            try:
+                from ccdc import io
+            except:
+                msg = "No CSD-python api is available"
+                raise CSDError(msg)
+
+            try:
+                entry = io.EntryReader("CSD").entry(csd_code)
+            except:
+                msg = "Unknown CSD entry: " + csd_code
+                raise CSDError(msg)
+
+            if not entry.has_3d_structure:
+                msg = csd_code + " does not have 3D structure"
+                raise CSDError(msg)
+            smi = entry.molecule.smiles
+            cif = entry.to_string(format="cif")
+            ccdc_number = entry.ccdc_number
+
+        self.from_CSD_cif(csd_code, cif, smi, ccdc_number)
+        if cache is not None:
+            # the structure is still usable if the cache folder is read-only
+            try:
+                cache.put(csd_code, cif, smi, ccdc_number, self.save_dict())
+            except OSError as e:
+                print("Cannot save to the CSD cache", e)
+
+    def from_CSD_cif(self, csd_code, cif, smi, ccdc_number=None):
+        """
+        Build the crystal from the cif string and smiles of a CSD entry
+
+        Args:
+            csd_code: e.g., ``ACSALA01``
+            cif: cif string from CSD
+            smi: smiles string, e.g., ``CC(=O)Oc1ccccc1C(O)=O``
+            ccdc_number: ccdc deposition number
         """
         from pymatgen.core.periodic_table import Element
         from pymatgen.io.cif import CifParser
 
         from pyxtal.msg import CSDError, ReadSeedError
-        from pyxtal.util import get_struc_from__parser, process_csd_cif
+        from pyxtal.util import get_struc_from__parser, get_unique_smiles, process_csd_cif
 
-        try:
-            from ccdc import io
-        except:
-            msg = "No CSD-python api is available"
-            raise CSDError(msg)
         try:
             from rdkit import Chem
         except:
             msg = "No rdkit is available"
             raise CSDError(msg)
 
+        if smi is None:
+            raise CSDError("No smile from CSD")
+        elif len(smi) > 350:
+            raise CSDError(f"long smile {smi:s}")
+        else:
+            if Chem.MolFromSmiles(smi) is None:
+                raise CSDError(f"problematic smiles: {smi:s}")
+
+        # remove duplicates
+        smi1 = get_unique_smiles(smi)
+        smiles = [s + ".smi" for s in smi1.split(".")]
+
+        self.tag = {
+            "smiles": smi1,
+            "csd_code": csd_code,
+            "ccdc_number": ccdc_number,
+            #'publication': entry.publication,
+        }
+
+        cif = process_csd_cif(cif)  # , remove_H=True)
+        # print(cif)
         try:
-            entry = io.EntryReader("CSD").entry(csd_code)
+            parser = CifParser.from_str(cif, occupancy_tolerance=2.0)
+            pmg = get_struc_from__parser(parser)
+            # pmg = Structure.from_str(cif, fmt='cif')
         except:
-            msg = "Unknown CSD entry: " + csd_code
+            print(cif)
+            msg = "Problem in parsing CSD cif"
             raise CSDError(msg)
 
-        if entry.has_3d_structure:
-            smi = entry.molecule.smiles
-            if smi is None:
-                raise CSDError("No smile from CSD")
-            elif len(smi) > 350:
-                raise CSDError(f"long smile {smi:s}")
-            else:
-                if Chem.MolFromSmiles(smi) is None:
-                    raise CSDError(f"problematic smiles: {smi:s}")
-
-            cif = entry.to_string(format="cif")
-            smiles = [s + ".smi" for s in smi.split(".")]
-
-            # remove duplicates
-            smiles = list(set(smiles))
-            smi1 = ""
-            for i, s in enumerate(smiles):
-                smi1 += s[:-4]
-                if i + 1 < len(smiles):
-                    smi1 += "."
-
-            self.tag = {
-                "smiles": smi1,
-                "csd_code": csd_code,
-                "ccdc_number": entry.ccdc_number,
-                #'publication': entry.publication,
-            }
+        organic = True
+        for ele in pmg.composition.elements:
+            if ele.symbol == "D":
+                pmg.replace_species({ele: Element("H")})
+            elif ele.value not in [
+                "C",
+                "Si",
+                "H",
+                "O",
+                "N",
+                "S",
+                "F",
+                "Cl",
+                "Br",
+                "I",
+                "P",
+            ]:
+                organic = False
+                break
 
-            cif = process_csd_cif(cif)  # , remove_H=True)
-            # print(cif)
+        if not organic:
+            msg = "Cannot handle the organometallic entry from CSD: "
+            msg += pmg.composition.formula
+            raise CSDError(msg)
+        else:
+            # print(smiles); self.from_seed(pmg, smiles)
             try:
-                parser = CifParser.from_str(cif, occupancy_tolerance=2.0)
-                pmg = get_struc_from__parser(parser)
-                # pmg = Structure.from_str(cif, fmt='cif')
-            except:
-                print(cif)
-                msg = "Problem in parsing CSD cif"
-                raise CSDError(msg)
-
-            organic = True
-            for ele in pmg.composition.elements:
-                if ele.symbol == "D":
-                    pmg.replace_species({ele: Element("H")})
-                elif ele.value not in [
-                    "C",
-                    "Si",
-                    "H",
-                    "O",
-                    "N",
-                    "S",
-                    "F",
-                    "Cl",
-                    "Br",
-                    "I",
-                    "P",
-                ]:
-                    organic = False
-                    break
-
-            if not organic:
-                msg = "Cannot handle the organometallic entry from CSD: "
-                msg += entry.formula
-                raise CSDError(msg)
-            else:
-                # print(smiles); self.from_seed(pmg, smiles)
+                # print(smiles)#; import sys; sys.exit()
+                self.from_seed(pmg, smiles)
+            except ReadSeedError:
                 try:
-                    # print(smiles)#; import sys; sys.exit()
-                    self.from_seed(pmg, smiles)
-                except ReadSeedError:
-                    try:
-                        # print("Add_H=============================================")
-                        self.from_seed(pmg, smiles, add_H=True)
-                    except:
-                        msg = f"unknown problems in Reading CSD {csd_code:s} {smi:s}"
-                        raise CSDError(msg)
+                    # print("Add_H=============================================")
+                    self.from_seed(pmg, smiles, add_H=True)
                 except:
                     msg = f"unknown problems in Reading CSD {csd_code:s} {smi:s}"
                     raise CSDError(msg)
-            self.source = "CSD: " + csd_code
-        else:
-            msg = csd_code + " does not have 3D structure"
-            raise CSDError(msg)
+            except:
+                msg = f"unknown problems in Reading CSD {csd_code:s} {smi:s}"
+                raise CSDError(msg)
+        self.source = "CSD: " + csd_code
 
         # check if the dumped cif is correct
         cif0 = self.to_file()
@@ -3500,7 +3850,7 @@ class pyxtal:
 
         if "Dimension" in criteria:
             try:
-                dim1 = self.get_dimensionality(criteria_cutoff)
+                dim1 = self.get_dimensionality(criteria.get("cutoff"))
             except:
                 dim1 = 3
             dim2 = criteria["Dimension"]
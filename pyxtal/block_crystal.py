@@ -3,6 +3,8 @@ Module for generating crystals based on building blocks
 """
 
 # Standard Libraries
+from copy import deepcopy
+
 import numpy as np
 
 # External Libraries
@@ -15,6 +17,82 @@ from pyxtal.molecular_crystal import molecular_crystal as mol_xtal
 from pyxtal.molecule import Orientation, compare_mol_connectivity, pyxtal_molecule
 from pyxtal.wyckoff_site import mol_site
 
+# cached block templates keyed by the block, molecules and tolerance
+_block_cache = {}
+
+
+def _get_key(mol):
+    """
+    Hashable key of a molecule given by the name/smiles or pymatgen object
+    """
+    if isinstance(mol, str):
+        return mol
+    xyz = np.round(mol.cart_coords, 4) + 0.0
+    return (tuple(mol.atomic_numbers), xyz.tobytes())
+
+
+def get_block_template(block, molecules, tm):
+    """
+    Match the molecules in the building block to the given molecules and
+    rearrange the block atoms in the same order. The matching is cached
+    so that it is done only once for the same block and molecules.
+
+    Args:
+        block: the building block (name or pymatgen Molecule)
+        molecules: list of molecules (smiles or pymatgen Molecule)
+        tm: Tol_matrix object for the block molecule
+
+    Returns:
+        p_block: pyxtal_molecule of the rearranged block
+        xtal_mols: list of pyxtal_molecule objects
+    """
+    key = (
+        _get_key(block),
+        tuple(_get_key(m) for m in molecules),
+        tm.prototype,
+        tm.f,
+        str(tm.custom_values),
+    )
+    if key not in _block_cache:
+        p_mol = pyxtal_molecule(block)
+        block_mols = search_molecules_in_crystal(p_mol.mol, tol=0.2, once=False)
+        xtal_mols = [pyxtal_molecule(m, fix=True) for m in molecules]
+
+        orders = []
+        for m1 in xtal_mols:
+            for m2 in block_mols:
+                if len(m1.mol) == len(m2):
+                    # match, mapping = compare_mol_connectivity(m2, m1.mol)
+                    match, mapping = compare_mol_connectivity(m1.mol, m2)
+                    # print(match, len(m1.mol), len(m2))
+                    if match:
+                        orders.append([mapping[at] for at in range(len(m2))])
+                        break
+
+        if len(orders) != len(molecules):
+            raise ValueError("Block is inconsistent with the molecules")
+
+        # rearrange the order of block molecules
+        numbers = []
+        coords = np.zeros([len(p_mol.mol), 3])
+        count = 0
+        for order, m in zip(orders, block_mols):
+            numbers.extend([m.atomic_numbers[o] for o in order])
+            coords[count : count + len(m)] += m.cart_coords[order]
+            count += len(m)
+        mol = Molecule(numbers, coords)
+
+        if len(_block_cache) > 100:
+            _block_cache.clear()
+        _block_cache[key] = (pyxtal_molecule(mol, tm=tm), xtal_mols)
+
+    # the molecules will be modified when making the crystal,
+    # while the tolerance matrix is read-only and can be shared
+    p_block, xtal_mols = _block_cache[key]
+    p_block = deepcopy(p_block, {id(p_block.tm): p_block.tm})
+    xtal_mols = [deepcopy(m, {id(m.tm): m.tm}) for m in xtal_mols]
+    return p_block, xtal_mols
+
 
 def block_crystal(
     dim,
@@ -55,47 +133,15 @@ def block_crystal(
         )
 
     else:
-        p_mol = pyxtal_molecule(block)
-        block_mols = search_molecules_in_crystal(p_mol.mol, tol=0.2, once=False)
-        xtal_mols = [pyxtal_molecule(m, fix=True) for m in molecules]
-
-        orders = []
-        for m1 in xtal_mols:
-            for m2 in block_mols:
-                if len(m1.mol) == len(m2):
-                    # match, mapping = compare_mol_connectivity(m2, m1.mol)
-                    match, mapping = compare_mol_connectivity(m1.mol, m2)
-                    # print(match, len(m1.mol), len(m2))
-                    if match:
-                        orders.append([mapping[at] for at in range(len(m2))])
-                        break
-                        # print(mapping)
-                        # print("smile"); print(m1.mol.to('xyz'))
-                        # print("reference"); print(m2.to('xyz'))
-                        # print(orders[-1])
-                        # import sys; sys.exit()
-
-        if len(orders) != len(molecules):
-            raise ValueError("Block is inconsistent with the molecules")
-
-        # rearrange the order of block molecules
-        numbers = []
-        coords = np.zeros([len(p_mol.mol), 3])
-        count = 0
-        for order, m in zip(orders, block_mols):
-            numbers.extend([m.atomic_numbers[o] for o in order])
-            coords[count : count + len(m)] += m.cart_coords[order]
-            count += len(m)
-        mol = Molecule(numbers, coords)
+        p_block, xtal_mols = get_block_template(block, molecules, tm)
         if num_block is not None:
             num_block = [num_block]
-        # print(mol.to('xyz')); import sys; sys.exit()
 
         for i in range(10):
             struc = mol_xtal(
                 dim,
                 group,
-                [mol],
+                [p_block],
                 num_block,
                 factor,
                 thickness=thickness,
@@ -141,6 +187,68 @@ def block_crystal(
         return struc
 
 
+def block_crystals(
+    N,
+    group,
+    molecules,
+    block,
+    num_block=None,
+    dim=3,
+    factor=1.1,
+    lattice=None,
+    sites=None,
+    tm=None,
+    max_count=10,
+):
+    """
+    Generate a batch of random crystals from the same building block.
+    The block template is set up once and shared by all structures.
+
+    Args:
+        N (int): number of structures
+        group (int): the group number
+        molecules (list): list of molecules (smiles or pymatgen Molecule)
+        block: the building block (name or pymatgen Molecule)
+        num_block (int): number of blocks in the primitive cell
+        dim (int): dimension
+        factor (float): volume factor
+        lattice (optional): Lattice object to define the cell
+        sites (optional): pre-assigned wyckoff sites
+        tm (optional): Tol_matrix object
+        max_count (int): maximum attempts for each structure
+
+    Returns:
+        a list of pyxtal objects
+    """
+    from pyxtal import pyxtal
+    from pyxtal.tolerance import Tol_matrix
+
+    if tm is None:
+        tm = Tol_matrix(prototype="molecular")
+    get_block_template(block, molecules, tm)
+
+    xtals = []
+    for _ in range(N):
+        xtal = pyxtal(molecular=True)
+        try:
+            xtal.from_random(
+                dim,
+                group,
+                molecules,
+                factor=factor,
+                lattice=lattice,
+                sites=sites,
+                block=block,
+                num_block=num_block,
+                tm=tm,
+                max_count=max_count,
+            )
+        except RuntimeError:
+            continue
+        xtals.append(xtal)
+    return xtals
+
+
 if __name__ == "__main__":
     import pymatgen.analysis.structure_matcher as sm
 
@@ -0,0 +1,292 @@
+"""
+Local cache of the CSD entries that works without the network or ccdc api
+"""
+
+import hashlib
+import json
+import os
+import os.path as op
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+
+try:
+    import fcntl
+except ImportError:
+    # no file lock on Windows
+    fcntl = None
+
+# shared by all caches in the process, keyed by the folder
+_indices = {}
+
+
+def get_default_folder():
+    """
+    The cache folder from `PYXTAL_CSD_CACHE`, or `~/.cache/pyxtal/csd`
+    """
+    folder = os.environ.get("PYXTAL_CSD_CACHE")
+    if folder is None:
+        folder = op.join(op.expanduser("~"), ".cache", "pyxtal", "csd")
+    return folder
+
+
+def get_cif_info(cif):
+    """
+    Extract the refcode and ccdc number from a CSD cif string
+
+    Args:
+        cif: cif string
+
+    Returns:
+        code, ccdc_number (None if not found)
+    """
+    code = re.search(r"^_database_code_CSD\s+(\S+)", cif, re.M)
+    number = re.search(r"^_database_code_depnum_ccdc_archive\s+'?CCDC\s+(\d+)", cif, re.M)
+    code = code.group(1) if code is not None else None
+    number = int(number.group(1)) if number is not None else None
+    return code, number
+
+
+def read_smiles(filename):
+    """
+    Read the refcode -> smiles mapping from a json file or a text file
+    with the `code smiles` pair per line (comma is also allowed)
+
+    Args:
+        filename: json/txt/csv file
+
+    Returns:
+        dictionary
+    """
+    if filename.endswith(".json"):
+        with open(filename) as f:
+            return json.load(f)
+
+    smiles = {}
+    with open(filename) as f:
+        for line in f:
+            tmp = line.replace(",", " ").split()
+            if len(tmp) >= 2 and not line.startswith("#"):
+                smiles[tmp[0]] = tmp[1]
+    return smiles
+
+
+def parse_entry(code, cif, smiles, ccdc_number=None):
+    """
+    Convert the cif/smiles pair to the pyxtal dictionary
+
+    Returns:
+        code, dictionary (None if failed)
+    """
+    from pyxtal import pyxtal
+    from pyxtal.msg import CSDError
+
+    xtal = pyxtal(molecular=True)
+    try:
+        xtal.from_CSD_cif(code, cif, smiles, ccdc_number)
+    except CSDError as e:
+        print("CSDError", code, e.message)
+        return code, None
+    return code, xtal.save_dict()
+
+
+class CSD_cache:
+    """
+    A content-addressed cache of CSD entries on the local disk. For each
+    refcode, it keeps the raw cif, the smiles, the ccdc number and the
+    parsed pyxtal dictionary. The data are stored under `objects/` by the
+    sha1 of the content, and `index.json` maps the refcode to the hashes.
+    The index is updated under a file lock.
+    The same folder can be shared on the computing nodes without network.
+
+    Example of use:
+
+    >>> from pyxtal.database.cache import CSD_cache
+    >>> cache = CSD_cache('csd_cache')
+    >>> cache.import_cifs('cifs', smiles='smiles.txt', ncpu=4)
+    >>> from pyxtal import pyxtal
+    >>> xtal = pyxtal(molecular=True)
+    >>> xtal.from_CSD('ACSALA01', cache=cache)
+
+    Args:
+        folder: cache folder, default from `get_default_folder`
+    """
+
+    def __init__(self, folder=None):
+        if folder is None:
+            folder = get_default_folder()
+        self.folder = op.abspath(folder)
+        self.index_file = op.join(self.folder, "index.json")
+
+    def __repr__(self):
+        return f"CSD_cache({self.folder:s}, {len(self):d} entries)"
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        yield from self.index
+
+    @property
+    def index(self):
+        """
+        The refcode -> hashes index, reloaded only if the file is updated
+        """
+        try:
+            st = os.stat(self.index_file)
+        except FileNotFoundError:
+            return {}
+        state = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if self.folder not in _indices or _indices[self.folder][0] != state:
+            with open(self.index_file) as f:
+                _indices[self.folder] = (state, json.load(f))
+        return _indices[self.folder][1]
+
+    def _get_path(self, key, ext):
+        return op.join(self.folder, "objects", key[:2], key + ext)
+
+    def _write(self, filename, content):
+        # write to a unique temporary file and rename to avoid partial files
+        folder = op.dirname(filename)
+        os.makedirs(folder, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=folder, suffix=".tmp", delete=False) as f:
+            f.write(content)
+        try:
+            os.replace(f.name, filename)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+    def _put_object(self, content, ext):
+        key = hashlib.sha1(content.encode()).hexdigest()
+        filename = self._get_path(key, ext)
+        if not op.exists(filename):
+            self._write(filename, content)
+        return key
+
+    def _get_object(self, key, ext):
+        with open(self._get_path(key, ext)) as f:
+            return f.read()
+
+    def _update_index(self, entries):
+        # hold the lock across reading, merging and replacing the index so
+        # that the concurrent writers from other processes are not lost
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.index_file + ".lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.index_file) as f:
+                    index = json.load(f)
+            except FileNotFoundError:
+                index = {}
+            index.update(entries)
+            self._write(self.index_file, json.dumps(index, indent=1, sort_keys=True))
+
+    def get(self, code):
+        """
+        Get the cached entry by refcode
+
+        Args:
+            code: CSD refcode, e.g., ``ACSALA01``
+
+        Returns:
+            dictionary of `cif`, `smiles`, `ccdc_number` and `xtal`
+            (None if not parsed), or None if the code is not cached
+        """
+        from monty.json import MontyDecoder
+
+        if code not in self.index:
+            return None
+        entry = self.index[code]
+        xtal = entry.get("xtal")
+        if xtal is not None:
+            xtal = json.loads(self._get_object(xtal, ".json"), cls=MontyDecoder)
+        return {
+            "cif": self._get_object(entry["cif"], ".cif"),
+            "smiles": entry["smiles"],
+            "ccdc_number": entry.get("ccdc_number"),
+            "xtal": xtal,
+        }
+
+    def _make_entry(self, cif, smiles, ccdc_number=None, xtal=None):
+        from monty.json import MontyEncoder
+
+        entry = {
+            "cif": self._put_object(cif, ".cif"),
+            "smiles": smiles,
+            "ccdc_number": ccdc_number,
+            "xtal": None,
+        }
+        if xtal is not None:
+            entry["xtal"] = self._put_object(json.dumps(xtal, cls=MontyEncoder), ".json")
+        return entry
+
+    def put(self, code, cif, smiles, ccdc_number=None, xtal=None):
+        """
+        Add or update an entry
+
+        Args:
+            code: CSD refcode
+            cif: the raw cif string from CSD
+            smiles: smiles string
+            ccdc_number: ccdc deposition number
+            xtal: the dictionary from `pyxtal.save_dict`
+        """
+        self._update_index({code: self._make_entry(cif, smiles, ccdc_number, xtal)})
+
+    def import_cifs(self, folder, smiles, pattern="*.cif", parse=True, ncpu=1):
+        """
+        Fill the cache from a folder of CSD cif files. The refcode is read
+        from `_database_code_CSD` or the file name. Entries without smiles
+        are skipped.
+
+        Args:
+            folder: folder of cif files
+            smiles: dictionary or file of the refcode -> smiles mapping
+            pattern: file pattern
+            parse: whether or not to store the parsed pyxtal dictionary
+            ncpu: number of parallel processes to parse the cifs
+
+        Returns:
+            the list of imported refcodes
+        """
+        if smiles is None:
+            raise ValueError("The smiles are required to import the cif files")
+        if isinstance(smiles, str):
+            smiles = read_smiles(smiles)
+
+        data = {}
+        for filename in sorted(glob(op.join(folder, pattern))):
+            with open(filename) as f:
+                cif = f.read()
+            code, number = get_cif_info(cif)
+            if code is None:
+                code = op.splitext(op.basename(filename))[0]
+            if code in smiles:
+                data[code] = (cif, smiles[code], number)
+            else:
+                print("No smiles for", code, filename)
+
+        xtals = {}
+        if parse and len(data) > 0:
+            args = [(code, *data[code]) for code in data]
+            if ncpu == 1:
+                results = [parse_entry(*arg) for arg in args]
+            else:
+                chunksize = max(1, len(args) // (4 * ncpu))
+                with ProcessPoolExecutor(max_workers=ncpu) as executor:
+                    results = list(executor.map(parse_entry, *zip(*args), chunksize=chunksize))
+            xtals = dict(results)
+
+        entries = {}
+        for code, (cif, smi, number) in data.items():
+            entries[code] = self._make_entry(cif, smi, number, xtals.get(code))
+        if len(entries) > 0:
+            self._update_index(entries)
+        print(f"Imported {len(entries):d} entries to {self.folder:s}")
+        return list(entries)
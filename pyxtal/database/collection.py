@@ -1,8 +1,39 @@
 import json
+import os
 import os.path as op
 
+import numpy as np
 from pymatgen.core.structure import Molecule
 
+# shared by all collections in the process, keyed by the file path
+_contents = {}
+_indices = {}
+_entries = {}
+
+
+def _load(filename):
+    """
+    Load a collection file and build the name -> position index once,
+    reload it only if the file is updated
+    """
+    st = os.stat(filename)
+    state = (st.st_mtime_ns, st.st_size)
+    if filename not in _contents or _contents[filename][0] != state:
+        if filename.endswith(".npz"):
+            content = dict(np.load(filename, allow_pickle=False))
+            names = content["names"]
+        else:
+            with open(filename) as f:
+                content = json.load(f)
+            names = [dct["name"] for dct in content]
+        # the last one wins for duplicated names
+        _indices[filename] = {str(name).lower(): i for i, name in enumerate(names)}
+        _contents[filename] = (state, content)
+        # remove the converted entries from the old file
+        for key in [key for key in _entries if key[0] == filename]:
+            del _entries[key]
+    return _contents[filename][1], _indices[filename]
+
 
 class Collection:
     """Collection of molecular data.
@@ -20,14 +51,23 @@ class Collection:
     >>> list(test)
     ['C60', 'H2O', 'CH4', 'NH3', 'benzene', 'naphthalene', 'anthracene', 'tetracene', 'pentacene', 'coumarin', 'resorcinol', 'benzamide', 'aspirin', 'ddt', 'lindane', 'glycine', 'glucose', 'ROY']
 
+    Large user collections (e.g., thousands of clusters or conformers) can
+    be stored in a compact binary file via `to_npz` and loaded with
+
+    >>> test=Collection('molecules', filename='conformers.npz')
+
     Args:
         name: the type of collection to get. Defaults to "molecules"
+        filename: a user-supplied json or npz file
     """
 
-    def __init__(self, name="molecules"):
+    def __init__(self, name="molecules", filename=None):
         """Create a collection lazily.
 
-        Will read data from json file when needed.
+        Will read data from json file when needed. The file is parsed and
+        indexed by name only once per process (again if it is modified),
+        and each entry is converted to a pymatgen object upon the first
+        request.
 
         A collection can be iterated over to get the Atoms objects and indexed
         with names to get individual members.
@@ -36,52 +76,110 @@ class Collection:
 
         name: str
             Name of collection.
-        data: object
-            Pymetgen molecule object
         filename: str
-            Location of json file.
+            Location of json or npz file.
         """
 
         self.name = name
-        self._data = {}
-        self.filename = op.join(op.dirname(__file__), name + ".json")
-        with open(self.filename) as f:
-            self.content = json.load(f)
+        if filename is None:
+            filename = op.join(op.dirname(__file__), name + ".json")
+        self.filename = filename
+
+    @property
+    def content(self):
+        return _load(self.filename)[0]
 
     def __getitem__(self, name):
-        self._read(name)
-        if len(self._data) == 0:
-            names = ""
-            for dct in self.content:
-                names += dct["name"] + ", "
-            msg = name + " is not supported\n"
+        data = self._read(name)
+        if data is None:
+            msg = f"{name} is not supported\n"
             msg += "Available molecules are:\n"
-            msg += names
+            msg += ", ".join(str(n) for n in self)
             raise NameError(msg)
+        elif isinstance(data, Molecule):
+            # the cached molecule should not be modified by the caller
+            return data.copy()
         else:
-            return self._data
+            return data
+
+    def __contains__(self, name):
+        return str(name).lower() in _load(self.filename)[1]
+
+    def __len__(self):
+        return len(_load(self.filename)[1])
 
     def __iter__(self):
-        for dct in self.content:
-            yield dct["name"]
+        content, _ = _load(self.filename)
+        if isinstance(content, dict):
+            for name in content["names"]:
+                yield str(name)
+        else:
+            for dct in content:
+                yield dct["name"]
 
     def _read(self, name):
-        if self.name == "molecules":
-            """
-            read the data by name and convert it to pymatgen format
-            """
-            for dct in self.content:
-                if dct["name"].lower() == name.lower():
-                    pos = dct["xyz"]
-                    symbols = dct["elements"]
-                    self._data = Molecule(symbols, pos)
-        elif self.name == "clusters":
-            for dct in self.content:
-                if dct["name"] == int(name):
-                    self._data = dct
+        """
+        read the data by name and convert it to pymatgen format
+        """
+        content, index = _load(self.filename)
+        i = index.get(str(name).lower())
+        if i is None:
+            return None
+
+        key = (self.filename, i)
+        if key not in _entries:
+            dct = self._get_npz_entry(content, i) if isinstance(content, dict) else content[i]
+            if self.name == "clusters":
+                _entries[key] = dct
+            else:
+                pos = dct["xyz"]
+                symbols = dct["elements"]
+                _entries[key] = Molecule(symbols, pos)
+        return _entries[key]
+
+    @staticmethod
+    def _get_npz_entry(content, i):
+        start, end = content["offsets"][i], content["offsets"][i + 1]
+        dct = {"name": str(content["names"][i])}
+        dct["xyz"] = content["coords"][start:end].tolist()
+        # same as the serialized numpy array in clusters.json
+        dct["position"] = {"@module": "numpy", "@class": "array", "dtype": "float64", "data": dct["xyz"]}
+        if "elements" in content:
+            dct["elements"] = content["elements"][start:end].tolist()
+        if "energies" in content:
+            dct["energy"] = float(content["energies"][i])
+        return dct
+
+    def to_npz(self, filename):
+        """
+        Save the collection to a compact binary file
+
+        Args:
+            filename: the npz file
+        """
+        content, _ = _load(self.filename)
+        npz = isinstance(content, dict)
+        N = len(content["names"]) if npz else len(content)
+        names, coords, elements, energies = [], [], [], []
+        for i in range(N):
+            dct = self._get_npz_entry(content, i) if npz else content[i]
+            names.append(str(dct["name"]))
+            pos = dct["xyz"] if "xyz" in dct else dct["position"]
+            if isinstance(pos, dict):
+                pos = pos["data"]
+            coords.append(np.reshape(pos, [-1, 3]))
+            if "elements" in dct:
+                elements.extend(dct["elements"])
+            if "energy" in dct:
+                energies.append(dct["energy"])
+
+        offsets = np.cumsum([0] + [len(c) for c in coords])
+        arrays = {"names": np.array(names), "offsets": offsets, "coords": np.vstack(coords)}
+        if len(elements) == offsets[-1]:
+            arrays["elements"] = np.array(elements)
+        if len(energies) == len(names):
+            arrays["energies"] = np.array(energies)
+        np.savez(filename, **arrays)
 
     def show_names(self):
-        names = []
-        for dct in self.content:
-            names.append(dct["name"])
-        print(names)
+        print(list(self))
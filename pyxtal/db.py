@@ -26,8 +26,10 @@ def dftb_opt_par(ids, xtals, skf_dir, steps, folder, symmetrize, criteria):
     cwd = os.getcwd()
     os.chdir(folder)
     results = []
+    # share the DFTB calculators within this worker
+    calcs = {}
     for id, xtal in zip(ids, xtals):
-        res = dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria)
+        res = dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria, calcs=calcs)
         (xtal, eng, status) = res
         if status:
             results.append((id, xtal, eng))
@@ -35,7 +37,7 @@ def dftb_opt_par(ids, xtals, skf_dir, steps, folder, symmetrize, criteria):
     return results
 
 
-def dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria, kresol=0.05):
+def dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria, kresol=0.05, calcs=None):
     """
     Single DFTB optimization for a given atomic xtal
 
@@ -45,6 +47,7 @@ def dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria, kresol=0.05)
         skf_dir (str): path of skf files
         steps (int): number of relaxation steps
         criteria (dicts): to check if the structure
+        calcs (dict): DFTB calculators shared among the calls
     """
     from pyxtal.interface.dftb import DFTB, DFTB_relax
 
@@ -63,6 +66,7 @@ def dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria, kresol=0.05)
                 folder=".",
                 scc_iter=100,
                 logfile="ase.log",
+                calcs=calcs,
             )
             s = DFTB_relax(
                 atoms,
@@ -74,6 +78,7 @@ def dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria, kresol=0.05)
                 scc_error=1e-5,
                 scc_iter=100,
                 logfile="ase.log",
+                calcs=calcs,
             )
             stress = np.sum(s.get_stress()[:3]) / 0.006241509125883258 / 3
         else:
@@ -1069,8 +1074,9 @@ class database_topology:
 
         # Serial or Parallel computation
         if ncpu == 1:
+            calcs = {}
             for id, xtal in zip(ids, xtals):
-                res = dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria)
+                res = dftb_opt_single(id, xtal, skf_dir, steps, symmetrize, criteria, calcs=calcs)
                 (xtal, eng, status) = res
                 if status:
                     dftb_results.append((id, xtal, eng))
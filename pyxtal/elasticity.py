@@ -877,6 +877,61 @@ def fit_elastic_constants(
         # assume we've been passed a list of strained configs
         strained_configs = a
 
+    if symmetry not in strain_patterns:
+        raise ValueError(f"Unknown symmetry {symmetry}. Valid options are {strain_patterns.keys()}")
+
+    N_pattern = len(strain_patterns[symmetry])
+    configs = iter(strained_configs)
+
+    strain = np.zeros((N_pattern, N_steps, 6))
+    stress = np.zeros((N_pattern, N_steps, 6))
+
+    # Fill in strain and stress arrays from config Atoms list
+    with open("Detail-" + tag + ".txt", "w") as f:
+        for pattern_index, (_pattern, fit_pairs) in enumerate(strain_patterns[symmetry]):
+            for step in range(N_steps):
+                at = next(configs)
+                t0 = time()
+                E0 = at.get_potential_energy()
+                if optimizer is not None:
+                    optimizer(at, logfile=logfile).run(**kwargs)
+                else:
+                    # update position
+                    pos = read("geo_end.gen").get_positions()
+                    at.set_positions(pos)
+                E1 = at.get_potential_energy()
+                fmax = np.abs(at.get_forces()).max()
+                t1 = time() - t0
+                strs = f"\n{tag:8s} {pattern_index:2d}/{step:2d}\n"
+                strs += f"Eng:  {E0:.4f} -> {E1:.4f}, "
+                strs += f"dE: {E1 - E0:.4f}\n"
+                strs += f"fmax: {fmax:.5f}\n"
+                strs += f"time: {t1:.1f}\n"
+                strain_info = full_3x3_to_Voigt_6_strain(at.info["strain"])
+                stress_info = at.get_stress()
+                strain[pattern_index, step, :] = strain_info
+                stress[pattern_index, step, :] = stress_info
+                # print("Cell\n", at.get_cell())
+                strs += "Strain {:.3f} {:.3f} {:.3f} {:.3f} {:.3f} {:.3f}\n".format(*strain_info)
+                strs += "Stress (GPa) {:.2f} {:.2f} {:.2f} {:.2f} {:.2f} {:.2f}\n".format(*(stress_info / units.GPa))
+                f.write(strs)
+                print(strs)
+
+    return _fit_stress_strain(strain, stress, symmetry, verbose, GPa, graphics)
+
+
+def _fit_stress_strain(strain, stress, symmetry="triclinic", verbose=True, GPa=True, graphics=False):
+    """
+    Linear regression of the elastic constants from the computed stresses,
+    see :func:`fit_elastic_constants`.
+
+    Parameters
+    ----------
+    strain : array_like
+        (N_pattern, N_steps, 6) strains in Voigt notation.
+    stress : array_like
+        (N_pattern, N_steps, 6) stresses in Voigt notation.
+    """
     if graphics:
         import matplotlib.pyplot as plt
 
@@ -939,9 +994,6 @@ def fit_elastic_constants(
 
         return cijFitted, stderr
 
-    if symmetry not in strain_patterns:
-        raise ValueError(f"Unknown symmetry {symmetry}. Valid options are {strain_patterns.keys()}")
-
     # There are 21 independent elastic constants
     Cijs = {}
     Cij_err = {}
@@ -963,12 +1015,6 @@ def fit_elastic_constants(
         Cij_map[(i2, i1)] = Cij_map[(i1, i2)]
         Cij_map_sym[(i2, i1)] = Cij_map_sym[(i1, i2)]
 
-    N_pattern = len(strain_patterns[symmetry])
-    configs = iter(strained_configs)
-
-    strain = np.zeros((N_pattern, N_steps, 6))
-    stress = np.zeros((N_pattern, N_steps, 6))
-
     if graphics:
         fig = plt.figure(num=1, figsize=(9.5, 8), facecolor="white")
         fig.clear()
@@ -981,37 +1027,6 @@ def fit_elastic_constants(
                 sp.set_axis_off()
                 plt.text(0.4, 0.4, "n/a")
 
-    # Fill in strain and stress arrays from config Atoms list
-    with open("Detail-" + tag + ".txt", "w") as f:
-        for pattern_index, (_pattern, fit_pairs) in enumerate(strain_patterns[symmetry]):
-            for step in range(N_steps):
-                at = next(configs)
-                t0 = time()
-                E0 = at.get_potential_energy()
-                if optimizer is not None:
-                    optimizer(at, logfile=logfile).run(**kwargs)
-                else:
-                    # update position
-                    pos = read("geo_end.gen").get_positions()
-                    at.set_positions(pos)
-                E1 = at.get_potential_energy()
-                fmax = np.abs(at.get_forces()).max()
-                t1 = time() - t0
-                strs = f"\n{tag:8s} {pattern_index:2d}/{step:2d}\n"
-                strs += f"Eng:  {E0:.4f} -> {E1:.4f}, "
-                strs += f"dE: {E1 - E0:.4f}\n"
-                strs += f"fmax: {fmax:.5f}\n"
-                strs += f"time: {t1:.1f}\n"
-                strain_info = full_3x3_to_Voigt_6_strain(at.info["strain"])
-                stress_info = at.get_stress()
-                strain[pattern_index, step, :] = strain_info
-                stress[pattern_index, step, :] = stress_info
-                # print("Cell\n", at.get_cell())
-                strs += "Strain {:.3f} {:.3f} {:.3f} {:.3f} {:.3f} {:.3f}\n".format(*strain_info)
-                strs += "Stress (GPa) {:.2f} {:.2f} {:.2f} {:.2f} {:.2f} {:.2f}\n".format(*(stress_info / units.GPa))
-                f.write(strs)
-                print(strs)
-
     # Do the linear regression
     for pattern_index, (_pattern, fit_pairs) in enumerate(strain_patterns[symmetry]):
         for index1, index2 in fit_pairs:
@@ -1093,6 +1108,152 @@ def fit_elastic_constants(
     return C, C_err
 
 
+def get_symmetry_type(spg):
+    """
+    Get the symmetry used by `strain_patterns` and `Cij_symmetry` from the
+    space group number. The cell is assumed to be in the standard setting.
+
+    Parameters
+    ----------
+    spg : int
+        Space group number.
+
+    Returns
+    -------
+    symmetry : string
+    """
+    if spg >= 195:
+        return "cubic"
+    elif spg >= 168:
+        return "hexagonal"
+    elif spg >= 149:
+        return "trigonal_high"
+    elif spg >= 143:
+        return "trigonal_low"
+    elif spg >= 89:
+        return "tetragonal_high"
+    elif spg >= 75:
+        return "tetragonal_low"
+    elif spg >= 16:
+        return "orthorhombic"
+    elif spg >= 3:
+        return "monoclinic"
+    else:
+        return "triclinic"
+
+
+# calculator owned by each worker process
+_worker = {}
+
+
+def _init_calculator(get_calculator):
+    _worker["calculator"] = get_calculator()
+
+
+def _evaluate_strained_config(at, optimizer=None, logfile=None, kwargs=None):
+    """
+    Compute the stress of a strained configuration with the calculator
+    of the current process.
+
+    Returns
+    -------
+    strain and stress in Voigt notation
+    """
+    if kwargs is None:
+        kwargs = {}
+    at.calc = _worker["calculator"]
+    if optimizer is not None:
+        optimizer(at, logfile=logfile).run(**kwargs)
+    return full_3x3_to_Voigt_6_strain(at.info["strain"]), at.get_stress()
+
+
+def fit_elastic_constants_batch(
+    atoms_list,
+    get_calculator,
+    symmetries=None,
+    N_steps=5,
+    delta=1e-2,
+    optimizer=None,
+    ncpu=1,
+    chunksize=None,
+    verbose=False,
+    GPa=True,
+    logfile=None,
+    **kwargs,
+):
+    """
+    Compute elastic constants for many crystals. All strained configurations
+    are generated up front, with only the strain patterns required by the
+    symmetry of each crystal, and then evaluated by a pool of processes.
+    Each process builds its own calculator (e.g., one LAMMPS instance)
+    only once.
+
+    Parameters
+    ----------
+    atoms_list : list of ase.Atoms
+        Relaxed crystals.
+    get_calculator : callable
+        Picklable function (or class) without argument that returns an
+        ase calculator, e.g., `EMT`.
+    symmetries : list
+        Symmetry (string) or space group number (int) for each crystal.
+        Default is None, i.e., 'triclinic' for all crystals.
+    N_steps : int
+        Number of configurations for each strain pattern.
+    delta : float
+        Strain increment.
+    optimizer : ase.optimizer.*
+        Optimizer to relax atomic positions for each applied strain.
+    ncpu : int
+        Number of parallel processes.
+    chunksize : int
+        Number of configurations sent to each process at once.
+    **kwargs : dict
+        Additional arguments to pass to `optimizer.run()` method e.g. `fmax`.
+
+    Returns
+    -------
+    A list of (C, C_err) for each crystal, see :func:`fit_elastic_constants`.
+    """
+    if symmetries is None:
+        symmetries = ["triclinic"] * len(atoms_list)
+    symmetries = [get_symmetry_type(sym) if type(sym) in [int, np.int64] else sym for sym in symmetries]
+
+    configs = []
+    for at, symmetry in zip(atoms_list, symmetries):
+        if at.constraints:
+            raise ValueError("Atoms passed to fit_elastic_constants_batch() has constraints attached")
+        configs.extend(generate_strained_configs(at.copy(), symmetry, N_steps, delta))
+
+    args = (optimizer, logfile, kwargs)
+    if ncpu == 1:
+        _init_calculator(get_calculator)
+        results = [_evaluate_strained_config(at, *args) for at in configs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        if chunksize is None:
+            chunksize = max(1, len(configs) // (4 * ncpu))
+        N = len(configs)
+        init = {"initializer": _init_calculator, "initargs": (get_calculator,)}
+        with ProcessPoolExecutor(max_workers=ncpu, **init) as executor:
+            args = [[arg] * N for arg in args]
+            results = list(executor.map(_evaluate_strained_config, configs, *args, chunksize=chunksize))
+
+    Cs = []
+    count = 0
+    for symmetry in symmetries:
+        N_pattern = len(strain_patterns[symmetry])
+        strain = np.zeros((N_pattern, N_steps, 6))
+        stress = np.zeros((N_pattern, N_steps, 6))
+        for pattern_index in range(N_pattern):
+            for step in range(N_steps):
+                strain[pattern_index, step, :], stress[pattern_index, step, :] = results[count]
+                count += 1
+        Cs.append(_fit_stress_strain(strain, stress, symmetry, verbose, GPa))
+    return Cs
+
+
 def youngs_modulus(C, l):
     """
     Calculate approximate Youngs modulus E_l from 6x6 elastic constants matrix C_ij
@@ -7,6 +7,22 @@ from ase.constraints import ExpCellFilter
 from ase.optimize.fire import FIRE
 from ase.spacegroup.symmetrize import FixSymmetry
 
+# ANI models loaded in the current process
+_models = {}
+
+
+def get_ANI_calculator(model="ANI2x"):
+    """
+    Get the ase calculator of an ANI model. The model is only loaded
+    once per process and then shared by all calculators.
+
+    Args:
+        model: the name of model in torchani.models
+    """
+    if model not in _models:
+        _models[model] = getattr(torchani.models, model)()
+    return _models[model].ase()
+
 
 def ANI_relax(struc, opt_cell=False, step=500, fmax=0.1, logfile=None, max_time=6.0):
     """
@@ -16,7 +32,7 @@ def ANI_relax(struc, opt_cell=False, step=500, fmax=0.1, logfile=None, max_time=
     step: optimization steps (int)
     max_time: float (minutes)
     """
-    calc = torchani.models.ANI2x().ase()
+    calc = get_ANI_calculator()
     struc.set_calculator(calc)
     struc.set_constraint(FixSymmetry(struc))
     if opt_cell:
@@ -37,6 +53,68 @@ def ANI_relax(struc, opt_cell=False, step=500, fmax=0.1, logfile=None, max_time=
     return struc
 
 
+def _ANI_relax_batch(strucs, opt_cell, step, fmax, logfile, max_time):
+    """
+    Relax a list of ase atoms one by one with the shared model
+
+    Returns:
+        a list of dictionaries with the relaxed atoms, energy, convergence,
+        error message and time
+    """
+    results = []
+    for struc in strucs:
+        t0 = time()
+        res = {"atoms": None, "energy": None, "converged": False, "error": None}
+        try:
+            atoms = ANI_relax(struc, opt_cell, step, fmax, logfile, max_time)
+            res["atoms"] = atoms
+            res["energy"] = atoms.get_potential_energy()
+            # the forces are symmetrized by the FixSymmetry constraint
+            res["converged"] = bool(np.linalg.norm(atoms.get_forces(), axis=1).max() < fmax)
+        except Exception as e:
+            res["error"] = str(e)
+        res["time"] = time() - t0
+        results.append(res)
+    return results
+
+
+def ANI_relax_batch(strucs, opt_cell=False, step=500, fmax=0.1, logfile=None, max_time=6.0, ncpu=1):
+    """
+    Symmetry constrained ANI relaxation for a batch of structures. The ANI
+    model is loaded only once in each process. A failed relaxation is
+    reported in the results instead of stopping the whole batch.
+
+    Args:
+        strucs: list of ase atoms objects
+        opt_cell: whether or not optimize the cell
+        step: optimization steps (int)
+        fmax: force tolerance
+        logfile: log file of the optimizer
+        max_time: float (minutes)
+        ncpu: number of parallel processes
+
+    Returns:
+        a list of dictionaries with `atoms`, `energy`, `converged`, `error` and `time`
+    """
+    args = (opt_cell, step, fmax, logfile, max_time)
+    if ncpu == 1:
+        return _ANI_relax_batch(strucs, *args)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    N_cycle = int(np.ceil(len(strucs) / ncpu))
+    results = []
+    with ProcessPoolExecutor(max_workers=ncpu) as executor:
+        futures = []
+        for i in range(ncpu):
+            _strucs = strucs[i * N_cycle : (i + 1) * N_cycle]
+            if len(_strucs) > 0:
+                futures.append(executor.submit(_ANI_relax_batch, _strucs, *args))
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
 class ANI:
     """
     This is a calculator to perform oragnic crystal structure optimization in ANI
@@ -57,8 +135,9 @@ class ANI:
         self.cell = None
         self.group = self.structure.group
         self.cputime = 0
-        self.calculator = torchani.models.ANI2x().ase()
+        self.calculator = get_ANI_calculator()
         self.logfile = logfile
+        self.error = None
 
     def run(self):
         t0 = time()
@@ -88,10 +167,7 @@ class ANI:
                     if abs(np.linalg.norm(abs_diff)) < 2.0:
                         coords1[j] = coords0[j] + diff
                     else:
-                        print(coords1[j], coords1[j], np.linalg.norm(abs_diff))
-                        import sys
-
-                        sys.exit()
+                        raise RuntimeError(f"Cannot map the atom {j:d}: {np.linalg.norm(abs_diff):.3f} A")
 
                 site.update(coords1, self.structure.lattice)
                 count += len(site.molecule.mol) * site.wp.multiplicity
@@ -99,10 +175,11 @@ class ANI:
             self.structure.energy = s.get_potential_energy()
             self.cell = s.get_cell()
             # print(self.structure.lattice)
-        except:
+        except Exception as e:
             self.structure.energy = 10000
             self.optimized = False
-            print("Structure is wrong after optimization")
+            self.error = str(e)
+            print("Structure is wrong after optimization", self.error)
 
         self.cputime = time() - t0
 
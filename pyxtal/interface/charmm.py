@@ -1,9 +1,44 @@
 import contextlib
 import os
+import shlex
 import shutil
+import subprocess
+from collections import deque
+from time import time
 
 import numpy as np
 
+# force field files already copied to the scratch folders
+_ff_files = {}
+
+
+def copy_ff_files(folder, scratch, files):
+    """
+    Copy the force field files to the scratch folder, only if they are
+    new or changed since the last copy. The copied file is also checked,
+    in case a shared scratch folder is overwritten by another process.
+
+    Args:
+        folder: the folder with the force field files
+        scratch: the scratch folder
+        files: list of file names, e.g., ['pyxtal.rtf', 'pyxtal.prm']
+    """
+    for file in files:
+        src = os.path.join(folder, file)
+        if not os.path.exists(src):
+            continue
+        dst = os.path.join(scratch, file)
+        stat = os.stat(src)
+        key = os.path.abspath(dst)
+        state = (os.path.abspath(src), stat.st_mtime_ns, stat.st_size)
+        if os.path.exists(dst):
+            stat_dst = os.stat(dst)
+            if _ff_files.get(key) == (*state, stat_dst.st_mtime_ns, stat_dst.st_size):
+                continue
+        shutil.copyfile(src, dst)
+        stat_dst = os.stat(dst)
+        _ff_files[key] = (*state, stat_dst.st_mtime_ns, stat_dst.st_size)
+
 
 class CHARMM:
     """
@@ -17,6 +52,8 @@ class CHARMM:
         output: charmm output file
         dump: charmm dump structure
         exe: charmm executable
+        scratch: folder to run the calculation, e.g., a tmpfs folder like
+            `/dev/shm/pyxtal`, the rtf/prm files are copied from `folder`
     """
 
     def __init__(
@@ -36,13 +73,14 @@ class CHARMM:
         output="charmm.log",
         dump="result.pdb",
         debug=False,
+        scratch=None,
     ):
         if steps is None:
             steps = [2000, 1000]
         self.debug = debug
 
-        # check charmm Executable
-        if shutil.which(exe) is None:
+        # check charmm Executable, e.g., `charmm` or `mpirun -np 4 charmm`
+        if shutil.which(shlex.split(exe)[0]) is None:
             raise BaseException(f"{exe} is not installed")
         else:
             self.exe = exe
@@ -61,6 +99,7 @@ class CHARMM:
 
         # Files IO
         self.folder = folder
+        self.scratch = folder if scratch is None else scratch
         self.prefix = prefix
         self.label = label
         self.rtf = self.prefix + ".rtf"
@@ -77,6 +116,7 @@ class CHARMM:
         self.optimized = False
         self.cell = None
         self.cputime = 0.0
+        self.timings = {}
 
         # Structure Manipulation
         struc.resort()
@@ -95,29 +135,44 @@ class CHARMM:
         self.rotate = rotate
 
     def run(self, clean=True):
-        if not os.path.exists(self.folder):
-            os.makedirs(self.folder)
-        cwd = os.getcwd()
-        os.chdir(self.folder)
-
-        self.write()  # ; print("write", time()-t0)
-        self.execute()  # ; print("exe", time()-t0)
-        self.read()  # ; print("read", self.structure.energy)
+        """
+        Run the calculation in the scratch folder without changing the
+        current working directory, and record the time of each phase
+        in `self.timings`.
+        """
+        for folder in [self.folder, self.scratch]:
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+        if self.scratch != self.folder:
+            copy_ff_files(self.folder, self.scratch, [self.rtf, self.prm])
+
+        t0 = time()
+        self.write()
+        t1 = time()
+        self.execute()
+        t2 = time()
+        self.read()
+        t3 = time()
         if clean:
             self.clean()
+        self.timings = {"write": t1 - t0, "execute": t2 - t1, "read": t3 - t2, "clean": time() - t3}
 
-        os.chdir(cwd)
+    def get_path(self, filename):
+        return os.path.join(self.scratch, filename)
 
     def execute(self):
-        cmd = self.exe + "<" + self.input + ">" + self.output
-        os.system(cmd)
+        # resolve the executable before running in the scratch folder
+        cmd = shlex.split(self.exe)
+        cmd[0] = os.path.abspath(shutil.which(cmd[0]) or cmd[0])
+        # the errors are kept in the log, the run is checked in `read`
+        with open(self.get_path(self.input)) as fin, open(self.get_path(self.output), "w") as fout:
+            subprocess.run(cmd, stdin=fin, stdout=fout, stderr=subprocess.STDOUT, cwd=self.scratch, check=False)
 
     def clean(self):
-        os.remove(self.input)
-        os.remove(self.output)
-        os.remove(self.crd) if os.path.exists(self.crd) else None
-        os.remove(self.psf) if os.path.exists(self.psf) else None
-        os.remove(self.dump) if os.path.exists(self.dump) else None
+        for filename in [self.input, self.output, self.crd, self.psf, self.dump]:
+            path = self.get_path(filename)
+            if os.path.exists(path):
+                os.remove(path)
 
     def write(self):
         """
@@ -131,7 +186,7 @@ class CHARMM:
         ltype = lat.ltype
         fft = self.FFTGrid(np.array([a, b, c]))
 
-        with open(self.input, "w") as f:
+        with open(self.get_path(self.input), "w") as f:
             # General input
             f.write("! Automated Charmm calculation\n\n")
             f.write("bomlev -1\n")
@@ -226,26 +281,32 @@ class CHARMM:
         # sys.exit()
 
     def read(self):
-        with open(self.output) as f:
-            lines = f.readlines()
-            self.version = lines[2]
-            if lines[-1].find("CPU TIME") != -1:
-                self.optimized = True
-                self.cputime = float(lines[-2].split()[-2])
-                for line in lines:
-                    if line.find("MINI> ") != -1:
-                        with contextlib.suppress(Exception):
-                            self.structure.iter = int(line.split()[1])
-                            # raise RuntimeError("Something is wrong in the charmm output")
-                    elif line.find("ABNORMAL TERMINATION") != -1:
-                        self.optimized = False
-                        break
+        # stream the output and only keep the lines around the CPU TIME,
+        # which may be followed by the messages from stderr
+        self.optimized = False
+        abnormal = False
+        cpu_lines = None
+        with open(self.get_path(self.output)) as f:
+            last_lines = deque(maxlen=2)
+            for i, line in enumerate(f):
+                if i == 2:
+                    self.version = line
+                if line.find("MINI> ") != -1:
+                    with contextlib.suppress(Exception):
+                        self.structure.iter = int(line.split()[1])
+                elif line.find("ABNORMAL TERMINATION") != -1:
+                    abnormal = True
+                last_lines.append(line)
+                if line.find("CPU TIME") != -1:
+                    cpu_lines = list(last_lines)
+            if cpu_lines is not None and len(cpu_lines) == 2:
+                self.optimized = not abnormal
+                self.cputime = float(cpu_lines[0].split()[-2])
 
         if self.optimized:
-            with open(self.dump) as f:
-                lines = f.readlines()
+            with open(self.get_path(self.dump)) as f:
                 positions = []
-                for line in lines:
+                for line in f:
                     if line.find("REMARK ENERGY") != -1:
                         tmp = line.split(":")
                         self.structure.energy = float(tmp[-1])
@@ -369,17 +430,26 @@ class CHARMM:
         return fftxyz
 
 
+# prm files which have been checked, by (mtime, size)
+_checked_prm = {}
+
+
 def check_prm(path):
     """
     Todo: move it to charmm interface
     Sometimes there are something wrong with prm file (RUBGIH),
     """
+    key = os.path.abspath(path)
+    stat = os.stat(path)
+    if _checked_prm.get(key) == (stat.st_mtime, stat.st_size):
+        return
+
     with open(path) as f:
         lines = f.readlines()
-        pairs = []
-        triplets = []
-        imphis = []
-        ids = []
+        pairs = set()
+        triplets = set()
+        imphis = set()
+        ids = set()
         do_angle = False
         do_bond = False
         do_imphi = False
@@ -398,10 +468,10 @@ def check_prm(path):
                     pair1 = tmp[0] + " " + tmp[1]
                     pair2 = tmp[1] + " " + tmp[0]
                     if (pair1 in pairs) or (pair2 in pairs):
-                        ids.append(i)
+                        ids.add(i)
                         print("Duplicate bonds: ", l[:-2])
                     else:
-                        pairs.append(pair1)
+                        pairs.add(pair1)
                 else:
                     do_bond = False
             elif do_angle:
@@ -409,10 +479,10 @@ def check_prm(path):
                     pair1 = tmp[0] + " " + tmp[1] + " " + tmp[2]
                     pair2 = tmp[2] + " " + tmp[1] + " " + tmp[0]
                     if (pair1 in triplets) or (pair2 in triplets):
-                        ids.append(i)
+                        ids.add(i)
                         print("Duplicate angles: ", l[:-2])
                     else:
-                        triplets.append(pair1)
+                        triplets.add(pair1)
                 else:
                     do_angle = False
             # elif do_dihedral:
@@ -436,17 +506,20 @@ def check_prm(path):
                     pair1 = tmp[0] + " " + tmp[1] + " " + tmp[2] + " " + tmp[3]
                     # pair2 = tmp[0] + ' ' + tmp[1] + ' ' + tmp[2] + ' ' +tmp[0]
                     if pair1 in imphis:  # or (pair2 in imphis):
-                        ids.append(i)
+                        ids.add(i)
                         print("Duplicate imphi angles: ", l[:-2])
                     else:
-                        imphis.append(pair1)
+                        imphis.add(pair1)
                 else:
                     do_imphi = False
                     break
 
-    lines = [lines[i] for i in range(len(lines)) if i not in ids]
-    with open(path, "w") as f:
-        f.writelines(lines)
+    if len(ids) > 0:
+        lines = [lines[i] for i in range(len(lines)) if i not in ids]
+        with open(path, "w") as f:
+            f.writelines(lines)
+    stat = os.stat(path)
+    _checked_prm[key] = (stat.st_mtime, stat.st_size)
 
 
 class RTF:
@@ -766,9 +839,11 @@ class PRM:
         """
         if prm1 is not None:
             for key in self.keywords:
+                existing = set(self.dict[key])
                 for data in prm1.dict[key]:
-                    if data not in self.dict[key]:
+                    if data not in existing:
                         self.dict[key].append(data)
+                        existing.add(data)
         elif single is not None:
             self.dict["NONBOND"] += [single["nonbond"]]
             # add the nonbonded parameters
@@ -1,5 +1,6 @@
 import os
 import re
+from io import StringIO
 
 import numpy as np
 from ase.calculators.calculator import (
@@ -15,6 +16,10 @@ from ase.units import Bohr, Hartree
 
 from pyxtal.util import Kgrid
 
+_hamiltonian_cache = {}
+_tag_pattern = re.compile(r"^(\w+)\s*:(\w+):(\d+):")
+_energy_pattern = re.compile(r"Total Energy:\s+[-\d.]+ H\s+([-.\d]+) eV")
+
 
 def make_Hamiltonian(
     skf_dir,
@@ -26,6 +31,24 @@ def make_Hamiltonian(
     write_band=False,
     use_omp=False,
 ):
+    """
+    Generate the DFTB Hamiltonian for DFTB+. The settings are cached
+    per chemical system, so that the repeated calls on many structures
+    do not redo the lookup.
+    """
+    # kpts only enters the MBD dispersion
+    k = tuple(kpts) if disp == "MBD" else None
+    key = (skf_dir, frozenset(atom_types), disp, k, scc_error, scc_iter, write_band, use_omp)
+    if key not in _hamiltonian_cache:
+        if len(_hamiltonian_cache) > 1000:
+            _hamiltonian_cache.clear()
+        _hamiltonian_cache[key] = _make_Hamiltonian(
+            skf_dir, sorted(atom_types), disp, kpts, scc_error, scc_iter, write_band, use_omp
+        )
+    return _hamiltonian_cache[key].copy()
+
+
+def _make_Hamiltonian(skf_dir, atom_types, disp, kpts, scc_error, scc_iter, write_band, use_omp):
     """
     Generate the DFTB Hamiltonian for DFTB+
     """
@@ -187,6 +210,7 @@ def DFTB_relax(
     scc_error=1e-6,
     scc_iter=500,
     use_omp=False,
+    calcs=None,
 ):
     """
     DFTB optimizer based on ASE
@@ -196,6 +220,7 @@ def DFTB_relax(
         mode: [`single`, `relax`, `vc_relax`] (str)
         step: optimization steps (int)
         mask: apply constraints on strain
+        calcs: dict of calculators to share among the calls
     """
     if not os.path.exists(folder):
         os.makedirs(folder)
@@ -204,14 +229,22 @@ def DFTB_relax(
     if type(kresol) != list:
         kpts = Kgrid(struc, kresol)
     atom_types = set(struc.get_chemical_symbols())
-    kwargs = make_Hamiltonian(skf_dir, atom_types, disp, kpts, scc_error=scc_error, use_omp=use_omp)
 
-    calc = Dftb(
-        label="test",
-        atoms=struc,
-        kpts=kpts,
-        **kwargs,
-    )
+    key = (skf_dir, tuple(sorted(atom_types)), tuple(kpts), disp, scc_error, use_omp)
+    if calcs is not None and key in calcs:
+        # only the geometry is rewritten for the next calculation
+        calc = calcs[key]
+        calc.reset()
+    else:
+        kwargs = make_Hamiltonian(skf_dir, atom_types, disp, kpts, scc_error=scc_error, use_omp=use_omp)
+        calc = Dftb(
+            label="test",
+            atoms=struc,
+            kpts=kpts,
+            **kwargs,
+        )
+        if calcs is not None:
+            calcs[key] = calc
     struc.set_calculator(calc)
 
     # impose symmetry
@@ -238,6 +271,24 @@ def DFTB_relax(
     return struc
 
 
+def DFTB_relax_batch(strucs, skf_dir, folder="tmp", **kwargs):
+    """
+    Run DFTB_relax for a list of structures in one worker. The calculators
+    are shared among the structures with the same elements and kpoints.
+
+    Args:
+        strucs: list of ase atoms objects
+        skf_dir: path of skf files
+        folder: calculation folder
+        kwargs: other arguments for DFTB_relax
+
+    Returns:
+        list of relaxed atoms (None if failed)
+    """
+    calcs = {}
+    return [DFTB_relax(struc, skf_dir, folder=folder, calcs=calcs, **kwargs) for struc in strucs]
+
+
 def DFTB_SCF(struc, skf_dir, kresol=0.10, folder="tmp", disp=None, filename=None):
     """
     DFTB SCF to get band structure
@@ -426,8 +477,8 @@ class DFTB:
         energy = self.struc.get_potential_energy()
 
         with open(self.label + ".out") as f:
-            l = f.readlines()
-            self.version = l[2]
+            for _ in range(3):
+                self.version = f.readline()
         os.chdir(cwd)
         self.time = time() - t0
         return final, energy
@@ -531,6 +582,8 @@ class Dftb(FileIOCalculator):
         )
 
         self.lines = None
+        self.tags = {}
+        self.hsd = None
         self.atoms = None
         self.atoms_input = None
         self.outfilename = "dftb.out"
@@ -649,8 +702,15 @@ class Dftb(FileIOCalculator):
         from ase.io import write
 
         FileIOCalculator.write_input(self, atoms, properties, system_changes)
-        with open(os.path.join(self.directory, "dftb_in.hsd"), "w") as fd:
-            self.write_dftb_in(fd)
+        # the input only refers to geo_end.gen, rewrite it if the parameters change
+        fd = StringIO()
+        self.write_dftb_in(fd)
+        hsd = fd.getvalue()
+        path = os.path.abspath(os.path.join(self.directory, "dftb_in.hsd"))
+        if self.hsd != (path, hsd) or not os.path.exists(path):
+            with open(path, "w") as fd:
+                fd.write(hsd)
+            self.hsd = (path, hsd)
         write(os.path.join(self.directory, "geo_end.gen"), atoms, parallel=False)
         # self.atoms is none until results are read out,
         # then it is set to the ones at writing input
@@ -661,8 +721,14 @@ class Dftb(FileIOCalculator):
         """all results are read from results.tag file
         It will be destroyed after it is read to avoid
         reading it once again after some runtime error"""
+        self.lines = []
+        self.tags = {}
         with open(os.path.join(self.directory, "results.tag")) as fd:
-            self.lines = fd.readlines()
+            for i, line in enumerate(fd):
+                self.lines.append(line)
+                m = _tag_pattern.match(line)
+                if m:
+                    self.tags[m.group(1)] = i
         if len(self.lines) == 0:
             # print("READ RESULTS from test.out")
             self.results["energy"] = self.read_energy()
@@ -675,19 +741,10 @@ class Dftb(FileIOCalculator):
             self.results["forces"] = forces
 
             # stress stuff begins
-            sstring = "stress"
-            have_stress = False
-            stress = list()
-            for iline, line in enumerate(self.lines):
-                if sstring in line:
-                    have_stress = True
-                    start = iline + 1
-                    end = start + 3
-                    for i in range(start, end):
-                        cell = [float(x) for x in self.lines[i].split()]
-                        stress.append(cell)
-            if have_stress:
-                stress = -np.array(stress) * Hartree / Bohr**3
+            if "stress" in self.tags:
+                start = self.tags["stress"] + 1
+                stress = np.loadtxt(self.lines[start : start + 3])
+                stress = -stress * Hartree / Bohr**3
                 self.results["stress"] = stress.flat[[0, 4, 8, 5, 2, 1]]
             # stress stuff ends
 
@@ -698,16 +755,19 @@ class Dftb(FileIOCalculator):
         """
         If SCC is not converged, read the last step energy from test.out
         """
+        from collections import deque
+
         outfile = self.label + ".out"
-        energies = []
+        energy = None
+        lines = deque(maxlen=3)
         with open(os.path.join(self.directory, outfile)) as fd:
-            lines = fd.readlines()
-        for line in lines:
-            m = re.match(r"Total Energy:\s+[-\d.]+ H\s+([-.\d]+) eV", line)
-            if m:
-                energies.append(float(m.group(1)))
-        if len(energies) > 0:
-            return energies[-1]
+            for line in fd:
+                lines.append(line)
+                m = _energy_pattern.match(line)
+                if m:
+                    energy = float(m.group(1))
+        if energy is not None:
+            return energy
         else:
             try:
                 #   100   -0.38553421E+03    0.29798304E-03    0.12389437E-01
@@ -721,39 +781,25 @@ class Dftb(FileIOCalculator):
     def read_forces(self):
         """Read Forces from dftb output file (results.tag)."""
 
-        # Initialise the indices so their scope
-        # reaches outside of the for loop
-        index_force_begin = -1
-        index_force_end = -1
-
-        # Force line indexes
-        fstring = "forces   "
-        for iline, line in enumerate(self.lines):
-            if line.find(fstring) >= 0:
-                index_force_begin = iline + 1
-                line1 = line.replace(":", ",")
-                index_force_end = iline + 1 + int(line1.split(",")[-1])
-                break
-        gradients = []
-        for j in range(index_force_begin, index_force_end):
-            word = self.lines[j].split()
-            gradients.append([float(word[k]) for k in range(3)])
-        return np.array(gradients) * Hartree / Bohr
+        if "forces" not in self.tags:
+            return np.zeros([0, 3])
+        iline = self.tags["forces"]
+        line1 = self.lines[iline].replace(":", ",")
+        start = iline + 1
+        end = start + int(line1.split(",")[-1])
+        gradients = np.loadtxt(self.lines[start:end], ndmin=2)[:, :3]
+        return gradients * Hartree / Bohr
 
     def read_eigenvalues(self):
         """Read Eigenvalues from dftb output file (results.tag).
         Unfortunately, the order seems to be scrambled."""
         # Eigenvalue line indexes
-        index_eig_begin = None
-        for iline, line in enumerate(self.lines):
-            fstring = "eigenvalues   "
-            if line.find(fstring) >= 0:
-                index_eig_begin = iline + 1
-                line1 = line.replace(":", ",")
-                ncol, nband, nkpt, nspin = map(int, line1.split(",")[-4:])
-                break
-        else:
+        if "eigenvalues" not in self.tags:
             return None
+        iline = self.tags["eigenvalues"]
+        index_eig_begin = iline + 1
+        line1 = self.lines[iline].replace(":", ",")
+        ncol, nband, nkpt, nspin = map(int, line1.split(",")[-4:])
 
         # Take into account that the last row may lack
         # columns if nkpt * nspin * nband % ncol != 0
@@ -772,13 +818,9 @@ class Dftb(FileIOCalculator):
     def read_fermi_levels(self):
         """Read Fermi level(s) from dftb output file (results.tag)."""
         # Fermi level line indexes
-        for iline, line in enumerate(self.lines):
-            fstring = "fermi_level   "
-            if line.find(fstring) >= 0:
-                index_fermi = iline + 1
-                break
-        else:
+        if "fermi_level" not in self.tags:
             return None
+        index_fermi = self.tags["fermi_level"] + 1
 
         fermi_levels = []
         words = self.lines[index_fermi].split()
@@ -796,11 +838,7 @@ class Dftb(FileIOCalculator):
 
     def read_electrons(self):
         """read number o electrons"""
-        for iline, line in enumerate(self.lines):
-            fstring = "number_of_electrons"
-            if line.find(fstring) >= 0:
-                index_ele = iline + 1
-                break
+        index_ele = self.tags["number_of_electrons"] + 1
         return float(self.lines[index_ele].split("\n")[0])
 
 
@@ -96,7 +96,7 @@ at_types = {
 }
 
 
-class GULP_OC:
+class GULP:
     """
     A calculator to perform structure optimization in GULP
     At the moment, only inorganic crystal is considered
@@ -166,6 +166,8 @@ class GULP_OC:
         self.optimized = False
         self.cputime = 0
         self.error = False
+        self.asym_coords = None
+        self.symmetrized = False
 
     def set_catlow(self):
         """
@@ -205,18 +207,70 @@ class GULP_OC:
         return Structure(self.lattice.matrix, self.sites, self.frac_coords)
 
     def to_pyxtal(self):
+        """
+        Return the relaxed structure as a pyxtal object. If the input pyxtal
+        has been updated in place with its Wyckoff assignment kept, return it
+        directly. Otherwise, fall back to the symmetry detection.
+        """
+        if self.pyxtal is not None and self.symmetrized:
+            return self.pyxtal
+
         ase_atoms = self.to_ase()
+        struc = None
         for tol in [1e-2, 1e-3, 1e-4, 1e-5]:
             try:
                 struc = pyxtal()
-                struc.from_seed(ase_atoms, tol=tol)
+                struc.from_seed(ase_atoms, tol=tol, backend="spglib")
                 break
             except:
-                pass
-                # print('Something is wrong', tol)
-                # struc.from_seed('bug.vasp', tol*10)
+                struc = None
         return struc
 
+    def update_pyxtal(self, tol=1e-2):
+        """
+        Update the atom_sites and lattice of the input pyxtal in place
+        from the relaxed structure, while keeping the Wyckoff assignment.
+        The asymmetric unit is used if GULP was run with symmetry.
+        Otherwise, the full coordinates are mapped back to each site,
+        following the order of `to_ase(resort=False)`.
+
+        Args:
+            tol (float): maximum cartesian deviation (in A) from the site
+
+        Returns:
+            True if the symmetry is kept, False otherwise
+        """
+        xtal = self.pyxtal
+        matrix = self.lattice.matrix
+        sites = xtal.atom_sites
+
+        if self.asym_coords is not None:
+            if len(self.asym_coords) != len(sites):
+                return False
+            refs = [pos[None, :] for pos in self.asym_coords]
+        else:
+            mults = [site.wp.multiplicity for site in sites]
+            if len(self.frac_coords) != sum(mults):
+                return False
+            ends = np.cumsum(mults)
+            refs = [self.frac_coords[end - mult : end] for mult, end in zip(mults, ends)]
+
+        positions = []
+        for site, ref in zip(sites, refs):
+            pos = site.wp.project(ref[0], matrix)
+            coords = site.wp.apply_ops(pos)[: len(ref)]
+            diff = coords - ref
+            diff -= np.rint(diff)
+            if np.linalg.norm(diff.dot(matrix), axis=1).max() > tol:
+                return False
+            positions.append(pos)
+
+        for site, pos in zip(sites, positions):
+            site.update(pos)
+        xtal.lattice = self.lattice
+        self.symmetrized = True
+        return True
+
     def write(self):
         a, b, c, alpha, beta, gamma = self.lattice.get_para(degree=True)
 
@@ -353,13 +407,17 @@ class GULP_OC:
 
                 # asymmetric unit
                 elif line.find("Final asymmetric unit coordinates") != -1:
-                    s = i + 6
+                    s = i + 5
                     positions = []
-                    for _i in range(len(self.pyxtal.atom_sites)):
-                        xyz = lines[s + _i].split()[3:6]
-                        XYZ = [float(x) for x in xyz]
-                        # print(XYZ)
-                        self.pyxtal.atom_sites[_i].update(XYZ)
+                    while True:
+                        s = s + 1
+                        if lines[s].find("------------") != -1:
+                            break
+                        tmp = lines[s].split()
+                        # skip the shells
+                        if tmp[2] == "c":
+                            positions.append([float(x) for x in tmp[3:6]])
+                    self.asym_coords = np.array(positions)
 
                 elif line.find("Final fractional coordinates of atoms") != -1:
                     s = i + 5
@@ -403,8 +461,10 @@ class GULP_OC:
             self.error = True
             self.energy = None
 
-        if self.pyxtal is not None:
-            self.pyxtal.lattice = self.lattice
+        if self.pyxtal is not None and not self.error and not self.update_pyxtal() and self.asym_coords is not None:
+            # the full coordinates are not available for fallback
+            self.error = True
+            self.energy = None
 
         if self.energy is None or np.isnan(self.energy):
             self.error = True
@@ -694,7 +754,7 @@ def single_optimize(
         print("GULP error in single optimize")
         return None, None, 0, True
     else:
-        struc = calc.to_pyxtal() if calc.pyxtal is None else calc.pyxtal
+        struc = calc.to_pyxtal()
         # if sum(struc.numIons) == 42: print("SSSSS"); import sys; sys.exit()
         return struc, calc.energy_per_atom, calc.cputime, calc.error
 
@@ -897,3 +897,240 @@ class vasprun:
         else:
             plt.savefig(filename, dpi=dpi)
             plt.close()
+
+
+def parse_varray_numpy(varray):
+    """
+    Convert a <varray> element to a 2D numpy array in one shot. Overflowed
+    values (e.g., ********) are set to np.nan.
+
+    Args:
+        varray: the lxml element
+
+    Returns:
+        (N_rows, N_cols) numpy array
+    """
+    rows = varray.findall("v")
+    tokens = " ".join(v.text or "" for v in rows).split()
+    if varray.get("type") == "logical":
+        data = np.array([t == "T" for t in tokens])
+    elif varray.get("type") == "int":
+        data = np.array(tokens, dtype=int)
+    else:
+        try:
+            data = np.array(tokens, dtype=float)
+        except ValueError:
+            data = np.array([np.nan if set(t) == {"*"} else float(t) for t in tokens])
+    return data.reshape(len(rows), -1)
+
+
+def _free(elem):
+    """
+    Release an element and its processed siblings during iterparse
+    """
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+class vasprun_stream:
+    """
+    A light-weight vasprun.xml reader for the large MD or phonon runs. The
+    file is walked through with `iterparse` and each ionic step is freed
+    after it has been processed, so that the memory does not grow with the
+    file. Only the requested fields are extracted, while the large blocks
+    such as DOS, eigenvalues and projections are never parsed. The results follow
+    the layout of `vasprun.values`.
+
+    Available fields:
+
+    - `energy`: e_fr_energy of the last ionic step
+    - `forces`: forces of the last ionic step
+    - `stress`: stress of the last ionic step
+    - `initialpos`: initial lattice (`basis`) and `positions`
+    - `finalpos`: final lattice (`basis`) and `positions`
+    - `efermi`: Fermi energy of the last ionic step
+    - `scf`: number of scf steps in each ionic step
+    - `trajectory`: energy, forces, stress, basis and positions of all steps
+
+    If the file is truncated (e.g., a killed MD run), the values from the
+    completed ionic steps are kept and `self.error` is set to True.
+
+    Args:
+        vasp_file: the path of vasprun.xml
+        fields: list of fields to extract
+        verbosity: output error msgs or not
+    """
+
+    all_fields = (
+        "energy",
+        "forces",
+        "stress",
+        "initialpos",
+        "finalpos",
+        "efermi",
+        "scf",
+        "trajectory",
+    )
+
+    def __init__(self, vasp_file="vasprun.xml", fields=("energy", "forces", "stress", "finalpos"), verbosity=0):
+        for field in fields:
+            if field not in self.all_fields:
+                raise ValueError(f"Unknown field {field}, choose from {self.all_fields}")
+        self.fields = set(fields)
+        self.error = False
+        self.errormsg = ""
+        self.values = {}
+        try:
+            self.parse(vasp_file)
+        except etree.XMLSyntaxError:
+            self.error = True
+            self.errormsg = "corrupted file found"
+        self.finalize()
+
+        if verbosity > 0 and self.error is True:
+            print("----------Warning---------------")
+            print(self.errormsg)
+            print("--------------------------------")
+
+    def __str__(self):
+        s = "vasprun_stream: " + ", ".join(sorted(self.fields))
+        if "calculation" in self.values and "energy" in self.values["calculation"]:
+            s += "\nEnergy: {:12.6f} eV".format(self.values["calculation"]["energy"])
+        if "trajectory" in self.values:
+            s += "\nIonic steps: {:d}".format(len(self.values["trajectory"]["energy"]))
+        if self.error:
+            s += "\nError: " + self.errormsg
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    @staticmethod
+    def parse_structure(structure):
+        d = {}
+        for varray in structure.iter("varray"):
+            name = varray.get("name")
+            if name in ("basis", "positions"):
+                d[name] = parse_varray_numpy(varray)
+        return d
+
+    def parse(self, vasp_file):
+        """
+        Walk through the xml file and extract the requested fields. Only the
+        top-level blocks trigger the python callbacks, each ionic step is
+        processed and freed at the end of its <calculation> block.
+        """
+        self.steps = []
+        tags = ("atominfo", "structure", "calculation")
+        for _, elem in etree.iterparse(vasp_file, events=("end",), tag=tags, huge_tree=True):
+            if elem.getparent().tag != "modeling":
+                continue
+            if elem.tag == "atominfo":
+                self.values["name_array"] = vasprun.parse_name_array(elem)
+                self.values["composition"] = vasprun.parse_composition(elem)
+                self.values["elements"] = vasprun.get_element(self.values["composition"])
+            elif elem.tag == "structure":
+                name = elem.get("name")
+                if name in self.fields:
+                    self.values[name] = self.parse_structure(elem)
+            else:
+                self.steps.append(self.parse_step(elem))
+            _free(elem)
+
+    def parse_step(self, calculation):
+        """
+        Extract the requested values from one <calculation> block
+        """
+        step = {}
+        for i in calculation.iterchildren():
+            if i.tag == "energy":
+                for e in i.findall("i"):
+                    if e.get("name") == "e_fr_energy":
+                        try:
+                            step["energy"] = float(e.text)
+                        except ValueError:
+                            step["energy"] = 100000000
+            elif i.tag == "varray" and i.get("name") in ("forces", "stress"):
+                if i.get("name") in self.fields or "trajectory" in self.fields:
+                    step[i.get("name")] = parse_varray_numpy(i)
+            elif i.tag == "structure" and "trajectory" in self.fields:
+                step.update(self.parse_structure(i))
+            elif i.tag == "scstep":
+                step["scf"] = step.get("scf", 0) + 1
+            elif i.tag == "dos" and "efermi" in self.fields:
+                for e in i.findall("i"):
+                    if e.get("name") == "efermi":
+                        step["efermi"] = float(e.text)
+        return step
+
+    def finalize(self):
+        """
+        Collect the values of the last ionic step and the trajectory
+        """
+        steps = [step for step in self.steps if "energy" in step]
+        if len(steps) > 0:
+            last = steps[-1]
+            calculation = {}
+            for field, key in [("energy", "energy"), ("forces", "force"), ("stress", "stress"), ("efermi", "efermi")]:
+                if field in self.fields and field in last:
+                    calculation[key] = last[field]
+            if "scf" in self.fields:
+                calculation["scf"] = [step.get("scf", 0) for step in steps]
+            if "energy" in calculation and "name_array" in self.values:
+                calculation["energy_per_atom"] = calculation["energy"] / len(self.values["name_array"])
+            self.values["calculation"] = calculation
+
+            if "trajectory" in self.fields:
+                traj = {}
+                for key in ["energy", "forces", "stress", "basis", "positions"]:
+                    if all(key in step for step in steps):
+                        traj[key] = np.array([step[key] for step in steps])
+                self.values["trajectory"] = traj
+        del self.steps
+
+
+def _read_vasprun_stream(args):
+    vasp_file, fields = args
+    return vasp_file, vasprun_stream(vasp_file, fields)
+
+
+def read_vasprun_folder(
+    folder,
+    fields=("energy", "forces", "stress", "finalpos"),
+    pattern="vasprun*.xml",
+    ncpu=1,
+    chunksize=None,
+):
+    """
+    Read all vasprun files under a folder (including the subfolders)
+    with `vasprun_stream`.
+
+    Args:
+        folder: the root folder
+        fields: list of fields to extract
+        pattern: the file name pattern
+        ncpu: number of parallel processes
+        chunksize: number of files per task
+
+    Returns:
+        a dictionary of {path: vasprun_stream}
+    """
+    import os
+    from glob import glob
+
+    paths = sorted(glob(os.path.join(folder, "**", pattern), recursive=True))
+    args = [(path, tuple(fields)) for path in paths]
+
+    if ncpu == 1 or len(paths) < 2:
+        results = [_read_vasprun_stream(arg) for arg in args]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        if chunksize is None:
+            chunksize = max(1, len(args) // (4 * ncpu))
+        with ProcessPoolExecutor(max_workers=ncpu) as executor:
+            results = list(executor.map(_read_vasprun_stream, args, chunksize=chunksize))
+    return dict(results)
@@ -2,17 +2,18 @@
 This module handles reading and write crystal files.
 """
 
+import os
+
 import numpy as np
 from monty.serialization import loadfn
 from pkg_resources import resource_filename
-from pymatgen.core.bonds import CovalentBond
 from pymatgen.core.structure import Molecule, Structure
 
 from pyxtal.constants import logo
 from pyxtal.lattice import Lattice
 from pyxtal.molecule import Orientation, compare_mol_connectivity, pyxtal_molecule
 from pyxtal.msg import ReadSeedError
-from pyxtal.symmetry import Group
+from pyxtal.symmetry import Group, Hall
 from pyxtal.util import get_symmetrized_pmg
 from pyxtal.wyckoff_site import atom_site, mol_site
 
@@ -32,6 +33,47 @@ def in_merged_coords(wp, pt, pts, cell):
     return False
 
 
+# cached (symbol, symop loop) by the hall number and symops
+_cif_symops = {}
+
+
+def get_cif_symops(G1=None, symbol=None, wp=None):
+    """
+    Get the H-M symbol and the `_symmetry_equiv_pos` loop for the cif output.
+    Both are cached by the hall number and the symops of the general position,
+    so that the setting check and the xyz strings are only computed once.
+
+    Args:
+        G1: the general Wyckoff position, None means P1
+        symbol: H-M symbol of the group in the standard setting
+        wp: the Wyckoff position to get the symbol for non-standard setting
+
+    Returns:
+        the H-M symbol and the string of symops loop
+    """
+    if G1 is None:
+        key = None
+    else:
+        affine = np.array([op.affine_matrix for op in G1.ops]).round(4)
+        key = (G1.hall_number, affine.tobytes())
+
+    if key not in _cif_symops:
+        if G1 is None:
+            G1 = Group(1).Wyckoff_positions[0]
+            symbol = "P1"
+        elif not G1.is_standard_setting():
+            symbol = wp.get_hm_symbol()
+
+        lines = "\nloop_\n"
+        lines += " _symmetry_equiv_pos_site_id\n"
+        lines += " _symmetry_equiv_pos_as_xyz\n"
+        for i, op in enumerate(G1):
+            lines += f"{i + 1:d} '{op.as_xyz_str():s}'\n"
+        _cif_symops[key] = (symbol, lines)
+
+    return _cif_symops[key]
+
+
 def write_cif(struc, filename=None, header="", permission="w", sym_num=None, style="mp"):
     """
     Export the structure in cif format
@@ -58,14 +100,12 @@ def write_cif(struc, filename=None, header="", permission="w", sym_num=None, sty
     if sym_num is None:
         l_type = struc.group.lattice_type
         number = struc.group.number
-        G1 = struc.group[0]
-        symbol = struc.group.symbol if G1.is_standard_setting() else sites[0].wp.get_hm_symbol()
+        symbol, symops = get_cif_symops(struc.group[0], struc.group.symbol, sites[0].wp)
 
     else:  # P1 symmetry
         l_type = "triclinic"
-        symbol = "P1"
         number = 1
-        G1 = Group(1).Wyckoff_positions[0]
+        symbol, symops = get_cif_symops()
 
     lines = logo
     lines += "data_" + header + "\n"
@@ -90,12 +130,7 @@ def write_cif(struc, filename=None, header="", permission="w", sym_num=None, sty
     # else:
     #    lines += '_cell_formula_units_Z     {:d}\n'.format(sum(struc.numIons))
 
-    lines += "\nloop_\n"
-    lines += " _symmetry_equiv_pos_site_id\n"
-    lines += " _symmetry_equiv_pos_as_xyz\n"
-
-    for i, op in enumerate(G1):
-        lines += f"{i + 1:d} '{op.as_xyz_str():s}'\n"
+    lines += symops
 
     lines += "\nloop_\n"
     lines += " _atom_site_label\n"
@@ -122,9 +157,9 @@ def write_cif(struc, filename=None, header="", permission="w", sym_num=None, sty
                     merges = []
 
                     for coord, specie in zip(coord0s, specie0s):
-                        _, wp, _ = G1.merge(coord, struc.lattice.matrix, 0.05)
+                        _, wp, _ = struc.group[0].merge(coord, struc.lattice.matrix, 0.05)
                         if len(wp) > mul:
-                            if not in_merged_coords(G1, [coord, specie], merges, struc.lattice.matrix):
+                            if not in_merged_coords(struc.group[0], [coord, specie], merges, struc.lattice.matrix):
                                 # print("General Position", specie, coord)
                                 coords.append(coord)
                                 species.append(specie)
@@ -167,6 +202,76 @@ def write_cif(struc, filename=None, header="", permission="w", sym_num=None, sty
         return None
 
 
+def _write_cifs(strucs, headers, kwargs):
+    """
+    Generate the cif strings for a list of structures
+    """
+    return [write_cif(struc, None, header, **kwargs) for struc, header in zip(strucs, headers)]
+
+
+def write_cifs(
+    strucs,
+    filename=None,
+    folder=None,
+    headers=None,
+    permission="w",
+    ncpu=1,
+    chunksize=100,
+    **kwargs,
+):
+    """
+    Export a list of structures to a single multi-block cif or
+    to the individual cif files under a folder
+
+    Args:
+        strucs: list of pyxtal structures
+        filename: path of the cif file to store all structures
+        folder: path of the folder to store each structure as `{header}.cif`
+        headers: list of headers, default is the index
+        permission: write(`w`) or append(`a+`) to the single cif file
+        ncpu: number of parallel processes
+        chunksize: number of structures per parallel task
+        kwargs: other options passed to `write_cif` (e.g., `sym_num`, `style`)
+
+    Returns:
+        list of cif strings if neither filename nor folder is given
+    """
+    if headers is None:
+        headers = [str(i) for i in range(len(strucs))]
+    if folder is not None and not os.path.exists(folder):
+        os.makedirs(folder)
+
+    args = [(strucs[i : i + chunksize], headers[i : i + chunksize], kwargs) for i in range(0, len(strucs), chunksize)]
+
+    def dump(results):
+        cifs = []
+        if filename is not None:
+            with open(filename, permission, buffering=1 << 20) as f:
+                for lines in results:
+                    f.writelines(lines)
+        else:
+            for (_, _headers, _), lines in zip(args, results):
+                if folder is not None:
+                    for header, cif in zip(_headers, lines):
+                        with open(os.path.join(folder, header + ".cif"), "w") as f0:
+                            f0.write(cif)
+                else:
+                    cifs.extend(lines)
+        return cifs
+
+    if ncpu == 1:
+        cifs = dump(_write_cifs(*arg) for arg in args)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=ncpu) as executor:
+            cifs = dump(executor.map(_write_cifs, *zip(*args)))
+
+    if filename is None and folder is None:
+        return cifs
+    return None
+
+
 def read_cif(filename):
     """
     read the cif, mainly for pyxtal cif output
@@ -195,8 +300,8 @@ def read_cif(filename):
             elif line.startswith("_symmetry_cell_setting"):
                 lat_type = line.split()[-1]
             elif line.startswith("_symmetry_space_group_name_H-M "):
-                symbol = line.split()[-1]
-                diag = eval(symbol) in ["Pn", "P21/n", "C2/n"]
+                symbol = line.split()[-1].strip("'")
+                diag = symbol in ["Pn", "P21/n", "C2/n"]
 
             elif line.find("_atom_site") >= 0:
                 s = i
@@ -222,6 +327,382 @@ def read_cif(filename):
     return lattice, sites
 
 
+# cached groups by hall number, and hall numbers by (spg, symops)
+_cif_groups = {}
+_cif_halls = {}
+
+
+def _get_cif_group(spg, ops):
+    """
+    Find the group whose general position matches the symops listed in cif
+
+    Args:
+        spg: space group number
+        ops: list of symmetry operations in xyz strings
+
+    Returns:
+        a cached Group object
+    """
+    key = (spg, tuple(op.replace(" ", "") for op in ops))
+    if key not in _cif_halls:
+        hall = Hall(spg, permutation=True)
+        hns = [hall.hall_default] + [hn for hn in hall.hall_numbers if hn != hall.hall_default]
+        _cif_halls[key] = hall.hall_default
+        for hn in hns:
+            if hn not in _cif_groups:
+                _cif_groups[hn] = Group(hn, use_hall=True)
+            xyzs = tuple(op.as_xyz_str().replace(" ", "") for op in _cif_groups[hn][0])
+            if xyzs == key[1]:
+                _cif_halls[key] = hn
+                break
+    hn = _cif_halls[key]
+    if hn not in _cif_groups:
+        _cif_groups[hn] = Group(hn, use_hall=True)
+    return _cif_groups[hn]
+
+
+class cif_record:
+    """
+    A lightweight record of a single structure block in the cif file
+    written by pyxtal, without calling pymatgen
+
+    Args:
+        header: the string after `data_`
+        energy: energy read from the `#Energy` line
+        spg: space group number
+        symbol: H-M symbol
+        ltype: lattice type
+        cell: [a, b, c, alpha, beta, gamma]
+        ops: list of symmetry operations in xyz strings
+        sites: list of (specie, multiplicity, letter, xyz) in the asymmetric unit
+    """
+
+    def __init__(self, header="", energy=None, spg=1, symbol="P1", ltype="triclinic", cell=None, ops=None, sites=None):
+        self.header = header
+        self.energy = energy
+        self.spg = spg
+        self.symbol = symbol
+        self.ltype = ltype
+        self.cell = cell
+        self.ops = ops if ops is not None else ["x, y, z"]
+        self.sites = sites if sites is not None else []
+
+    def __str__(self):
+        s = f"{self.header:s} {self.symbol:s} ({self.spg:d}) "
+        s += "{:8.4f} {:8.4f} {:8.4f} {:8.3f} {:8.3f} {:8.3f} ".format(*self.cell)
+        s += f"{len(self.sites):d} sites"
+        if self.energy is not None:
+            s += f" {self.energy:12.4f}"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    @classmethod
+    def from_lines(cls, lines):
+        """
+        Parse a single cif block
+
+        Args:
+            lines: list of strings starting with `data_`
+
+        Returns:
+            cif_record object
+        """
+        keys = [
+            "_cell_length_a",
+            "_cell_length_b",
+            "_cell_length_c",
+            "_cell_angle_alpha",
+            "_cell_angle_beta",
+            "_cell_angle_gamma",
+        ]
+        header = lines[0].strip()[5:]
+        energy = None
+        spg, symbol, ltype = 1, "P1", "triclinic"
+        cell = [0.0] * 6
+        ops = []
+        sites = []
+        columns = []
+        mode = None
+
+        for raw in lines[1:]:
+            line = raw.strip()
+            if line.startswith("#END"):
+                break
+            if len(line) == 0:
+                mode = None
+            elif line.startswith("#Energy"):
+                energy = float(line.split()[1])
+            elif line.startswith("loop_"):
+                mode = "loop"
+                columns = []
+            elif line.startswith("_"):
+                tmp = line.split()
+                if tmp[0] in keys:
+                    cell[keys.index(tmp[0])] = float(tmp[1])
+                elif tmp[0] == "_symmetry_Int_Tables_number":
+                    spg = int(tmp[1])
+                elif tmp[0] == "_symmetry_cell_setting":
+                    ltype = tmp[1]
+                elif tmp[0] == "_symmetry_space_group_name_H-M":
+                    symbol = line.split("'")[1] if "'" in line else tmp[-1]
+                elif tmp[0] == "_symmetry_equiv_pos_as_xyz":
+                    mode = "ops"
+                elif tmp[0].startswith("_atom_site_"):
+                    mode = "sites"
+                    columns.append(tmp[0])
+            elif mode == "ops":
+                ops.append(line.split("'")[1])
+            elif mode == "sites":
+                tmp = line.split()
+                specie = tmp[columns.index("_atom_site_type_symbol")]
+                mul = int(tmp[columns.index("_atom_site_symmetry_multiplicity")])
+                if "_atom_site_Wyckoff_symbol" in columns:
+                    letter = tmp[columns.index("_atom_site_Wyckoff_symbol")]
+                else:
+                    letter = None
+                ix = columns.index("_atom_site_fract_x")
+                xyz = [float(x) for x in tmp[ix : ix + 3]]
+                sites.append((specie, mul, letter, xyz))
+
+        if len(ops) == 0:
+            ops = ["x, y, z"]
+        return cls(header, energy, spg, symbol, ltype, cell, ops, sites)
+
+    def get_group(self):
+        """
+        Return the Group object matching the listed symops
+        """
+        return _get_cif_group(self.spg, self.ops)
+
+    def get_lattice(self):
+        """
+        Return the pyxtal Lattice object
+        """
+        group = self.get_group()
+        return Lattice.from_para(*self.cell, ltype=group.lattice_type)
+
+    def get_atom_sites(self, tol=1e-2):
+        """
+        Assign the atoms in the asymmetric unit to the Wyckoff positions
+
+        Args:
+            tol: tolerance in searching the generator
+
+        Returns:
+            list of atom_site objects
+        """
+        group = self.get_group()
+        matrix = self.get_lattice().matrix
+        sites = []
+        for specie, mul, letter, xyz in self.sites:
+            wps = [group[letter]] if letter is not None else [wp for wp in group if wp.multiplicity == mul]
+            for wp in wps:
+                pos = wp.search_generator(xyz, group[0], tol=tol)
+                if pos is not None:
+                    break
+            else:
+                pos, wp, _ = group[0].merge(xyz, matrix, 0.1)
+            sites.append(atom_site(wp.copy(), pos, specie))
+        return sites
+
+    def get_coords_and_species(self, tol=1e-2):
+        """
+        Expand the asymmetric unit to the unit cell
+
+        Args:
+            tol: tolerance to remove the duplicate atoms
+
+        Returns:
+            fractional coordinates (N*3 array) and the list of species
+        """
+        ops = self.get_group()[0]
+        coords = []
+        species = []
+        for specie, _, _, xyz in self.sites:
+            pts = ops.apply_ops(xyz)
+            pts -= np.floor(pts)
+            unique = [pts[0]]
+            for pt in pts[1:]:
+                diff = np.array(unique) - pt
+                diff -= np.rint(diff)
+                if np.min(np.abs(diff).sum(axis=1)) > tol:
+                    unique.append(pt)
+            coords.extend(unique)
+            species.extend([specie] * len(unique))
+        return np.array(coords), species
+
+    def to_pymatgen(self):
+        """
+        Export to the Pymatgen structure in the unit cell
+        """
+        coords, species = self.get_coords_and_species()
+        return Structure(self.get_lattice().matrix, species, coords)
+
+    def to_pyxtal(self, molecules=None, tol=1e-2):
+        """
+        Build the pyxtal object. The atomic crystal is constructed from the
+        Wyckoff positions directly. For the molecular crystal, the reference
+        molecules must be provided and `from_seed` is called.
+
+        Args:
+            molecules: list of reference molecules (smiles or xyz files)
+            tol: tolerance in searching the generator
+
+        Returns:
+            pyxtal object
+        """
+        from pyxtal import pyxtal
+
+        if molecules is not None:
+            xtal = pyxtal(molecular=True)
+            xtal.from_seed(self.to_pymatgen(), molecules=molecules)
+        else:
+            xtal = pyxtal()
+            xtal.group = self.get_group()
+            xtal.lattice = self.get_lattice()
+            xtal.atom_sites = self.get_atom_sites(tol)
+            xtal.species = []
+            xtal.numIons = []
+            for site in xtal.atom_sites:
+                if site.specie not in xtal.species:
+                    xtal.species.append(site.specie)
+                    xtal.numIons.append(0)
+                xtal.numIons[xtal.species.index(site.specie)] += site.multiplicity
+            xtal.standard_setting = xtal.group[0].is_standard_setting()
+            xtal.valid = True
+            xtal.factor = 1.0
+            xtal.source = "Seed"
+            xtal.dim = 3
+            xtal.PBC = [1, 1, 1]
+            xtal._get_formula()
+            if self.energy is not None:
+                xtal.energy = self.energy * sum(xtal.numIons)
+        return xtal
+
+
+class cif_reader:
+    """
+    Stream the structures from a multi-block cif file (e.g., the one
+    appended by the GA runs). The blocks are parsed one at a time as
+    `cif_record` objects. A byte-offset index of the `data_` lines can
+    be kept in `filename.idx` for random access, and is extended when
+    more blocks are appended to the cif.
+
+    Args:
+        filename: path of the cif file
+        index (bool): whether or not save the index file
+
+    Examples:
+        >>> for record in cif_reader("GA.cif"):
+        ...     print(record.energy)
+        >>> xtal = cif_reader("GA.cif", index=True)[100].to_pyxtal()
+    """
+
+    def __init__(self, filename, index=False):
+        self.filename = filename
+        self.index = index
+        self.offsets = None
+
+    def __str__(self):
+        s = f"cif_reader: {self.filename:s}"
+        if self.offsets is not None:
+            s += f" ({len(self.offsets):d} structures)"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    def __iter__(self):
+        with open(self.filename, "rb") as f:
+            lines = None
+            for line in f:
+                if line.startswith(b"data_"):
+                    if lines is not None:
+                        yield cif_record.from_lines(lines)
+                    lines = [line.decode()]
+                elif lines is not None:
+                    lines.append(line.decode())
+                    if line.startswith(b"#END"):
+                        yield cif_record.from_lines(lines)
+                        lines = None
+            if lines is not None:
+                yield cif_record.from_lines(lines)
+
+    def __len__(self):
+        return len(self.get_offsets())
+
+    def __getitem__(self, i):
+        offsets = self.get_offsets()
+        if isinstance(i, slice):
+            return [self.read(offsets[j]) for j in range(*i.indices(len(offsets)))]
+        return self.read(offsets[i])
+
+    def read(self, offset):
+        """
+        Read a single block from the given byte offset
+
+        Args:
+            offset: byte position of the `data_` line
+
+        Returns:
+            cif_record object
+        """
+        with open(self.filename, "rb") as f:
+            f.seek(offset)
+            lines = [f.readline().decode()]
+            for line in f:
+                if line.startswith(b"data_"):
+                    break
+                lines.append(line.decode())
+                if line.startswith(b"#END"):
+                    break
+        return cif_record.from_lines(lines)
+
+    def get_offsets(self):
+        """
+        Get the byte offsets of all blocks. If `index` is True, the offsets
+        are loaded from the index file and only the newly appended part of
+        the cif is scanned.
+
+        Returns:
+            array of byte offsets
+        """
+        size = os.path.getsize(self.filename)
+        if self.offsets is not None and self._size == size:
+            return self.offsets
+
+        idx_file = self.filename + ".idx"
+        offsets = []
+        start = 0
+        if self.index and os.path.exists(idx_file):
+            data = np.fromfile(idx_file, dtype=np.int64)
+            # rescan the last block in case it was incomplete
+            if len(data) > 1 and data[0] <= size:
+                offsets = list(data[1:-1])
+                start = int(data[-1])
+
+        with open(self.filename, "rb") as f:
+            f.seek(start)
+            if start > 0 and not f.readline().startswith(b"data_"):
+                # the cif has been overwritten
+                offsets = []
+                start = 0
+            f.seek(start)
+            pos = start
+            for line in f:
+                if line.startswith(b"data_"):
+                    offsets.append(pos)
+                pos += len(line)
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self._size = size
+        if self.index:
+            np.append([size], self.offsets).astype(np.int64).tofile(idx_file)
+        return self.offsets
+
+
 class structure_from_ext:
     def __init__(self, struc, ref_mols, tol=0.2, ignore_HH=False, add_H=False, hn=None):
         """
@@ -472,9 +953,44 @@ class structure_from_ext:
             return display_molecules([self.ref_mol, self.molecule])
 
 
+def get_bond_cutoff(ele1, ele2, tol=0.2, ignore_HH=True):
+    """
+    Get the maximum bond distance between two elements. It is the smaller one
+    between our own bond distance lib and the pymatgen covalent bond length
+    scaled by (1 + tol).
+
+    Args:
+        ele1: element symbol of the neighbor
+        ele2: element symbol of the center
+        tol: relative tolerance for the covalent bond length
+        ignore_HH: whether or not ignore the short H-H
+
+    Returns:
+        cutoff distance in angstrom, 0 means no bond
+    """
+    from pymatgen.core.bonds import bond_lengths
+
+    key = f"{ele1:s}-{ele2:s}"
+    syms = tuple(sorted([ele1, ele2]))
+    if key == "H-H":
+        # sometime the H-H short distance is not avoidable
+        if ignore_HH:
+            return 0
+        elif syms in bond_lengths:
+            return (1 + tol) * max(bond_lengths[syms].values())
+
+    cutoff = bonds.get(key, 0)
+    if syms in bond_lengths and key != "H-H":
+        cutoff = min(cutoff, (1 + tol) * max(bond_lengths[syms].values()))
+    return cutoff
+
+
 def search_molecules_in_crystal(struc, tol=0.2, once=False, ignore_HH=True):
     """
-    Function to perform to find the molecule in a Pymatgen structure
+    Function to perform to find the molecule in a Pymatgen structure.
+    All bonded pairs are obtained from a single neighbor list, the molecules
+    are labelled as the connected components of the bond graph, and then
+    unwrapped by accumulating the image vectors along the graph.
 
     Args:
         struc: Pymatgen Structure
@@ -484,93 +1000,62 @@ def search_molecules_in_crystal(struc, tol=0.2, once=False, ignore_HH=True):
 
     Returns:
         molecules: list of pymatgen molecules
-        positions: list of center positions
     """
-
-    def check_one_layer(struc, sites0, visited):
-        new_members = []
-        for site0 in sites0:
-            sites_add, visited = check_one_site(struc, site0, visited)
-            new_members.extend(sites_add)
-        return new_members, visited
-
-    def check_one_site(struc, site0, visited, rmax=2.8):
-        neigh_sites = struc.get_neighbors(site0, rmax)
-        ids = [m.index for m in visited]
-        sites_add = []
-        ids_add = []
-        pbc = isinstance(struc, Structure)
-
-        for site1 in neigh_sites:
-            if site1.index not in ids + ids_add:
-                try:
-                    if CovalentBond.is_bonded(site0, site1, tol):
-                        if pbc:
-                            (d, image) = site0.distance_and_image(site1)
-                        else:
-                            d = site0.distance(site1)
-                        val1, val2 = site1.specie.value, site0.specie.value
-                        key = f"{val1:s}-{val2:s}"
-
-                        # sometime the H-H short distance is not avoidable
-                        if key == "H-H":
-                            if not ignore_HH:
-                                if pbc:
-                                    site1.frac_coords += image
-                                sites_add.append(site1)
-                                ids_add.append(site1.index)
-                        else:
-                            if d < bonds[key]:
-                                if pbc:
-                                    site1.frac_coords += image
-                                sites_add.append(site1)
-                                ids_add.append(site1.index)
-                except ValueError:
-                    # QZ: use our own bond distance lib
-                    if pbc:
-                        (d, image) = site0.distance_and_image(site1)
-                    else:
-                        d = site0.distance(site1)
-
-                    val1, val2 = site1.specie.value, site0.specie.value
-                    key = f"{val1:s}-{val2:s}"
-                    if d < bonds[key]:
-                        if pbc:
-                            site1.frac_coords += image
-                        sites_add.append(site1)
-                        ids_add.append(site1.index)
-
-        if len(sites_add) > 0:
-            visited.extend(sites_add)
-
-        return sites_add, visited
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import breadth_first_order, connected_components
+    from scipy.spatial.distance import pdist, squareform
+
+    rmax = 2.8
+    N = len(struc)
+    pbc = isinstance(struc, Structure)
+    symbols = [site.specie.value for site in struc]
+    numbers = [site.specie.number for site in struc]
+
+    if pbc:
+        centers, points, images, distances = struc.get_neighbor_list(rmax)
+        images = images.astype(int)
+    else:
+        dists = squareform(pdist(struc.cart_coords))
+        np.fill_diagonal(dists, rmax)
+        centers, points = np.where(dists < rmax)
+        distances = dists[centers, points]
+        images = np.zeros([len(centers), 3], dtype=int)
+
+    # per pair cutoffs from the unique elements
+    elements, types = np.unique(symbols, return_inverse=True)
+    cutoffs = np.zeros([len(elements), len(elements)])
+    for i, ele1 in enumerate(elements):
+        for j, ele2 in enumerate(elements):
+            cutoffs[i, j] = get_bond_cutoff(ele1, ele2, tol, ignore_HH)
+    mask = distances < cutoffs[types[points], types[centers]]
+    centers, points, images, distances = centers[mask], points[mask], images[mask], distances[mask]
+
+    # keep the shortest image for each bonded pair
+    order = np.argsort(distances)[::-1]
+    pair_images = {}
+    for k in order:
+        pair_images[(centers[k], points[k])] = images[k]
+        pair_images[(points[k], centers[k])] = -images[k]
+
+    graph = coo_matrix((np.ones(len(centers)), (centers, points)), shape=(N, N)).tocsr()
+    _, labels = connected_components(graph, directed=False)
 
     molecules = []
-    visited_ids = []
-
-    for id, site in enumerate(struc.sites):
-        if id not in visited_ids:
-            first_site = site
-            visited = [first_site]
-            first_site.index = id
-            n_iter, max_iter = 0, len(struc) - len(visited_ids)
-            while n_iter < max_iter:
-                if n_iter == 0:
-                    new_sites, visited = check_one_site(struc, first_site, visited)
-                else:
-                    new_sites, visited = check_one_layer(struc, new_sites, visited)
-                n_iter += 1
-                if len(new_sites) == 0:
-                    break
-
-            coords = [s.coords for s in visited]
-            coords = np.array(coords)
-            numbers = [s.specie.number for s in visited]
-            molecules.append(Molecule(numbers, coords))
-            visited_ids.extend([s.index for s in visited])
-            # print(molecules[-1].to(fmt='xyz')); import sys; sys.exit()
-        if once and len(molecules) == 1:
-            break
+    visited = set()
+    for id in range(N):
+        if labels[id] not in visited:
+            visited.add(labels[id])
+            ids, parents = breadth_first_order(graph, id, directed=False)
+            if pbc:
+                shifts = np.zeros([N, 3], dtype=int)
+                for i in ids[1:]:
+                    shifts[i] = shifts[parents[i]] + pair_images[(parents[i], i)]
+                coords = struc.lattice.get_cartesian_coords(struc.frac_coords[ids] + shifts[ids])
+            else:
+                coords = struc.cart_coords[ids]
+            molecules.append(Molecule([numbers[i] for i in ids], coords))
+            if once:
+                break
 
     return molecules
 
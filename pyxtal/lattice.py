@@ -1,6 +1,3 @@
-# Standard Libraries
-import random
-
 import numpy as np
 
 from pyxtal.constants import deg, ltype_keywords, rad
@@ -9,6 +6,9 @@ from pyxtal.constants import deg, ltype_keywords, rad
 from pyxtal.msg import VolumeError
 from pyxtal.operations import angle, create_matrix
 
+# candidate transformations of the lattice, keyed by the cell matrix
+_transformation_cache = {}
+
 
 class Lattice:
     """
@@ -255,6 +255,60 @@ class Lattice:
         else:
             return [np.eye(3)]
 
+    def get_candidate_transformations(self):
+        """
+        Apply all permutation and transformation matrices to the lattice in
+        one shot and compute the symmetrized cell parameters. The results
+        only depend on the cell and are cached by its matrix.
+
+        Returns:
+            trans: list of [permutation, transformation] matrices
+            paras: (N, 6) array of a, b, c, alpha, beta, gamma (degree)
+            valid: (N,) bool array, False if the cell cannot be built
+        """
+        key = (self.ltype, np.round(self.matrix, 8).tobytes())
+        if key not in _transformation_cache:
+            trans1 = self.get_permutation_matrices()
+            trans2 = self.get_transformation_matrices()
+            trans = [[tran1, tran2] for tran1 in trans1 for tran2 in trans2]
+            ops = np.array([np.dot(tran2, tran1) for tran1, tran2 in trans])
+            paras = get_cell_paras(np.matmul(ops, self.matrix))
+            paras, valid = symmetrize_cell_paras(paras, self.ltype)
+            paras[:, 3:] *= deg
+            if len(_transformation_cache) > 10000:
+                _transformation_cache.clear()
+            _transformation_cache[key] = (trans, paras, valid)
+        return _transformation_cache[key]
+
+    def _get_transformation_diffs(self, lat_ref):
+        """
+        Vectorized `get_diff` between all candidate transformations and the
+        reference lattice
+
+        Returns:
+            trans: list of [permutation, transformation] matrices
+            tols: (N, 3) array of abc, fractional abc and angle differences
+            switchs: list of switch flags (None for the invalid cells)
+        """
+        trans, paras, valid = self.get_candidate_transformations()
+        ref = np.array(lat_ref.get_para(degree=True))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d_abc = ref[:3] - paras[:, :3]
+            abc_diff = np.abs(d_abc).max(axis=1)
+            abc_f_diff = np.abs(d_abc / paras[:, :3]).max(axis=1)
+        d_ang = np.abs(paras[:, 3:] - ref[3:])
+        ang_diff1 = d_ang.sum(axis=1)
+        ang_diff2 = d_ang[:, 0] + np.abs(np.abs(paras[:, 4] - 90) - abs(ref[4] - 90)) + d_ang[:, 2]
+        same = ang_diff1 < ang_diff2 + 0.01
+
+        tols = np.column_stack([abc_diff, abc_f_diff, np.where(same, ang_diff1, ang_diff2)])
+        tols[~valid] = [10, 1.0, 90]
+        switch = ~same & (self.ltype == "monoclinic")
+        switchs = [bool(sw) if v else None for sw, v in zip(switch, valid)]
+        # the matrices are shared by the cache
+        trans = [[np.array(tran1), np.array(tran2)] for tran1, tran2 in trans]
+        return trans, tols, switchs
+
     def search_transformations(self, lat_ref, d_tol=1.0, f_tol=0.1):
         """
         search the closest match to the reference lattice object
@@ -268,40 +322,16 @@ class Lattice:
         Returns:
             a two steps of transformation matrix if the match is possible
         """
-        # Find all possible permutation and transformation matrices
-        trans1 = self.get_permutation_matrices()
-        trans2 = self.get_transformation_matrices()
-        tols = np.zeros([len(trans2) * len(trans1), 3])
-        trans = []
-        switchs = []
-
-        count = 0
-        for _i, tran1 in enumerate(trans1):
-            lat0 = self.transform(tran1)
-            for _j, tran2 in enumerate(trans2):
-                tmp = np.dot(tran2, lat0.matrix)
-                try:
-                    # print("Start", np.linalg.det(tmp))
-                    lat2 = Lattice.from_matrix(tmp, ltype=self.ltype)
-                    # print("End", np.linalg.det(lat2.matrix))
-                    d_tol1, f_tol1, a_tol1, switch = lat2.get_diff(lat_ref)
-                    # print(d_tol1, f_tol1, a_tol1, switch)
-                except:
-                    d_tol1, f_tol1, a_tol1, switch = 10, 1.0, 90, None
-                tols[count] = [d_tol1, f_tol1, a_tol1]
-                trans.append([tran1, tran2])
-                switchs.append(switch)
-                count += 1
+        trans, tols, switchs = self._get_transformation_diffs(lat_ref)
 
         trans_good = []
         tols_good = []
-        for id in range(len(tols)):
-            if (tols[id, 0] < d_tol or tols[id, 1] < f_tol) and tols[id, 2] < self.a_tol:
-                if switchs[id]:
-                    trans[id].extend([[[1, 0, 0], [0, -1, 0], [0, 0, -1]]])
-                # print(tols[id], len(trans[id]))
-                trans_good.append(trans[id])
-                tols_good.append(tols[id])
+        ids = np.where(((tols[:, 0] < d_tol) | (tols[:, 1] < f_tol)) & (tols[:, 2] < self.a_tol))[0]
+        for id in ids:
+            if switchs[id]:
+                trans[id].extend([[[1, 0, 0], [0, -1, 0], [0, 0, -1]]])
+            trans_good.append(trans[id])
+            tols_good.append(tols[id])
 
         return trans_good, tols_good
 
@@ -318,36 +348,13 @@ class Lattice:
         Returns:
             a two steps of transformation matrix if the match is possible
         """
-        # Find all possible permutation and transformation matrices
-        trans1 = self.get_permutation_matrices()
-        trans2 = self.get_transformation_matrices()
-
-        tols = np.zeros([len(trans2) * len(trans1) + 1, 3])
-        trans = []
-        switchs = []
+        trans, tols, switchs = self._get_transformation_diffs(lat_ref)
 
         # Check it self
         d_tol1, f_tol1, a_tol1, switch = self.get_diff(lat_ref)
-        tols[0] = [d_tol1, f_tol1, a_tol1]
-        switchs.append(switch)
-        trans.append([np.eye(3)])
-
-        count = 0
-        for _i, tran1 in enumerate(trans1):
-            lat0 = self.transform(tran1)
-            for _j, tran2 in enumerate(trans2):
-                count += 1
-                tmp = np.dot(tran2, lat0.matrix)
-                try:
-                    # print(i, j, self.ltype)
-                    lat2 = Lattice.from_matrix(tmp, ltype=self.ltype)
-                    d_tol1, f_tol1, a_tol1, switch = lat2.get_diff(lat_ref)
-                    # print(d_tol1, f_tol1, a_tol1, switch)
-                except:
-                    d_tol1, f_tol1, a_tol1, switch = 10, 1.0, 90, None
-                tols[count] = [d_tol1, f_tol1, a_tol1]
-                trans.append([tran1, tran2])
-                switchs.append(switch)
+        tols = np.vstack([[d_tol1, f_tol1, a_tol1], tols])
+        switchs = [switch, *switchs]
+        trans = [[np.eye(3)], *trans]
 
         # QZ: needs to figure out a better way to select the best
         rms = tols.sum(axis=1)
@@ -765,13 +772,10 @@ class Lattice:
         point = np.random.rand(3)
         if self.ltype in ["spherical", "ellipsoidal"]:
             # Choose a point within an octant of the unit sphere
-            while point.dot(point) > 1:  # squared
-                point = np.random.random(3)
+            if point.dot(point) > 1:  # squared
+                return self.generate_points(1)[0]
             # Randomly flip some coordinates
-            for index in range(len(point)):
-                # Scale the point by the max radius
-                if random.uniform(0, 1) < 0.5:
-                    point[index] *= -1
+            point *= np.where(np.random.rand(3) < 0.5, -1, 1)
         else:
             for i, a in enumerate(self.PBC):
                 if not a:
@@ -781,6 +785,39 @@ class Lattice:
                         point[i] -= 0.5
         return point
 
+    def generate_points(self, N):
+        """
+        Vectorized `generate_point` to generate N random fractional points
+        at once. For the spherical and ellipsoidal lattices, the points are
+        drawn within the unit sphere.
+
+        Args:
+            N: number of points
+
+        Returns:
+            a Nx3 array
+        """
+        # QZ: np.random.RandomState().rand(3) was used because of multiprocess issue
+        # https://github.com/numpy/numpy/issues/9650
+        # now just fix it
+        points = np.random.rand(N, 3)
+        if self.ltype in ["spherical", "ellipsoidal"]:
+            # Choose points within an octant of the unit sphere
+            bad = np.sum(points**2, axis=1) > 1
+            while bad.any():
+                points[bad] = np.random.rand(bad.sum(), 3)
+                bad = np.sum(points**2, axis=1) > 1
+            # Randomly flip some coordinates
+            points *= np.where(np.random.rand(N, 3) < 0.5, -1, 1)
+        else:
+            for i, a in enumerate(self.PBC):
+                if not a:
+                    if self.ltype in ["hexagonal", "trigonal"]:
+                        points[:, i] *= 1.0 / np.sqrt(3.0)
+                    else:
+                        points[:, i] -= 0.5
+        return points
+
     @classmethod
     def from_para(
         self,
@@ -1121,6 +1158,266 @@ class Lattice:
         return Lattice.from_matrix(cell_new)
 
 
+def check_cellpara(para, minvec=1.2, minangle=np.pi / 6, max_ratio=10.0, **kwargs):
+    """
+    Check a single cell parameter against the limits on lengths, angles
+    and ratios, which are defined in `check_cellparas`.
+
+    Args:
+        para: (a, b, c, alpha, beta, gamma) in radians
+        minvec: minimum allowed lattice vector length (among a, b, and c)
+        minangle: minimum allowed lattice angle (among alpha, beta, and gamma)
+        max_ratio: largest allowed ratio of two lattice vector lengths
+        kwargs: a dictionary of optional values ('min_l', 'mid_l', 'max_l')
+
+    Returns:
+        True or False
+    """
+    paras = np.array(para, dtype=float)[None]
+    return bool(check_cellparas(paras, minvec, minangle, max_ratio, **kwargs)[0])
+
+
+def check_cellparas(paras, minvec=1.2, minangle=np.pi / 6, max_ratio=10.0, **kwargs):
+    """
+    Vectorized check of the cell parameters against the limits on lengths,
+    angles and ratios.
+
+    Args:
+        paras: (N, 6) array of (a, b, c, alpha, beta, gamma) in radians
+        minvec: minimum allowed lattice vector length (among a, b, and c)
+        minangle: minimum allowed lattice angle (among alpha, beta, and gamma)
+        max_ratio: largest allowed ratio of two lattice vector lengths
+        kwargs: a dictionary of optional values. These include:
+            'min_l': the smallest allowed cell vector.
+            'mid_l': the second smallest allowed cell vector.
+            'max_l': the third smallest allowed cell vector.
+
+    Returns:
+        a boolean array of length N
+    """
+    maxangle = np.pi - minangle
+    a, b, c, alpha, beta, gamma = paras.T
+    maxvec = a * b * c / (minvec**2)
+
+    # Define limits on cell dimensions
+    min_l = kwargs.get("min_l", minvec)
+    mid_l = kwargs.get("mid_l", min_l)
+    max_l = kwargs.get("max_l", mid_l)
+    ls = np.sort(paras[:, :3], axis=1)
+    mask = (ls[:, 0] >= min_l) & (ls[:, 1] >= mid_l) & (ls[:, 2] >= max_l)
+    mask &= minvec < maxvec
+
+    # Check minimum Euclidean distances
+    smallvec = np.minimum(
+        np.minimum(a * np.cos(np.maximum(beta, gamma)), b * np.cos(np.maximum(alpha, gamma))),
+        c * np.cos(np.maximum(alpha, beta)),
+    )
+    mask &= (ls[:, 0] > minvec) & (ls[:, 2] < maxvec)
+    mask &= smallvec < minvec
+    angles = paras[:, 3:]
+    mask &= (angles.min(axis=1) > minangle) & (angles.max(axis=1) < maxangle)
+    # all pairwise ratios are bounded by the largest/smallest ratio
+    mask &= ls[:, 2] < max_ratio * ls[:, 0]
+    return mask
+
+
+def generate_cellparas(
+    ltype,
+    volume,
+    N=100,
+    minvec=1.2,
+    minangle=np.pi / 6,
+    max_ratio=10.0,
+    **kwargs,
+):
+    """
+    Vectorized sampler to generate N candidate cell parameters
+    (a, b, c, alpha, beta, gamma) at once according to the space group
+    symmetry, and return those meeting the minimum angle and vector
+    requirements.
+
+    Args:
+        ltype: lattice type
+        volume: volume of the conventional unit cell
+        N: number of candidates to draw
+        minvec: minimum allowed lattice vector length (among a, b, and c)
+        minangle: minimum allowed lattice angle (among alpha, beta, and gamma)
+        max_ratio: largest allowed ratio of two lattice vector lengths
+        kwargs: a dictionary of optional values. These include:
+            'min_l': the smallest allowed cell vector.
+            'mid_l': the second smallest allowed cell vector.
+            'max_l': the third smallest allowed cell vector.
+
+    Returns:
+        a (K, 6) array of valid cell parameters (K <= N)
+    """
+    maxangle = np.pi - minangle
+    paras = np.zeros([N, 6])
+    paras[:, 3:] = np.pi / 2
+    if ltype in ["triclinic", "monoclinic", "orthorhombic"]:
+        if ltype == "triclinic":
+            # Derive lattice angles from random matrices
+            paras[:, 3:] = random_shear_paras(N, width=0.2)[:, 3:]
+            x = get_cell_factors(paras[:, 3:])
+        elif ltype == "monoclinic":
+            paras[:, 4] = gaussians(minangle, maxangle, N)
+            x = np.sin(paras[:, 4])
+        else:
+            x = 1
+        vec = random_vectors(N)
+        paras[:, :3] = vec * np.cbrt(volume / x / np.prod(vec, axis=1))[:, None]
+    elif ltype in ["tetragonal", "hexagonal", "trigonal"]:
+        if ltype == "tetragonal":
+            x = 1
+        else:
+            paras[:, 5] = np.pi / 3 * 2
+            x = np.sqrt(3.0) / 2.0
+        vec = random_vectors(N)
+        c = vec[:, 2] / (vec[:, 0] * vec[:, 1]) * np.cbrt(volume / x)
+        paras[:, 0] = paras[:, 1] = np.sqrt((volume / x) / c)
+        paras[:, 2] = c
+    elif ltype in ["cubic"]:
+        paras[:, :3] = np.cbrt(volume)
+
+    return paras[check_cellparas(paras, minvec, minangle, max_ratio, **kwargs)]
+
+
+def _generate_cellparas_lowdim(ltype, volume, thickness, N, minangle, unique_axis):
+    """
+    Shared sampler for the layer and rod groups, in which the 3rd axis is
+    either the non-periodic (2D) or the periodic (1D) axis with the given
+    thickness.
+
+    Args:
+        ltype: lattice type
+        volume: volume of the lattice
+        thickness: (N,) array for the length along the 3rd axis
+        N: number of candidates
+        minangle: minimum allowed lattice angle
+        unique_axis: the unique axis for the monoclinic cells
+
+    Returns:
+        a (N, 6) array of candidate cell parameters
+    """
+    maxangle = np.pi - minangle
+    paras = np.zeros([N, 6])
+    paras[:, 2] = thickness
+    paras[:, 3:] = np.pi / 2
+    if ltype in ["triclinic", "monoclinic"]:
+        if ltype == "triclinic":
+            shear = random_shear_paras(N, width=0.2)
+            ratio = shear[:, 0] / shear[:, 1]
+            paras[:, 3:] = shear[:, 3:]
+            x = get_cell_factors(paras[:, 3:])
+            # scale thickness by outer product of vectors
+            paras[:, 2] /= x
+        else:
+            vec = random_vectors(N)
+            ratio = vec[:, 0] / vec[:, 1]
+            id = {"a": 3, "b": 4, "c": 5}[unique_axis]
+            paras[:, id] = gaussians(minangle, maxangle, N)
+            x = np.sin(paras[:, id])
+        ab = volume / (paras[:, 2] * x)
+        paras[:, 0] = np.sqrt(ab * ratio)
+        paras[:, 1] = np.sqrt(ab / ratio)
+    elif ltype == "orthorhombic":
+        vec = random_vectors(N)
+        ratio = vec[:, 0] / vec[:, 1]
+        paras[:, 1] = np.sqrt(volume / (thickness * ratio))
+        paras[:, 0] = paras[:, 1] * ratio
+    elif ltype == "tetragonal":
+        paras[:, 0] = paras[:, 1] = np.sqrt(volume / thickness)
+    elif ltype in ["hexagonal", "trigonal"]:
+        paras[:, 5] = np.pi / 3 * 2
+        x = np.sqrt(3.0) / 2.0
+        paras[:, 0] = paras[:, 1] = np.sqrt((volume / x) / thickness)
+    return paras
+
+
+def generate_cellparas_2D(
+    ltype,
+    volume,
+    N=100,
+    thickness=None,
+    minvec=1.2,
+    minangle=np.pi / 6,
+    max_ratio=10.0,
+    **kwargs,
+):
+    """
+    Vectorized sampler to generate N candidate cell parameters at once
+    according to the layer group symmetry. The non-periodic axis is c.
+
+    Args:
+        ltype: lattice type
+        volume: volume of the lattice
+        N: number of candidates to draw
+        thickness: 3rd-dimensional thickness of the unit cell. If set to None,
+            a thickness is chosen automatically
+        minvec: minimum allowed lattice vector length (among a, b, and c)
+        minangle: minimum allowed lattice angle (among alpha, beta, and gamma)
+        max_ratio: largest allowed ratio of two lattice vector lengths
+        kwargs: a dictionary of optional values. These include:
+            'unique_axis': the axis ('a', 'b', or 'c') which is unique.
+            'min_l': the smallest allowed cell vector.
+            'mid_l': the second smallest allowed cell vector.
+            'max_l': the third smallest allowed cell vector.
+
+    Returns:
+        a (K, 6) array of valid cell parameters (K <= N)
+    """
+    unique_axis = kwargs.get("unique_axis", "c")
+    if thickness is None:
+        v = random_vectors(N)
+        thickness = np.cbrt(volume) * (v[:, 0] / np.prod(v, axis=1))
+    else:
+        thickness = max([3.0, thickness]) * np.ones(N)
+    paras = _generate_cellparas_lowdim(ltype, volume, thickness, N, minangle, unique_axis)
+    return paras[check_cellparas(paras, minvec, minangle, max_ratio, **kwargs)]
+
+
+def generate_cellparas_1D(
+    ltype,
+    volume,
+    N=100,
+    area=None,
+    minvec=1.2,
+    minangle=np.pi / 6,
+    max_ratio=10.0,
+    **kwargs,
+):
+    """
+    Vectorized sampler to generate N candidate cell parameters at once
+    according to the rod group symmetry. The periodic axis is c.
+
+    Args:
+        ltype: lattice type
+        volume: volume of the lattice
+        N: number of candidates to draw
+        area: cross-sectional area of the unit cell in Angstroms squared. If
+            set to None, a value is chosen automatically
+        minvec: minimum allowed lattice vector length (among a, b, and c)
+        minangle: minimum allowed lattice angle (among alpha, beta, and gamma)
+        max_ratio: largest allowed ratio of two lattice vector lengths
+        kwargs: a dictionary of optional values. These include:
+            'unique_axis': the axis ('a', 'b', or 'c') which is unique.
+            'min_l': the smallest allowed cell vector.
+            'mid_l': the second smallest allowed cell vector.
+            'max_l': the third smallest allowed cell vector.
+
+    Returns:
+        a (K, 6) array of valid cell parameters (K <= N)
+    """
+    unique_axis = kwargs.get("unique_axis", "a")
+    if area is None:
+        v = random_vectors(N)
+        thickness = np.cbrt(volume) * (v[:, 0] / np.prod(v, axis=1))
+    else:
+        thickness = volume / area * np.ones(N)
+    paras = _generate_cellparas_lowdim(ltype, volume, thickness, N, minangle, unique_axis)
+    return paras[check_cellparas(paras, minvec, minangle, max_ratio, **kwargs)]
+
+
 def generate_cellpara(
     ltype,
     volume,
@@ -1135,7 +1432,8 @@ def generate_cellpara(
     to the space group symmetry and number of atoms. If the spacegroup
     has centering, we will transform to conventional cell setting. If the
     generated lattice does not meet the minimum angle and vector
-    requirements, we try to generate a new one, up to maxattempts times.
+    requirements, the remaining maxattempts-1 cells are drawn at once
+    by `generate_cellparas`.
 
     Args:
         volume: volume of the conventional unit cell
@@ -1153,14 +1451,39 @@ def generate_cellpara(
         a 6-length array representing the lattice of the unit cell. If
         generation fails, outputs a warning message and returns empty
     """
+    para = _generate_cellpara(ltype, volume, minangle)
+    if check_cellpara(para, minvec, minangle, max_ratio, **kwargs):
+        return np.array(para)
+
+    # draw the remaining attempts at once
+    paras = generate_cellparas(ltype, volume, maxattempts - 1, minvec, minangle, max_ratio, **kwargs)
+    if len(paras) > 0:
+        return paras[0]
+
+    # If maxattempts tries have been made without success
+    msg = f"lattice fails after {maxattempts:d} cycles"
+    msg += f"for volume {volume:.2f}"
+    raise VolumeError(msg)
+
+
+def _generate_cellpara(ltype, volume, minangle):
+    """
+    Scalar version of `generate_cellparas` to draw one candidate
+
+    Args:
+        ltype: lattice type
+        volume: volume of the conventional unit cell
+        minangle: minimum allowed lattice angle
+
+    Returns:
+        a list of (a, b, c, alpha, beta, gamma)
+    """
     maxangle = np.pi - minangle
-    for _n in range(maxattempts):
-        # Triclinic
-        # if sg <= 2:
+    alpha, beta, gamma = np.pi / 2, np.pi / 2, np.pi / 2
+    if ltype in ["triclinic", "monoclinic", "orthorhombic"]:
         if ltype == "triclinic":
-            # Derive lattice constants from a random matrix
-            mat = random_shear_matrix(width=0.2)
-            a, b, c, alpha, beta, gamma = matrix2para(mat)
+            # Derive lattice angles from a random matrix
+            _, _, _, alpha, beta, gamma = matrix2para(random_shear_matrix(width=0.2))
             x = np.sqrt(
                 1
                 - np.cos(alpha) ** 2
@@ -1168,106 +1491,78 @@ def generate_cellpara(
                 - np.cos(gamma) ** 2
                 + 2 * (np.cos(alpha) * np.cos(beta) * np.cos(gamma))
             )
-            vec = random_vector()
-            abc = volume / x
-            xyz = vec[0] * vec[1] * vec[2]
-            a = vec[0] * np.cbrt(abc) / np.cbrt(xyz)
-            b = vec[1] * np.cbrt(abc) / np.cbrt(xyz)
-            c = vec[2] * np.cbrt(abc) / np.cbrt(xyz)
-        # Monoclinic
-        elif ltype in ["monoclinic"]:
-            alpha, gamma = np.pi / 2, np.pi / 2
+        elif ltype == "monoclinic":
             beta = gaussian(minangle, maxangle)
             x = np.sin(beta)
-            vec = random_vector()
-            xyz = vec[0] * vec[1] * vec[2]
-            abc = volume / x
-            a = vec[0] * np.cbrt(abc) / np.cbrt(xyz)
-            b = vec[1] * np.cbrt(abc) / np.cbrt(xyz)
-            c = vec[2] * np.cbrt(abc) / np.cbrt(xyz)
-        # Orthorhombic
-        # elif sg <= 74:
-        elif ltype in ["orthorhombic"]:
-            alpha, beta, gamma = np.pi / 2, np.pi / 2, np.pi / 2
+        else:
             x = 1
-            vec = random_vector()
-            xyz = vec[0] * vec[1] * vec[2]
-            abc = volume / x
-            a = vec[0] * np.cbrt(abc) / np.cbrt(xyz)
-            b = vec[1] * np.cbrt(abc) / np.cbrt(xyz)
-            c = vec[2] * np.cbrt(abc) / np.cbrt(xyz)
-        # Tetragonal
-        # elif sg <= 142:
-        elif ltype in ["tetragonal"]:
-            alpha, beta, gamma = np.pi / 2, np.pi / 2, np.pi / 2
+        vec = random_vector()
+        a, b, c = vec * np.cbrt(volume / x / (vec[0] * vec[1] * vec[2]))
+    elif ltype in ["tetragonal", "hexagonal", "trigonal"]:
+        if ltype == "tetragonal":
             x = 1
-            vec = random_vector()
-            c = vec[2] / (vec[0] * vec[1]) * np.cbrt(volume / x)
-            a = b = np.sqrt((volume / x) / c)
-        # Trigonal/Rhombohedral/Hexagonal
-        # elif sg <= 194:
-        elif ltype in ["hexagonal", "trigonal"]:
-            alpha, beta, gamma = np.pi / 2, np.pi / 2, np.pi / 3 * 2
+        else:
+            gamma = np.pi / 3 * 2
             x = np.sqrt(3.0) / 2.0
-            vec = random_vector()
-            c = vec[2] / (vec[0] * vec[1]) * np.cbrt(volume / x)
-            a = b = np.sqrt((volume / x) / c)
-        # Cubic
-        # else:
-        elif ltype in ["cubic"]:
-            alpha, beta, gamma = np.pi / 2, np.pi / 2, np.pi / 2
-            s = (volume) ** (1.0 / 3.0)
-            a, b, c = s, s, s
-        # Check that lattice meets requirements
-        maxvec = (a * b * c) / (minvec**2)
-
-        # Define limits on cell dimensions
-        min_l = kwargs.get("min_l", minvec)
-        mid_l = kwargs.get("mid_l", min_l)
-        max_l = kwargs.get("max_l", mid_l)
-        l_min = min(a, b, c)
-        l_max = max(a, b, c)
-        for x in (a, b, c):
-            if x <= l_max and x >= l_min:
-                l_mid = x
-        if not (l_min >= min_l and l_mid >= mid_l and l_max >= max_l):
-            continue
-
-        if minvec < maxvec:
-            # Check minimum Euclidean distances
-            smallvec = min(
-                a * np.cos(max(beta, gamma)),
-                b * np.cos(max(alpha, gamma)),
-                c * np.cos(max(alpha, beta)),
-            )
-            if (
-                a > minvec
-                and b > minvec
-                and c > minvec
-                and a < maxvec
-                and b < maxvec
-                and c < maxvec
-                and smallvec < minvec
-                and alpha > minangle
-                and beta > minangle
-                and gamma > minangle
-                and alpha < maxangle
-                and beta < maxangle
-                and gamma < maxangle
-                and a / b < max_ratio
-                and a / c < max_ratio
-                and b / c < max_ratio
-                and b / a < max_ratio
-                and c / a < max_ratio
-                and c / b < max_ratio
-            ):
-                return np.array([a, b, c, alpha, beta, gamma])
+        vec = random_vector()
+        c = vec[2] / (vec[0] * vec[1]) * np.cbrt(volume / x)
+        a = b = np.sqrt((volume / x) / c)
+    elif ltype in ["cubic"]:
+        a = b = c = np.cbrt(volume)
+    return [a, b, c, alpha, beta, gamma]
 
-    # If maxattempts tries have been made without success
-    msg = f"lattice fails after {maxattempts:d} cycles"
-    msg += f"for volume {volume:.2f}"
-    raise VolumeError(msg)
-    # return
+
+def _generate_cellpara_lowdim(ltype, volume, thickness, minangle, unique_axis):
+    """
+    Scalar version of `_generate_cellparas_lowdim` to draw one candidate
+    for the layer and rod groups.
+
+    Args:
+        ltype: lattice type
+        volume: volume of the lattice
+        thickness: the length along the 3rd axis
+        minangle: minimum allowed lattice angle
+        unique_axis: the unique axis for the monoclinic cells
+
+    Returns:
+        a list of (a, b, c, alpha, beta, gamma)
+    """
+    maxangle = np.pi - minangle
+    para = [1.0, 1.0, thickness, np.pi / 2, np.pi / 2, np.pi / 2]
+    if ltype in ["triclinic", "monoclinic"]:
+        if ltype == "triclinic":
+            a, b, _, alpha, beta, gamma = matrix2para(random_shear_matrix(width=0.2))
+            para[3:] = [alpha, beta, gamma]
+            x = np.sqrt(
+                1
+                - np.cos(alpha) ** 2
+                - np.cos(beta) ** 2
+                - np.cos(gamma) ** 2
+                + 2 * (np.cos(alpha) * np.cos(beta) * np.cos(gamma))
+            )
+            # scale thickness by outer product of vectors
+            para[2] /= x
+        else:
+            a, b, _ = random_vector()
+            id = {"a": 3, "b": 4, "c": 5}[unique_axis]
+            para[id] = gaussian(minangle, maxangle)
+            x = np.sin(para[id])
+        ab = volume / (para[2] * x)
+        ratio = a / b
+        para[0] = np.sqrt(ab * ratio)
+        para[1] = np.sqrt(ab / ratio)
+    elif ltype == "orthorhombic":
+        vec = random_vector()
+        ratio = vec[0] / vec[1]
+        para[1] = np.sqrt(volume / (thickness * ratio))
+        para[0] = para[1] * ratio
+    elif ltype == "tetragonal":
+        para[0] = para[1] = np.sqrt(volume / thickness)
+    elif ltype in ["hexagonal", "trigonal"]:
+        para[5] = np.pi / 3 * 2
+        x = np.sqrt(3.0) / 2.0
+        para[0] = para[1] = np.sqrt((volume / x) / thickness)
+    return para
 
 
 def generate_cellpara_2D(
@@ -1285,7 +1580,8 @@ def generate_cellpara_2D(
     to the layer group symmetry and number of atoms. If the layer group
     has centering, we will transform to conventional cell setting. If the
     generated lattice does not meet the minimum angle and vector
-    requirements, we try to generate a new one, up to maxattempts times.
+    requirements, the remaining maxattempts-1 cells are drawn at once
+    by `generate_cellparas_2D`.
 
     Note: The monoclinic layer groups have different unique axes. Groups 3-7
         have unique axis c, while 8-18 have unique axis a. We use non-periodic
@@ -1311,159 +1607,19 @@ def generate_cellpara_2D(
         generation fails, outputs a warning message and returns empty
     """
     unique_axis = kwargs.get("unique_axis", "c")
-    # Store the non-periodic axis
-    NPA = 3
-    # Set the unique axis for monoclinic cells
-    # if num in range(3, 8): unique_axis = "c"
-    # elif num in range(8, 19): unique_axis = "a"
-    maxangle = np.pi - minangle
-    for _n in range(maxattempts):
-        abc = np.ones([3])
-        if thickness is None:
-            v = random_vector()
-            thickness1 = np.cbrt(volume) * (v[0] / (v[0] * v[1] * v[2]))
-        else:
-            thickness1 = max([3.0, thickness])
-        abc[NPA - 1] = thickness1
-        alpha, beta, gamma = np.pi / 2, np.pi / 2, np.pi / 2
-        # Triclinic
-        # if num <= 2:
-        if ltype == "triclinic":
-            mat = random_shear_matrix(width=0.2)
-            a, b, c, alpha, beta, gamma = matrix2para(mat)
-            x = np.sqrt(
-                1
-                - np.cos(alpha) ** 2
-                - np.cos(beta) ** 2
-                - np.cos(gamma) ** 2
-                + 2 * (np.cos(alpha) * np.cos(beta) * np.cos(gamma))
-            )
-            abc[NPA - 1] = abc[NPA - 1] / x  # scale thickness by outer product of vectors
-            ab = volume / (abc[NPA - 1] * x)
-            ratio = a / b
-            if NPA == 3:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[1] = np.sqrt(ab / ratio)
-            elif NPA == 2:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-            elif NPA == 1:
-                abc[1] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-
-        # Monoclinic
-        # elif num <= 18:
-        elif ltype == "monoclinic":
-            a, b, c = random_vector()
-            if unique_axis == "a":
-                alpha = gaussian(minangle, maxangle)
-                x = np.sin(alpha)
-            elif unique_axis == "b":
-                beta = gaussian(minangle, maxangle)
-                x = np.sin(beta)
-            elif unique_axis == "c":
-                gamma = gaussian(minangle, maxangle)
-                x = np.sin(gamma)
-            ab = volume / (abc[NPA - 1] * x)
-            ratio = a / b
-            if NPA == 3:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[1] = np.sqrt(ab / ratio)
-            elif NPA == 2:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-            elif NPA == 1:
-                abc[1] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-
-        # Orthorhombic
-        # elif num <= 48:
-        elif ltype == "orthorhombic":
-            vec = random_vector()
-            if NPA == 3:
-                ratio = abs(vec[0] / vec[1])  # ratio a/b
-                abc[1] = np.sqrt(volume / (thickness1 * ratio))
-                abc[0] = abc[1] * ratio
-            elif NPA == 2:
-                ratio = abs(vec[0] / vec[2])  # ratio a/b
-                abc[2] = np.sqrt(volume / (thickness1 * ratio))
-                abc[0] = abc[2] * ratio
-            elif NPA == 1:
-                ratio = abs(vec[1] / vec[2])  # ratio a/b
-                abc[2] = np.sqrt(volume / (thickness1 * ratio))
-                abc[1] = abc[2] * ratio
-
-        # Tetragonal
-        # elif num <= 64:
-        elif ltype == "tetragonal":
-            if NPA == 3:
-                abc[0] = abc[1] = np.sqrt(volume / thickness1)
-            elif NPA == 2:
-                abc[0] = abc[1]
-                abc[2] = volume / (abc[NPA - 1] ** 2)
-            elif NPA == 1:
-                abc[1] = abc[0]
-                abc[2] = volume / (abc[NPA - 1] ** 2)
-
-        # Trigonal/Hexagonal
-        # elif num <= 80:
-        elif ltype in ["hexagonal", "trigonal"]:
-            gamma = np.pi / 3 * 2
-            x = np.sqrt(3.0) / 2.0
-            if NPA == 3:
-                abc[0] = abc[1] = np.sqrt((volume / x) / abc[NPA - 1])
-            elif NPA == 2:
-                abc[0] = abc[1]
-                abc[2] = (volume / x)(thickness1**2)
-            elif NPA == 1:
-                abc[1] = abc[0]
-                abc[2] = (volume / x) / (thickness1**2)
-
-        para = np.array([abc[0], abc[1], abc[2], alpha, beta, gamma])
-
-        a, b, c = abc[0], abc[1], abc[2]
-        maxvec = (a * b * c) / (minvec**2)
-
-        # Define limits on cell dimensions
-        min_l = kwargs.get("min_l", minvec)
-        mid_l = kwargs.get("mid_l", min_l)
-        max_l = kwargs.get("max_l", mid_l)
-        l_min = min(a, b, c)
-        l_max = max(a, b, c)
-        for x in (a, b, c):
-            if x <= l_max and x >= l_min:
-                l_mid = x
-        if not (l_min >= min_l and l_mid >= mid_l and l_max >= max_l):
-            continue
-
-        if minvec < maxvec:
-            smallvec = min(
-                a * np.cos(max(beta, gamma)),
-                b * np.cos(max(alpha, gamma)),
-                c * np.cos(max(alpha, beta)),
-            )
-            if (
-                a > minvec
-                and b > minvec
-                and c > minvec
-                and a < maxvec
-                and b < maxvec
-                and c < maxvec
-                and smallvec < minvec
-                and alpha > minangle
-                and beta > minangle
-                and gamma > minangle
-                and alpha < maxangle
-                and beta < maxangle
-                and gamma < maxangle
-                and a / b < max_ratio
-                and a / c < max_ratio
-                and b / c < max_ratio
-                and b / a < max_ratio
-                and c / a < max_ratio
-                and c / b < max_ratio
-            ):
-                return para
+    if thickness is None:
+        v = random_vector()
+        thickness1 = np.cbrt(volume) * (v[0] / (v[0] * v[1] * v[2]))
+    else:
+        thickness1 = max([3.0, thickness])
+    para = _generate_cellpara_lowdim(ltype, volume, thickness1, minangle, unique_axis)
+    if check_cellpara(para, minvec, minangle, max_ratio, **kwargs):
+        return np.array(para)
+
+    # draw the remaining attempts at once
+    paras = generate_cellparas_2D(ltype, volume, maxattempts - 1, thickness, minvec, minangle, max_ratio, **kwargs)
+    if len(paras) > 0:
+        return paras[0]
 
     # If maxattempts tries have been made without success
     msg = f"Cannot get lattice after {maxattempts:d} cycles for volume {volume:.2f}"
@@ -1484,8 +1640,8 @@ def generate_cellpara_1D(
     Generates a cell parameter (a, b, c, alpha, beta, gamma) according to
     the rod group symmetry and number of atoms. If the rod group has centering,
     we will transform to conventional cell setting. If the generated lattice
-    does not meet the minimum angle and vector requirements, we try to
-    generate a new one, up to maxattempts times.
+    does not meet the minimum angle and vector requirements, the remaining
+    maxattempts-1 cells are drawn at once by `generate_cellparas_1D`.
 
     Note: The monoclinic Rod groups have different unique axes. Groups 3-7
         have unique axis a, while 8-12 have unique axis c. We use periodic
@@ -1510,163 +1666,20 @@ def generate_cellpara_1D(
         a 6-length array representing the lattice of the unit cell. If
         generation fails, outputs a warning message and returns empty
     """
-    try:
-        unique_axis = kwargs["unique_axis"]
-    except:
-        unique_axis = "a"
-    # Store the periodic axis
-    PA = 3
-    # Set the unique axis for monoclinic cells
-    # if num in range(3, 8): unique_axis = "a"
-    # elif num in range(8, 13): unique_axis = "c"
-    maxangle = np.pi - minangle
-    for _n in range(maxattempts):
-        abc = np.ones([3])
-        if area is None:
-            v = random_vector()
-            thickness1 = np.cbrt(volume) * (v[0] / (v[0] * v[1] * v[2]))
-        else:
-            thickness1 = volume / area
-        abc[PA - 1] = thickness1
-        alpha, beta, gamma = np.pi / 2, np.pi / 2, np.pi / 2
-        # Triclinic
-        # if num <= 2:
-        if ltype == "triclinic":
-            mat = random_shear_matrix(width=0.2)
-            a, b, c, alpha, beta, gamma = matrix2para(mat)
-            x = np.sqrt(
-                1
-                - np.cos(alpha) ** 2
-                - np.cos(beta) ** 2
-                - np.cos(gamma) ** 2
-                + 2 * (np.cos(alpha) * np.cos(beta) * np.cos(gamma))
-            )
-            abc[PA - 1] = abc[PA - 1] / x  # scale thickness by outer product of vectors
-            ab = volume / (abc[PA - 1] * x)
-            ratio = a / b
-            if PA == 3:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[1] = np.sqrt(ab / ratio)
-            elif PA == 2:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-            elif PA == 1:
-                abc[1] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-
-        # Monoclinic
-        # elif num <= 12:
-        elif ltype == "monoclinic":
-            a, b, c = random_vector()
-            if unique_axis == "a":
-                gaussian(minangle, maxangle)
-                x = np.sin(alpha)
-            elif unique_axis == "b":
-                beta = gaussian(minangle, maxangle)
-                x = np.sin(beta)
-            elif unique_axis == "c":
-                gamma = gaussian(minangle, maxangle)
-                x = np.sin(gamma)
-            ab = volume / (abc[PA - 1] * x)
-            ratio = a / b
-            if PA == 3:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[1] = np.sqrt(ab / ratio)
-            elif PA == 2:
-                abc[0] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-            elif PA == 1:
-                abc[1] = np.sqrt(ab * ratio)
-                abc[2] = np.sqrt(ab / ratio)
-
-        # Orthorhombic
-        # lif num <= 22:
-        elif ltype == "orthorhombic":
-            vec = random_vector()
-            if PA == 3:
-                ratio = abs(vec[0] / vec[1])  # ratio a/b
-                abc[1] = np.sqrt(volume / (thickness1 * ratio))
-                abc[0] = abc[1] * ratio
-            elif PA == 2:
-                ratio = abs(vec[0] / vec[2])  # ratio a/b
-                abc[2] = np.sqrt(volume / (thickness1 * ratio))
-                abc[0] = abc[2] * ratio
-            elif PA == 1:
-                ratio = abs(vec[1] / vec[2])  # ratio a/b
-                abc[2] = np.sqrt(volume / (thickness1 * ratio))
-                abc[1] = abc[2] * ratio
-
-        # Tetragonal
-        # elif num <= 41:
-        elif ltype == "tetragonal":
-            if PA == 3:
-                abc[0] = abc[1] = np.sqrt(volume / thickness1)
-            elif PA == 2:
-                abc[0] = abc[1]
-                abc[2] = volume / (abc[PA - 1] ** 2)
-            elif PA == 1:
-                abc[1] = abc[0]
-                abc[2] = volume / (abc[PA - 1] ** 2)
-
-        # Trigonal/Rhombohedral/Hexagonal
-        # elif num <= 75:
-        elif ltype in ["hexagonal", "trigonal"]:
-            gamma = np.pi / 3 * 2
-            x = np.sqrt(3.0) / 2.0
-            if PA == 3:
-                abc[0] = abc[1] = np.sqrt((volume / x) / abc[PA - 1])
-            elif PA == 2:
-                abc[0] = abc[1]
-                abc[2] = (volume / x)(thickness1**2)
-            elif PA == 1:
-                abc[1] = abc[0]
-                abc[2] = (volume / x) / (thickness1**2)
-
-        para = np.array([abc[0], abc[1], abc[2], alpha, beta, gamma])
-
-        a, b, c = abc[0], abc[1], abc[2]
-        maxvec = (a * b * c) / (minvec**2)
-
-        # Define limits on cell dimensions
-        min_l = kwargs.get("min_l", minvec)
-        mid_l = kwargs.get("mid_l", min_l)
-        max_l = kwargs.get("max_l", mid_l)
-        l_min = min(a, b, c)
-        l_max = max(a, b, c)
-        for x in (a, b, c):
-            if x <= l_max and x >= l_min:
-                l_mid = x
-        if not (l_min >= min_l and l_mid >= mid_l and l_max >= max_l):
-            continue
-
-        if minvec < maxvec:
-            smallvec = min(
-                a * np.cos(max(beta, gamma)),
-                b * np.cos(max(alpha, gamma)),
-                c * np.cos(max(alpha, beta)),
-            )
-            if (
-                a > minvec
-                and b > minvec
-                and c > minvec
-                and a < maxvec
-                and b < maxvec
-                and c < maxvec
-                and smallvec < minvec
-                and alpha > minangle
-                and beta > minangle
-                and gamma > minangle
-                and alpha < maxangle
-                and beta < maxangle
-                and gamma < maxangle
-                and a / b < max_ratio
-                and a / c < max_ratio
-                and b / c < max_ratio
-                and b / a < max_ratio
-                and c / a < max_ratio
-                and c / b < max_ratio
-            ):
-                return para
+    unique_axis = kwargs.get("unique_axis", "a")
+    if area is None:
+        v = random_vector()
+        thickness1 = np.cbrt(volume) * (v[0] / (v[0] * v[1] * v[2]))
+    else:
+        thickness1 = volume / area
+    para = _generate_cellpara_lowdim(ltype, volume, thickness1, minangle, unique_axis)
+    if check_cellpara(para, minvec, minangle, max_ratio, **kwargs):
+        return np.array(para)
+
+    # draw the remaining attempts at once
+    paras = generate_cellparas_1D(ltype, volume, maxattempts - 1, area, minvec, minangle, max_ratio, **kwargs)
+    if len(paras) > 0:
+        return paras[0]
 
     # If maxattempts tries have been made without success
     msg = f"Could not get lattice after {maxattempts:d} cycles for volume {volume:.2f}"
@@ -1720,6 +1733,68 @@ def generate_cellpara_0D(ltype, volume, area=None, minvec=1.2, max_ratio=10.0, m
     raise VolumeError(msg)
 
 
+def get_cell_paras(matrices):
+    """
+    Vectorized `matrix2para` for a stack of cell matrices
+
+    Args:
+        matrices: (N, 3, 3) array
+
+    Returns:
+        (N, 6) array of a, b, c, alpha, beta, gamma (in radians)
+    """
+    norms = np.linalg.norm(matrices, axis=2)
+    paras = np.zeros([len(matrices), 6])
+    paras[:, :3] = norms
+    for col, (i, j) in zip([3, 4, 5], [(1, 2), (0, 2), (0, 1)]):
+        dot = np.einsum("ij,ij->i", matrices[:, i], matrices[:, j])
+        dot /= norms[:, i] * norms[:, j]
+        # the same as operations.angle
+        ang = np.arccos(np.clip(dot, -1, 1))
+        ang[np.abs(dot - 1) < 1e-3] = 0
+        ang[np.abs(dot + 1) < 1e-3] = np.pi
+        paras[:, col] = ang
+    return paras
+
+
+def symmetrize_cell_paras(paras, ltype):
+    """
+    Vectorized symmetrization of cell parameters as in `Lattice.from_matrix`
+
+    Args:
+        paras: (N, 6) array of cell parameters in radians
+        ltype: lattice type
+
+    Returns:
+        paras: the symmetrized parameters
+        valid: (N,) bool array, False if `para2matrix` fails
+    """
+    paras = paras.copy()
+    ltype = ltype.lower()
+    if ltype == "cubic":
+        paras[:, :3] = paras[:, :3].mean(axis=1)[:, None]
+        paras[:, 3:] = np.pi / 2
+    elif ltype in ["hexagonal", "trigonal"]:
+        paras[:, :2] = paras[:, :2].mean(axis=1)[:, None]
+        paras[:, 3:5] = np.pi / 2
+        paras[:, 5] = np.pi * 2 / 3
+    elif ltype == "tetragonal":
+        paras[:, :2] = paras[:, :2].mean(axis=1)[:, None]
+        paras[:, 3:] = np.pi / 2
+    elif ltype == "orthorhombic":
+        paras[:, 3:] = np.pi / 2
+    elif ltype == "monoclinic":
+        paras[:, [3, 5]] = np.pi / 2
+
+    # the condition to get an upper triangular matrix
+    a, cos = paras[:, 0], np.cos(paras[:, 3:])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a3 = a * cos[:, 1]
+        a2 = a * (cos[:, 2] - cos[:, 1] * cos[:, 0]) / np.sin(paras[:, 3])
+        valid = a**2 - a3**2 - a2**2 > 0
+    return paras, valid
+
+
 def matrix2para(matrix, radians=True):
     """
     Given a 3x3 matrix representing a unit cell, outputs a list of lattice
@@ -1917,3 +1992,88 @@ def random_shear_matrix(width=1.0, unitary=False):
         return mat / np.cbrt(np.linalg.det(mat))
     else:
         return mat
+
+
+def gaussians(min, max, N, sigma=3.0):
+    """
+    Vectorized version of `gaussian` to draw N random numbers from a
+    Gaussian distribution centered between min and max.
+
+    Args:
+        min: the minimum acceptable value
+        max: the maximum acceptable value
+        N: the number of values
+        sigma: the number of standard deviations between the center and min/max
+
+    Returns:
+        an array of N values between min and max
+    """
+    center = (max + min) * 0.5
+    ratio = np.fabs(max - min) * 0.5 / sigma
+    x = np.random.normal(scale=ratio, loc=center, size=N)
+    bad = (x <= min) | (x >= max)
+    while bad.any():
+        x[bad] = np.random.normal(scale=ratio, loc=center, size=bad.sum())
+        bad = (x <= min) | (x >= max)
+    return x
+
+
+def random_vectors(N, width=0.35):
+    """
+    Vectorized version of `random_vector` to generate N vectors at once.
+
+    Args:
+        N: the number of vectors
+        width: the width of the normal distribution
+
+    Returns:
+        a Nx3 numpy array of floats
+    """
+    return np.exp(np.random.normal(scale=width, size=[N, 3]))
+
+
+def random_shear_paras(N, width=1.0):
+    """
+    Generate the cell parameters from N random symmetric shear matrices,
+    i.e., the vectorized `matrix2para(random_shear_matrix(width))`.
+
+    Args:
+        N: the number of matrices
+        width: the width of the normal distribution
+
+    Returns:
+        a Nx6 array of (a, b, c, alpha, beta, gamma) in radians
+    """
+    a, b, c = np.random.normal(scale=width, size=[3, N])
+    ones = np.ones(N)
+    mats = np.stack(
+        [
+            np.stack([ones, a, b], axis=-1),
+            np.stack([a, ones, c], axis=-1),
+            np.stack([b, c, ones], axis=-1),
+        ],
+        axis=1,
+    )
+    paras = np.zeros([N, 6])
+    paras[:, :3] = np.linalg.norm(mats, axis=2)
+    for id, (i, j) in zip([3, 4, 5], [(1, 2), (0, 2), (0, 1)]):
+        cos = np.sum(mats[:, i] * mats[:, j], axis=1) / (paras[:, i] * paras[:, j])
+        paras[:, id] = np.arccos(np.clip(cos, -1, 1))
+    return paras
+
+
+def get_cell_factors(angles):
+    """
+    Compute the volume factor V/(abc) from the cell angles. The invalid
+    combination of angles gives NaN.
+
+    Args:
+        angles: Nx3 array of (alpha, beta, gamma) in radians
+
+    Returns:
+        an array of N factors
+    """
+    cos = np.cos(angles)
+    x = 1 - np.sum(cos**2, axis=1) + 2 * np.prod(cos, axis=1)
+    with np.errstate(invalid="ignore"):
+        return np.sqrt(x)
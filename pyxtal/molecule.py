@@ -2,6 +2,7 @@
 Module for handling molecules.
 """
 
+import hashlib
 import os
 import re
 from copy import deepcopy
@@ -10,7 +11,7 @@ from random import choice
 
 import networkx as nx
 import numpy as np
-from monty.serialization import loadfn
+from monty.serialization import dumpfn, loadfn
 from pkg_resources import resource_filename
 
 # External Libraries
@@ -202,6 +203,187 @@ def generate_molecules(smile, wps=None, N_iter=5, N_conf=10, tol=0.5):
     return mols
 
 
+class PointGroupCache:
+    """
+    Memoize the point group analysis and the valid orientations in Wyckoff
+    positions for molecules with the same geometry. Each molecule is keyed by
+    a digest of its species and the rounded coordinates in the principal
+    inertia frame, so that the same molecule in different orientations (e.g.,
+    loaded from many CIF files) shares one entry. The cached operations and
+    orientations are stored in the inertia frame and rotated back on lookup.
+
+    Args:
+        filename: an optional json file to preload the cache
+        decimals: number of decimals to round the coordinates
+    """
+
+    def __init__(self, filename=None, decimals=2):
+        self.decimals = decimals
+        self.active = True
+        self.data = {}
+        self.hits = 0
+        self.misses = 0
+        if filename is not None and os.path.exists(filename):
+            self.load(filename)
+
+    def __str__(self):
+        s = f"PointGroupCache: {len(self.data):d} molecules"
+        s += f" ({self.hits:d} hits, {self.misses:d} misses)"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        return len(self.data)
+
+    def get_key(self, mol, rtol):
+        """
+        Compute the geometry key and the inertia frame of a pymatgen molecule
+
+        Args:
+            mol: pymatgen Molecule object
+            rtol: tolerance used in the point group analysis
+
+        Returns:
+            key: a hex digest string
+            P: 3x3 proper rotation, the columns are the principal axes
+        """
+        xyz = mol.cart_coords - mol.center_of_mass
+        weights = np.array([site.specie.atomic_mass for site in mol])
+        P = np.linalg.eigh(get_inertia_tensor(xyz.copy(), weights))[1]
+        # fix the sign of each axis by the skewness of the mass distribution
+        y = xyz.dot(P)
+        skew = np.sum(weights[:, None] * y**3, axis=0)
+        P[:, skew < 0] *= -1
+        if np.linalg.det(P) < 0:
+            P[:, 2] *= -1
+
+        # sort the atoms so that the axis flips by symmetry give the same key
+        y = np.round(xyz.dot(P), self.decimals) + 0.0
+        numbers = np.array(mol.atomic_numbers, dtype=float)
+        y = np.column_stack([numbers, y])
+        y = y[np.lexsort(y.T[::-1])]
+        digest = hashlib.sha1(f"{rtol:.4f}".encode())
+        digest.update(y.tobytes())
+        return digest.hexdigest(), P
+
+    def get_symmetry(self, key, P):
+        """
+        Look up the point group of a molecule
+
+        Args:
+            key: the geometry key
+            P: the inertia frame of the molecule
+
+        Returns:
+            symbol and list of SymmOp objects, or None if not found
+        """
+        if not self.active or key not in self.data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry = self.data[key]
+        ops = []
+        for rot0 in entry["ops"]:
+            rot = P.dot(np.array(rot0)).dot(P.T)
+            ops.append(SymmOp.from_rotation_and_translation(rot, [0, 0, 0]))
+        return entry["symbol"], ops
+
+    def set_symmetry(self, key, P, symbol, ops):
+        """
+        Store the point group of a molecule
+
+        Args:
+            key: the geometry key
+            P: the inertia frame of the molecule
+            symbol: the point group symbol
+            ops: list of SymmOp objects
+        """
+        if self.active:
+            rots = [P.T.dot(op.rotation_matrix).dot(P).tolist() for op in ops]
+            self.data[key] = {"symbol": symbol, "ops": rots, "orientations": {}}
+
+    @staticmethod
+    def get_wp_key(wp, rtol):
+        return f"{wp.dim:d}-{wp.number:d}-{wp.hall_number}-{wp.index:d}-{rtol:.4f}"
+
+    def get_orientations(self, key, P, wp, rtol):
+        """
+        Look up the valid orientations of a molecule in a Wyckoff position
+
+        Args:
+            key: the geometry key
+            P: the inertia frame of the molecule
+            wp: pyxtal.symmetry.Wyckoff_position object
+            rtol: tolerance used in the orientation search
+
+        Returns:
+            a list of Orientation objects, or None if not found
+        """
+        if not self.active or key not in self.data:
+            return None
+        oris = self.data[key]["orientations"].get(self.get_wp_key(wp, rtol))
+        if oris is None:
+            return None
+        allowed = []
+        for matrix0, degrees, axis0 in oris:
+            matrix = np.array(matrix0).dot(P.T)
+            axis = np.array(axis0) if axis0 is not None else None
+            allowed.append(Orientation(matrix, degrees, axis))
+        return allowed
+
+    def set_orientations(self, key, P, wp, rtol, allowed):
+        """
+        Store the valid orientations of a molecule in a Wyckoff position
+
+        Args:
+            key: the geometry key
+            P: the inertia frame of the molecule
+            wp: pyxtal.symmetry.Wyckoff_position object
+            rtol: tolerance used in the orientation search
+            allowed: a list of Orientation objects
+        """
+        if self.active and key in self.data:
+            oris = []
+            for o in allowed:
+                axis = None if o.axis is None else np.array(o.axis, dtype=float).tolist()
+                oris.append((o.matrix.dot(P).tolist(), o.degrees, axis))
+            self.data[key]["orientations"][self.get_wp_key(wp, rtol)] = oris
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        self.data = {}
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, filename):
+        """
+        Dump the cache to a json file
+
+        Args:
+            filename: path of the json file
+        """
+        dumpfn({"decimals": self.decimals, "data": self.data}, filename)
+
+    def load(self, filename):
+        """
+        Load the entries from a json file and merge them into the cache
+
+        Args:
+            filename: path of the json file
+        """
+        dicts = loadfn(filename)
+        if dicts["decimals"] != self.decimals:
+            raise ValueError("Inconsistent decimals in the cache file", filename)
+        for key, entry in dicts["data"].items():
+            # json turns the tuples into lists
+            entry["orientations"] = {k: [tuple(o) for o in v] for k, v in entry["orientations"].items()}
+            self.data[key] = entry
+
+
 class pyxtal_molecule:
     """
     Extended molecule class based on pymatgen.core.structure.Molecule
@@ -1205,15 +1387,27 @@ class pyxtal_molecule:
         if symmetrize:
             pga = PointGroupAnalyzer(mol, rtol, eigen_tolerance=1e-3)
             mol = pga.symmetrize_molecule()["sym_mol"]
-        pga = PointGroupAnalyzer(mol, rtol, eigen_tolerance=1e-3)
         self.mol_no_h = mol
+        self._pga = None
+        self._pga_rtol = rtol
+        self._cache_key = None
+
+        # Reuse the analysis from the molecule with the same geometry
+        if len(mol) > 1 and not symmetrize:
+            self._cache_key, self._cache_P = symmetry_cache.get_key(mol, rtol)
+            res = symmetry_cache.get_symmetry(self._cache_key, self._cache_P)
+        else:
+            res = None
 
         # print(mol.to(fmt='xyz'), pga.sch_symbol)
         # For single atoms, no point group using a list of operations
         if len(mol) == 1:
             symm_m = []
             symbol = "C1"
+        elif res is not None:
+            symbol, symm_m = res
         else:
+            pga = self.pga
             symbol = pga.sch_symbol
             pg = pga.get_pointgroup()
             symm_m = list(pg)
@@ -1246,12 +1440,24 @@ class pyxtal_molecule:
                         # Generate a full list of SymmOps for the pointgroup
                         symm_m = generate_full_symmops(symm_m, 1e-3)
                         break
+            if self._cache_key is not None:
+                symmetry_cache.set_symmetry(self._cache_key, self._cache_P, symbol, symm_m)
         self.symops = symm_m
-        self.pga = pga
         if symbol == "S2":
             symbol = "Ci"
         self.pg = Group(symbol, dim=0)
 
+    @property
+    def pga(self):
+        """
+        The PointGroupAnalyzer of the molecule without H, which is only
+        created when needed since the symmetry may come from the cache.
+        """
+        if getattr(self, "_pga", None) is None:
+            rtol = getattr(self, "_pga_rtol", 0.30)
+            self._pga = PointGroupAnalyzer(self.mol_no_h, rtol, eigen_tolerance=1e-3)
+        return self._pga
+
     def get_orientations_in_wps(self, wps=None, rtol=1e-2):
         """
         Compute the valid orientations from a given Wyckoff site symmetry.
@@ -1285,8 +1491,27 @@ class pyxtal_molecule:
         # For single atoms, there are no constraints
         if len(self.mol) == 1 or wp.index == 0:
             return [Orientation([[1, 0, 0], [0, 1, 0], [0, 0, 1]], degrees=2)]
+
+        key = getattr(self, "_cache_key", None)
+        if key is not None:
+            allowed = symmetry_cache.get_orientations(key, self._cache_P, wp, rtol)
+            if allowed is None:
+                allowed = self._get_orientations_in_wp(wp, rtol)
+                symmetry_cache.set_orientations(key, self._cache_P, wp, rtol, allowed)
+            return allowed
+        return self._get_orientations_in_wp(wp, rtol)
+
+    def _get_orientations_in_wp(self, wp, rtol=1e-2):
+        """
+        Search the valid orientations from a given Wyckoff site symmetry.
+
+        Args:
+            wp: a pyxtal.symmetry.Wyckoff_position object
+        Returns:
+            a list of pyxtal.molecule.Orientation objects
+        """
         # C1 molecule cannot take specical position
-        elif wp.index > 1 and self.pga.sch_symbol == "C1":
+        if wp.index > 1 and self.pga.sch_symbol == "C1":
             return []
 
         symm_w = wp.get_site_symm_wo_translation()  # symmetry without translation
@@ -1477,6 +1702,9 @@ class pyxtal_molecule:
         cdist(xyz1 - xyz2)
 
 
+symmetry_cache = PointGroupCache()
+
+
 class Box:
     """
     Class for storing the binding box for a molecule.
@@ -13,6 +13,7 @@ from pyxtal.lattice import Lattice
 from pyxtal.molecule import pyxtal_molecule
 from pyxtal.optimize.base import GlobalOptimize
 from pyxtal.optimize.common import optimizer_par, optimizer_single
+from pyxtal.optimize.screen import Screener
 from pyxtal.representation import representation
 
 
@@ -45,6 +46,7 @@ class GA(GlobalOptimize):
         skip_ani (bool): whether or not use ani or not (default: True)
         eng_cutoff (float): the cutoff energy for FF training
         E_max (float): maximum energy defined as an invalid structure
+        screener: `Screener` object to filter structures before relaxation
         verbose (bool): show more details
     """
 
@@ -77,6 +79,7 @@ class GA(GlobalOptimize):
         factor: float = 1.1,
         eng_cutoff: float = 5.0,
         E_max: float = 1e10,
+        screener: Optional[Screener] = None,
         verbose: bool = False,
     ):
         # GA parameters:
@@ -114,6 +117,7 @@ class GA(GlobalOptimize):
             factor,
             eng_cutoff,
             E_max,
+            screener,
         )
 
         print(self.full_str())
@@ -208,6 +212,7 @@ class GA(GlobalOptimize):
                 ref_pxrd,
                 self.use_hall,
                 self.skip_ani,
+                self.screener,
             ]
 
             gen_results = [None] * len(current_xtals)
@@ -238,8 +243,11 @@ class GA(GlobalOptimize):
                     results = [executor.submit(optimizer_par, *p) for p in args_lists]
                     # loop each cpu
                     for result in results:
+                        res_list, stats = result.result()
+                        if stats is not None:
+                            self.screener.merge_stats(stats)
                         # loop each pop
-                        for res in result.result():
+                        for res in res_list:
                             (id, xtal, match) = res
                             gen_results[id] = (xtal, match)
 
@@ -301,6 +309,8 @@ class GA(GlobalOptimize):
             gen_out = f"Gen{gen:3d} time usage: "
             gen_out += f"{t1 - t0:5.1f}[Calc] {t2 - t1:5.1f}[Proc]"
             print(gen_out)
+            if self.screener is not None:
+                print(self.screener.summary())
 
             # Save the reps for next move
 
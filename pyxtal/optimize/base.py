@@ -18,6 +18,7 @@ from ost.parameters import ForceFieldParameters, compute_r2, get_lmp_efs
 from pyxtal.lattice import Lattice
 from pyxtal.molecule import find_rotor_from_smile, pyxtal_molecule
 from pyxtal.optimize.common import optimizer, randomizer
+from pyxtal.optimize.screen import Screener
 from pyxtal.representation import representation
 from pyxtal.util import new_struc
 
@@ -48,6 +49,7 @@ class GlobalOptimize:
         skip_ani (bool): whether or not use ani or not (default: True)
         eng_cutoff (float): the cutoff energy for FF training
         E_max (float): maximum energy defined as an invalid structure
+        screener: `Screener` object to filter structures before relaxation
     """
 
     def __init__(
@@ -76,6 +78,7 @@ class GlobalOptimize:
         factor: float = 1.1,
         eng_cutoff: float = 5.0,
         E_max: float = 1e10,
+        screener: Optional[Screener] = None,
     ):
         # Molecular information
         self.smile = smiles
@@ -105,6 +108,7 @@ class GlobalOptimize:
         self.skip_ani = skip_ani
         self.randomizer = randomizer
         self.optimizer = optimizer
+        self.screener = screener
 
         self.ff_opt = ff_opt
 
@@ -529,52 +533,72 @@ class GlobalOptimize:
         else:
             return None, None
 
+    def _get_gaussian_features(self, reps):
+        """
+        Convert the 1D reps to the padded arrays for the Gaussian penalty
+
+        Args:
+            reps: list of 1D reps
+
+        Returns:
+            hall numbers (N), cell parameters (N, 6) and torsions (N, N_torsion)
+        """
+        hns = np.zeros(len(reps), dtype=int)
+        cells = np.zeros([len(reps), 6])
+        tors = np.zeros([len(reps), self.N_torsion])
+        for i, rep in enumerate(reps):
+            hns[i] = rep[0][0]
+            cells[i, : len(rep[0]) - 1] = rep[0][1:]
+            count = 0
+            for v in rep[1:]:
+                if len(v) >= 8:  # for Cl-
+                    n_tor = len(v) - 8
+                    tors[i, count : count + n_tor] = v[7:-1]
+                    count += n_tor
+        return hns, cells, tors
+
+    def _update_gaussian_refs(self):
+        """
+        Append the newly added best_reps to the padded reference arrays,
+        so that each rep is converted only once during the run.
+        """
+        N_ref = getattr(self, "_N_gau_refs", 0)
+        if N_ref == 0 or len(self.best_reps) < N_ref:
+            N_ref = 0
+            self._gau_refs = self._get_gaussian_features([])
+        if len(self.best_reps) > N_ref:
+            new_refs = self._get_gaussian_features(self.best_reps[N_ref:])
+            self._gau_refs = tuple(np.concatenate([a, b]) for a, b in zip(self._gau_refs, new_refs))
+        self._N_gau_refs = len(self.best_reps)
+        return self._gau_refs
+
     def _apply_gaussian(self, reps, engs, h1=0.1, h2=0.1, w1=0.2, w2=3):
         """
         Apply Gaussian to discourage the sampling of already visited configs.
-        Consider both lattice abc and torsion
+        Consider both lattice abc (same hall number) and torsion (periodic).
         """
-        from copy import deepcopy
-
-        # check torsion
-        N_id = 8
-        engs_gau = deepcopy(engs)
-        for i, rep in enumerate(reps):
-            gau = 0
-            if rep is not None and engs[i] < 9999:
-                sg1, abc1 = rep[0][0], np.array(rep[0][1:])
-                tor1 = np.zeros(self.N_torsion)
-                count = 0
-                for j in range(1, len(rep)):
-                    if len(rep[j]) > N_id:  # for Cl-
-                        tor1[count : count + len(rep[j]) - N_id - 1] = rep[j][N_id:-1]
-                        count += len(rep[j]) - N_id
-
-                for ref in self.best_reps:
-                    sg2, abc2 = ref[0][0], np.array(ref[0][1:])
-                    # Cell
-                    g1 = 0
-                    if sg1 == sg2:
-                        diff1 = np.sum((abc1 - abc2) ** 2) / w1**2
-                        g1 = h1 * np.exp(-0.5 * diff1)  # cell
-                    # Torsion
-                    g2 = 0
-                    if len(tor1) > 0:
-                        tor2 = np.zeros(self.N_torsion)
-                        count = 0
-                        for j in range(1, len(rep)):
-                            if len(rep[j]) > N_id:  # for Cl-
-                                tor2[count : count + len(ref[j]) - N_id - 1] = ref[j][N_id:-1]
-                                count += len(ref[j]) - N_id
-
-                        diff2 = np.sum((tor1 - tor2) ** 2) / w2**2
-                        g2 = h2 * np.exp(-0.5 * diff2)  # torsion
-                    gau += g1 + g2
-                # if gau > 1e-2: print(sg1, diag1, abc1, tor1)
-            # print("Gaussian", i, "eng", engs[i], "gau", gau)
-            # import sys; sys.exit()
-            engs_gau[i] += gau
-        return np.array(engs_gau)
+        engs_gau = np.array(engs, dtype=float)
+        ids = [i for i, rep in enumerate(reps) if rep is not None and engs[i] < 9999]
+        ref_hns, ref_cells, ref_tors = self._update_gaussian_refs()
+        if len(ids) == 0 or len(ref_hns) == 0:
+            return engs_gau
+
+        hns, cells, tors = self._get_gaussian_features([reps[i] for i in ids])
+
+        # Cell
+        diff1 = np.sum((cells[:, None, :] - ref_cells[None, :, :]) ** 2, axis=-1) / w1**2
+        same_hn = hns[:, None] == ref_hns[None, :]
+        gau = h1 * np.sum(np.exp(-0.5 * diff1) * same_hn, axis=1)
+
+        # Torsion
+        if self.N_torsion > 0:
+            diff2 = tors[:, None, :] - ref_tors[None, :, :]
+            diff2 -= 360.0 * np.rint(diff2 / 360.0)
+            diff2 = np.sum(diff2**2, axis=-1) / w2**2
+            gau += h2 * np.sum(np.exp(-0.5 * diff2), axis=1)
+
+        engs_gau[ids] += gau
+        return engs_gau
 
     def check_ref(self, reps=None, reference=None, filename="pyxtal.cif"):
         """
@@ -158,6 +158,7 @@ def optimizer(
     calculators=None,
     max_time=180,
     skip_ani=False,
+    screener=None,
 ):
     """
     Structural relaxation for each individual pyxtal structure.
@@ -166,12 +167,20 @@ def optimizer(
         struc: pyxtal
         workdir: working directory
         calculators: e.g., `['CHARMM', 'GULP']`
+        screener: `Screener` object to reject bad structures before relaxation
 
     Returns:
         a dictionary with xtal, energy and time
     """
     if calculators is None:
         calculators = ["CHARMM"]
+
+    # skip the relaxation if the structure is obviously bad
+    if screener is not None:
+        passed, _ = screener.check(struc)
+        if not passed:
+            return None
+
     cwd = os.getcwd()
     t0 = time()
     os.chdir(workdir)
@@ -288,6 +297,7 @@ def optimizer_par(
     ref_pxrd,
     use_hall,
     skip_ani,
+    screener=None,
 ):
     """
     A routine used for parallel structure optimization
@@ -295,7 +305,15 @@ def optimizer_par(
     Args:
         xtals: list of xtals
         ids: list of structure ids
+
+    Returns:
+        list of (id, xtal, match) and the screener statistics (None if
+        no screener is used), which are otherwise lost in the worker
     """
+    # the worker gets a copy of the screener, only count the new structures
+    if screener is not None:
+        screener.reset()
+
     results = []
     for i in range(len(ids)):
         xtal = xtals[i]
@@ -325,9 +343,11 @@ def optimizer_par(
             ref_pxrd,
             use_hall,
             skip_ani,
+            screener,
         )
         results.append((id, xtal, match))
-    return results
+    stats = screener.get_stats() if screener is not None else None
+    return results, stats
 
 
 def optimizer_single(
@@ -353,6 +373,7 @@ def optimizer_single(
     ref_pxrd,
     use_hall,
     skip_ani,
+    screener=None,
 ):
     """
     A routine used for individual structure optimization
@@ -362,6 +383,7 @@ def optimizer_single(
         id: structure id
         randomizer:
         optimizer:
+        screener: optional `Screener` applied before the optimization
     """
 
     # 1. Obtain the structure model
@@ -386,7 +408,7 @@ def optimizer_single(
             xtal = mutator(xtal, smiles, opt_lat, ref_pxrd)
 
     # 2. Optimization
-    res = optimizer(xtal, atom_info, workdir, job_tag, opt_lat, skip_ani=skip_ani)
+    res = optimizer(xtal, atom_info, workdir, job_tag, opt_lat, skip_ani=skip_ani, screener=screener)
 
     # 3. Check match w.r.t the reference
     match = False
@@ -0,0 +1,334 @@
+"""
+Cheap pre-screening of molecular crystals before the expensive relaxation
+"""
+
+from time import time
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from pyxtal.tolerance import Tol_matrix
+
+
+def get_lens_volume(d, r1, r2):
+    """
+    Volume of the lens shared by two spheres, zero if they do not overlap.
+
+    Args:
+        d: array of center-center distances
+        r1: array of radii for the 1st spheres
+        r2: array of radii for the 2nd spheres
+
+    Returns:
+        array of overlap volumes in the same shape of d
+    """
+    d = np.maximum(d, 1e-8)
+    h = np.maximum(r1 + r2 - d, 0)
+    vol = np.pi * h**2 * (d**2 + 2 * d * (r1 + r2) - 3 * (r1 - r2) ** 2) / (12 * d)
+    # one sphere is fully inside the other
+    inside = d <= np.abs(r1 - r2)
+    if inside.any():
+        r_min = np.minimum(r1, r2) * np.ones_like(d)
+        vol[inside] = 4 / 3 * np.pi * r_min[inside] ** 3
+    return vol
+
+
+def get_vdw_volume(xyz, radii, resolution=0.2):
+    """
+    Volume enclosed by the union of atomic vdW spheres from a real space grid.
+
+    Args:
+        xyz: (N, 3) Cartesian coordinates
+        radii: (N,) vdW radii
+        resolution: grid spacing in angstrom
+
+    Returns:
+        volume in A^3
+    """
+    lo = xyz.min(axis=0) - radii.max()
+    hi = xyz.max(axis=0) + radii.max()
+    axes = [np.arange(lo[i], hi[i] + resolution, resolution) for i in range(3)]
+    grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+    occupied = np.zeros(len(grid), dtype=bool)
+    # loop over atoms to keep the memory bounded by the grid size
+    for pos, r in zip(xyz, radii):
+        occupied |= np.sum((grid - pos) ** 2, axis=1) < r**2
+    return occupied.sum() * resolution**3
+
+
+class Screener:
+    """
+    A cheap filter to rank or reject the generated molecular crystals before
+    they are sent to the expensive calculators. For each structure, it computes
+
+    - `packing`: the packing coefficient (Z*V_mol/V_cell)
+    - `contact`: the shortest intermolecular contact relative to the vdW sum
+    - `overlap`: the vdW overlap volume per molecule (A^3)
+    - `energy`: the Gavezzotti atom-atom energy per molecule (kcal/mol)
+
+    from the `mol_site` data.
+
+    Args:
+        pc_min (float): minimum packing coefficient
+        pc_max (float): maximum packing coefficient
+        contact_min (float): minimum ratio between the contact and vdW sum
+        overlap_max (float): maximum vdW overlap volume per molecule
+        E_max (float): maximum Gavezzotti energy per molecule
+        max_d (float): cutoff distance for the atom-atom energy
+        hbond (float): scaling factor of vdW radii for the H-N/O/F pairs
+        resolution (float): grid spacing to compute the molecular volume
+    """
+
+    def __init__(
+        self,
+        pc_min=0.55,
+        pc_max=0.90,
+        contact_min=0.65,
+        overlap_max=10.0,
+        E_max=None,
+        max_d=8.0,
+        hbond=0.7,
+        resolution=0.2,
+    ):
+        self.pc_min = pc_min
+        self.pc_max = pc_max
+        self.contact_min = contact_min
+        self.overlap_max = overlap_max
+        self.E_max = E_max
+        self.max_d = max_d
+        self.hbond = hbond
+        self.resolution = resolution
+        self.tm = Tol_matrix(prototype="vdW")
+        self._volumes = {}
+        self.reset()
+
+    def __str__(self):
+        s = "\n------Crystal Pre-screening------"
+        s += f"\nPacking   : {self.pc_min:6.3f} - {self.pc_max:6.3f}"
+        s += f"\nContact   : {self.contact_min:6.3f}"
+        s += f"\nOverlap   : {self.overlap_max:6.3f}"
+        if self.E_max is not None:
+            s += f"\nE_max     : {self.E_max:6.3f}"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    def reset(self):
+        """
+        Reset the throughput and rejection statistics
+        """
+        self.N_total = 0
+        self.N_pass = 0
+        self.rejections = {"packing": 0, "contact": 0, "overlap": 0, "energy": 0, "error": 0}
+        self.time = 0.0
+
+    def get_stats(self):
+        """
+        Get the throughput and rejection statistics as a dictionary
+        """
+        return {
+            "N_total": self.N_total,
+            "N_pass": self.N_pass,
+            "rejections": dict(self.rejections),
+            "time": self.time,
+        }
+
+    def merge_stats(self, stats):
+        """
+        Add the statistics collected by another screener, e.g., from the
+        copies used in the parallel workers
+
+        Args:
+            stats: dictionary from `get_stats`
+        """
+        self.N_total += stats["N_total"]
+        self.N_pass += stats["N_pass"]
+        self.time += stats["time"]
+        for reason, count in stats["rejections"].items():
+            self.rejections[reason] += count
+
+    def get_radii(self, numbers):
+        return np.array([self.tm.get_tol(n, n) / 2 for n in numbers])
+
+    def get_molecular_volume(self, molecule):
+        """
+        Compute the vdW volume of a pyxtal_molecule. The value is cached by
+        the molecule name and the atomic numbers, since the volume barely
+        changes upon the torsion variation.
+
+        Args:
+            molecule: pyxtal_molecule object
+
+        Returns:
+            volume in A^3
+        """
+        numbers = molecule.mol.atomic_numbers
+        key = (molecule.name, tuple(numbers))
+        if key not in self._volumes:
+            radii = self.get_radii(numbers)
+            self._volumes[key] = get_vdw_volume(molecule.mol.cart_coords, radii, self.resolution)
+        return self._volumes[key]
+
+    def _get_site_contacts(self, site1, site2):
+        """
+        Compute the contacts between the first molecule of site1 and all
+        molecules of site2 (including the periodic images).
+
+        Args:
+            site1: the reference mol_site
+            site2: the neighboring mol_site
+
+        Returns:
+            min_ratio: the shortest contact relative to the vdW sum
+            overlap: vdW overlap volume summed over all pairs
+            energy: Gavezzotti energy summed over all pairs
+        """
+        numbers1 = site1.molecule.mol.atomic_numbers
+        numbers2 = site2.molecule.mol.atomic_numbers
+        m1, m2 = len(numbers1), len(numbers2)
+
+        coord1, _ = site1._get_coords_and_species(first=True, unitcell=True)
+        coord2, _ = site2._get_coords_and_species(unitcell=True)
+        N2 = len(coord2) // m2
+
+        # periodic images with [0, 0, 0] in the first place
+        m = site1._create_matrix(center=True, ignore=True)
+        coord2 = (coord2[None, :, :] + m[:, None, :]).reshape(-1, 3)
+        d = cdist(coord1.dot(site1.lattice.matrix), coord2.dot(site1.lattice.matrix))
+        d = d.reshape([m1, len(m) * N2, m2]).transpose(1, 0, 2)  # (M, m1, m2)
+
+        # remove the molecule itself
+        if site1 is site2:
+            d = d[1:]
+
+        r1 = self.get_radii(numbers1)[:, None] * np.ones([1, m2])
+        r2 = self.get_radii(numbers2)[None, :] * np.ones([m1, 1])
+        # allow hydrogen bond
+        n1, n2 = np.array(numbers1)[:, None], np.array(numbers2)[None, :]
+        hb = ((n1 == 1) & np.isin(n2, [7, 8, 9])) | ((n2 == 1) & np.isin(n1, [7, 8, 9]))
+        r1[hb] *= self.hbond
+        r2[hb] *= self.hbond
+
+        min_ratio = np.min(d / (r1 + r2)) if len(d) > 0 else np.inf
+        overlap = get_lens_volume(d, r1, r2).sum()
+
+        coefs = site1.molecule.get_coefs_matrix(site2.molecule)
+        A, B, C = coefs[:, :, 0], coefs[:, :, 1], coefs[:, :, 2]
+        d = d[d.min(axis=(1, 2)) < self.max_d]
+        energy = np.sum(A * np.exp(-B * d) - C / d**6)
+        return min_ratio, overlap, energy
+
+    def get_scores(self, xtal):
+        """
+        Compute the pre-screening descriptors for a molecular crystal
+
+        Args:
+            xtal: pyxtal object
+
+        Returns:
+            a dictionary of `packing`, `contact`, `overlap` and `energy`
+        """
+        vol_mol = 0
+        N_mols = 0
+        min_ratio = np.inf
+        overlap = 0
+        energy = 0
+        for site1 in xtal.mol_sites:
+            mult = site1.wp.multiplicity
+            vol_mol += mult * self.get_molecular_volume(site1.molecule)
+            N_mols += mult
+            for site2 in xtal.mol_sites:
+                res = self._get_site_contacts(site1, site2)
+                min_ratio = min(min_ratio, res[0])
+                overlap += mult * res[1]
+                energy += mult * res[2]
+
+        # each pair is counted twice
+        return {
+            "packing": vol_mol / xtal.lattice.volume,
+            "contact": min_ratio,
+            "overlap": 0.5 * overlap / N_mols,
+            "energy": 0.5 * energy / N_mols,
+        }
+
+    def check(self, xtal):
+        """
+        Check if the crystal passes the screening criteria
+
+        Args:
+            xtal: pyxtal object
+
+        Returns:
+            passed (bool) and the dictionary of scores
+        """
+        t0 = time()
+        self.N_total += 1
+        try:
+            scores = self.get_scores(xtal)
+        except Exception:
+            self.rejections["error"] += 1
+            self.time += time() - t0
+            return False, None
+
+        if not self.pc_min <= scores["packing"] <= self.pc_max:
+            reason = "packing"
+        elif scores["contact"] < self.contact_min:
+            reason = "contact"
+        elif scores["overlap"] > self.overlap_max:
+            reason = "overlap"
+        elif self.E_max is not None and scores["energy"] > self.E_max:
+            reason = "energy"
+        else:
+            reason = None
+
+        if reason is None:
+            self.N_pass += 1
+        else:
+            self.rejections[reason] += 1
+        self.time += time() - t0
+        return reason is None, scores
+
+    def screen(self, xtals, key="energy", N_max=None):
+        """
+        Screen a batch of crystals and rank the survivors
+
+        Args:
+            xtals: list of pyxtal objects
+            key: the score used to rank the passed structures
+            N_max: maximum number of structures to keep
+
+        Returns:
+            ids: sorted indices of passed structures
+            scores: list of score dictionaries (None if failed)
+        """
+        ids = []
+        scores = []
+        for i, xtal in enumerate(xtals):
+            passed, score = self.check(xtal)
+            scores.append(score)
+            if passed:
+                ids.append(i)
+
+        values = [scores[i][key] for i in ids]
+        # a denser packing is better
+        if key == "packing":
+            values = [-v for v in values]
+        ids = [ids[i] for i in np.argsort(values)]
+        if N_max is not None:
+            ids = ids[:N_max]
+        return ids, scores
+
+    def summary(self):
+        """
+        Report the throughput and rejection statistics
+        """
+        s = f"Screened {self.N_total:d} structures in {self.time:.2f} s"
+        if self.N_total > 0:
+            rate = self.N_total / max(self.time, 1e-8)
+            s += f" ({rate:.1f}/s)"
+            s += f"\nPassed  : {self.N_pass:6d} ({self.N_pass / self.N_total:6.2%})"
+            for reason, count in self.rejections.items():
+                if count > 0:
+                    s += f"\n{reason:8s}: {count:6d} ({count / self.N_total:6.2%})"
+        return s
@@ -38,10 +38,37 @@ def structure_factor(pos, hkl, total=True):
         return F
 
 
+def structure_factors(pos, hkls, ns, size=1000000):
+    """
+    Compute the structure factors for the grid of hkl planes and multiples
+
+    Args:
+        pos: (N, 3) fractional coordinates
+        hkls: (M, 3) array of hkl indices
+        ns: list of multiples
+        size: maximum number of exponentials evaluated at once
+
+    Returns:
+        (M, len(ns)) array of complex structure factors
+    """
+    ns = np.array(ns)
+    coords = np.dot(pos, np.array(hkls).T)  # (N, M)
+    F = np.zeros([len(hkls), len(ns)], dtype=complex)
+    chunk = max(1, size // (len(pos) * len(ns)))
+    for i in range(0, len(hkls), chunk):
+        _coords = coords[:, i : i + chunk, None] * ns[None, None, :]
+        F[i : i + chunk] = np.exp(-2 * np.pi * (1j) * _coords).sum(axis=0)
+    return F
+
+
 def get_dspacing(inv_matrix, hkl):
     return 1 / np.linalg.norm(inv_matrix.dot(np.array(hkl)))
 
 
+def get_dspacings(inv_matrix, hkls):
+    return 1 / np.linalg.norm(np.dot(np.array(hkls), inv_matrix.T), axis=1)
+
+
 class planes:
     """
     This is a database class to process crystal data
@@ -62,12 +89,14 @@ class planes:
     def set_xtal(self, xtal):
         self.xtal = xtal
         self.atoms = xtal.to_ase(center_only=True)
+        self.positions = self.atoms.get_scaled_positions()
         self.cell_reciprocal = xtal.lattice.inv_matrix
 
     def set_planes(self):
         planes = list(itertools.product(range(-self.extent, self.extent + 1), repeat=3))
         planes = [hkl for hkl in planes if hkl != (0, 0, 0) and not has_reduction(hkl)]
         self.planes = planes
+        self.hkls = np.array(planes)
 
     def get_cp_factor(self, hkl):
         hkl, hkl_factor = reduced_hkl(hkl)
@@ -90,28 +119,29 @@ class planes:
         Args:
             N_max: maximum number of multiples
         """
+        # skip the planes which are too short ranged
+        dspacings = get_dspacings(self.cell_reciprocal, self.hkls)
+        ids = np.where(dspacings > self.d_min)[0]
+        ns = np.arange(1, N_max)
+
+        # structure factors of all (hkl, n) at once
+        F = np.abs(structure_factors(self.positions, self.hkls[ids], ns))
+        valid = dspacings[ids, None] / ns[None, :] > self.d_min
+        dense = valid & (len(self.atoms) * self.cp_factor <= F)
+
         cp_planes = []
-        for hkl in self.planes:
-            dspacing = get_dspacing(self.cell_reciprocal, hkl)
-            for n in range(1, N_max):
-                if dspacing / n > self.d_min:
-                    hkl1 = n * np.array(hkl)
-                    F = self.get_structure_factor(hkl1)
-                    if np.abs(F) >= len(self.atoms) * self.cp_factor:
-                        # Scan the plane with high density
-                        plane = self.get_separation(hkl1)
-                        if plane is not None:
-                            cp_planes.append(plane)
-                        break
-                else:
-                    # early termination for very short ranged hkl
-                    break
+        for i in np.where(dense.any(axis=1))[0]:
+            # Scan the plane with the smallest multiple of high density
+            n = ns[np.argmax(dense[i])]
+            plane = self.get_separation(n * self.hkls[ids[i]])
+            if plane is not None:
+                cp_planes.append(plane)
         if len(cp_planes) > 0:
             cp_planes = sorted(cp_planes, key=lambda x: -x[-1][0])
         return cp_planes
 
     def get_structure_factor(self, hkl):
-        return structure_factor(self.atoms.get_scaled_positions(), hkl)
+        return structure_factor(self.positions, hkl)
 
     def get_separation(self, hkl):
         """
@@ -127,23 +157,17 @@ class planes:
         slabs = []
         for mol_site in self.xtal.mol_sites:
             N_atoms = len(mol_site.numbers)
-            center_frac = mol_site.position  # fractional
             xyz, species = mol_site._get_coords_and_species(unitcell=True)
-            for id_mol, op in enumerate(mol_site.wp.ops):
-                start, end = id_mol * N_atoms, (id_mol + 1) * N_atoms
-                coords = xyz[start:end, :]  # frac
-                center_frac = op.operate(mol_site.position)
-                center_frac -= np.floor(center_frac)
-                coords -= center_frac  # place the center to (0, 0, 0)
-                center_hkl = np.dot(center_frac, hkl_reduced)
-                center_hkl -= np.floor(center_hkl)
-                coords_hkl = np.dot(coords, hkl_reduced)
-
-                lower, upper = (
-                    center_hkl + coords_hkl.min(),
-                    center_hkl + coords_hkl.max(),
-                )
-                slabs.append([center_hkl, lower, upper])
+            coords = xyz.reshape([-1, N_atoms, 3])  # frac
+            centers = mol_site.wp.apply_ops(mol_site.position)
+            centers -= np.floor(centers)
+            # place the center to (0, 0, 0)
+            coords_hkl = np.dot(coords - centers[:, None, :], hkl_reduced)
+            center_hkl = np.dot(centers, hkl_reduced)
+            center_hkl -= np.floor(center_hkl)
+            lowers = center_hkl + coords_hkl.min(axis=1)
+            uppers = center_hkl + coords_hkl.max(axis=1)
+            slabs.extend(np.stack([center_hkl, lowers, uppers], axis=1).tolist())
         # if np.abs(hkl-np.array([0, 8, 0])).sum()==0:
         groups = self.group_slabs(slabs, 0.5 / hkl_factor)
         groups = self.group_slabs(groups, 0.5 / hkl_factor)
@@ -215,6 +239,47 @@ class planes:
         return output
 
 
+def _search_close_packing_planes(xtals, extent, d_min, cp_factor, N_max):
+    """
+    Search the close-packed planes for a list of crystals
+    """
+    p = planes(extent, d_min, cp_factor)
+    results = []
+    for xtal in xtals:
+        p.set_xtal(xtal)
+        results.append(p.search_close_packing_planes(N_max))
+    return results
+
+
+def search_close_packing_planes(xtals, extent=6, d_min=1.5, cp_factor=0.5, N_max=10, ncpu=1):
+    """
+    Search the close-packed planes for many molecular crystals
+
+    Args:
+        xtals: list of molecular pyxtal objects
+        extent: the maximum hkl index
+        d_min: the minimum layer spacing
+        cp_factor: skip non-close packed plane
+        N_max: maximum number of multiples
+        ncpu: number of parallel processes
+
+    Returns:
+        a list of close-packed planes for each crystal
+    """
+    if ncpu == 1:
+        return _search_close_packing_planes(xtals, extent, d_min, cp_factor, N_max)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    N_cycle = int(np.ceil(len(xtals) / ncpu))
+    args_list = [(xtals[i * N_cycle : (i + 1) * N_cycle], extent, d_min, cp_factor, N_max) for i in range(ncpu)]
+    results = []
+    with ProcessPoolExecutor(max_workers=ncpu) as executor:
+        for result in executor.map(_search_close_packing_planes, *zip(*args_list)):
+            results.extend(result)
+    return results
+
+
 class plane:
     """
     This simplest possible plane object
@@ -477,6 +477,310 @@ class representation:
             return np.array(diffs)
 
 
+class representation_batch:
+    """
+    A columnar container to store a population of 1D representations in
+    numpy structured arrays, which allows the fast (de)serialization of the
+    GA checkpoints or structure archives.
+
+    - `xtals`: hall number, cell parameters, site range, energy per structure
+    - `sites`: type, wp index, xyz, orientation, reflect, torsion range per site
+    - `torsions`: the flattened torsion angles
+
+    Args:
+        xtals: structured array of the crystal records
+        sites: structured array of the site records
+        torsions: 1D array of torsion angles
+        smiles: a list of smiles (molecular) or species (atomic)
+        molecular: whether or not the representation is molecular
+    """
+
+    xtal_dtype = np.dtype(
+        [
+            ("hn", "i4"),
+            ("cell", "f8", 6),
+            ("site_start", "i8"),
+            ("n_site", "i4"),
+            ("energy", "f8"),
+        ]
+    )
+
+    site_dtype = np.dtype(
+        [
+            ("type", "i4"),
+            ("wp", "i4"),
+            ("xyz", "f8", 3),
+            ("ori", "f8", 3),
+            ("reflect", "i1"),
+            ("tor_start", "i8"),
+            ("n_tor", "i4"),
+            ("n_val", "i4"),
+        ]
+    )
+
+    def __init__(self, xtals, sites, torsions, smiles, molecular=True):
+        self.xtals = xtals
+        self.sites = sites
+        self.torsions = torsions
+        self.smiles = list(smiles)
+        self.molecular = molecular
+
+    def __len__(self):
+        return len(self.xtals)
+
+    def __str__(self):
+        s = f"\n------{len(self):d} 1D representations ({len(self.sites):d} sites)------"
+        s += "\nSmiles: " if self.molecular else "\nSpecies: "
+        s += " ".join(self.smiles)
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    @classmethod
+    def from_reps(cls, reps, engs=None, composition=None):
+        """
+        Initialize from a list of `representation` or `representation_atom`
+
+        Args:
+            reps: list of 1D representations
+            engs: list of energies (optional)
+            composition: list of composition for the molecular smiles
+        """
+        molecular = isinstance(reps[0], representation)
+        xtals = np.zeros(len(reps), dtype=cls.xtal_dtype)
+        xtals["cell"] = np.nan
+        xtals["energy"] = np.nan
+        n_sites = [len(rep.x) - 1 for rep in reps]
+        sites = np.zeros(sum(n_sites), dtype=cls.site_dtype)
+        sites["xyz"] = np.nan
+        smiles, torsions = [], []
+
+        count = 0
+        for i, rep in enumerate(reps):
+            cell = rep.x[0]
+            xtals[i]["hn"] = cell[0]
+            xtals[i]["cell"][: len(cell) - 1] = cell[1:]
+            xtals[i]["site_start"] = count
+            xtals[i]["n_site"] = n_sites[i]
+            if engs is not None and engs[i] is not None:
+                xtals[i]["energy"] = engs[i]
+
+            if molecular:
+                names = rep.smiles
+                if len(names) != n_sites[i]:
+                    comp = [1] * len(names) if composition is None else composition
+                    if sum(comp) != n_sites[i]:
+                        msg = f"Composition is inconsistent: {sum(comp):d}/{n_sites[i]:d}"
+                        raise ValueError(msg)
+                    names = [name for name, c in zip(names, comp) for _ in range(c)]
+            else:
+                names = [v[0] for v in rep.x[1:]]
+
+            for name, v in zip(names, rep.x[1:]):
+                if name not in smiles:
+                    smiles.append(name)
+                site = sites[count]
+                site["type"] = smiles.index(name)
+                site["n_val"] = len(v)
+                if molecular:
+                    site["wp"] = v[0]
+                    site["xyz"] = v[1:4]
+                    if len(v) >= 8:
+                        site["ori"] = v[4:7]
+                        site["reflect"] = int(v[-1])
+                        site["tor_start"] = len(torsions)
+                        site["n_tor"] = len(v) - 8
+                        torsions.extend(v[7:-1])
+                    elif len(v) == 5:
+                        site["reflect"] = int(v[-1])
+                else:
+                    site["wp"] = v[1]
+                    site["xyz"][: len(v) - 2] = v[2:]
+                count += 1
+
+        torsions = np.array(torsions, dtype=float)
+        return cls(xtals, sites, torsions, smiles, molecular)
+
+    def get_x(self, id):
+        """
+        Get the list of [cell, site_1, site_2, ...] for the given structure
+
+        Args:
+            id: the structure index
+        """
+        xtal = self.xtals[id]
+        cell = xtal["cell"]
+        x = [[int(xtal["hn"]), *cell[~np.isnan(cell)].tolist()]]
+        start = xtal["site_start"]
+        for site in self.sites[start : start + xtal["n_site"]]:
+            n_val = site["n_val"]
+            if self.molecular:
+                v = [int(site["wp"]), *site["xyz"].tolist()]
+                if n_val >= 8:
+                    t0 = site["tor_start"]
+                    v += site["ori"].tolist()
+                    v += self.torsions[t0 : t0 + site["n_tor"]].tolist()
+                    v.append(int(site["reflect"]))
+                elif n_val == 5:
+                    v.append(int(site["reflect"]))
+            else:
+                v = [self.smiles[site["type"]], int(site["wp"])]
+                v += site["xyz"][: n_val - 2].tolist()
+            x.append(v)
+        return x
+
+    def get_smiles(self, id):
+        """
+        Get the list of smiles per site for the given structure
+        """
+        xtal = self.xtals[id]
+        start = xtal["site_start"]
+        types = self.sites[start : start + xtal["n_site"]]["type"]
+        return [self.smiles[t] for t in types]
+
+    def get_rep(self, id):
+        """
+        Get the `representation` or `representation_atom` object
+
+        Args:
+            id: the structure index
+        """
+        if self.molecular:
+            return representation(self.get_x(id), self.get_smiles(id))
+        else:
+            return representation_atom(self.get_x(id))
+
+    def to_reps(self, ids=None):
+        """
+        Export a list of 1D representations
+        """
+        if ids is None:
+            ids = range(len(self))
+        return [self.get_rep(id) for id in ids]
+
+    def save(self, filename):
+        """
+        Save the population to a binary npz file
+
+        Args:
+            filename: the path of the npz file
+        """
+        np.savez(
+            filename,
+            xtals=self.xtals,
+            sites=self.sites,
+            torsions=self.torsions,
+            smiles=np.array(self.smiles, dtype=str),
+            molecular=np.array(self.molecular),
+        )
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load the population from the binary npz file
+
+        Args:
+            filename: the path of the npz file
+        """
+        with np.load(filename, allow_pickle=False) as data:
+            return cls(
+                data["xtals"],
+                data["sites"],
+                data["torsions"],
+                data["smiles"].tolist(),
+                bool(data["molecular"]),
+            )
+
+    def to_pyxtals(self, ids=None):
+        """
+        Batch decoder to export a list of pyxtal structures. The group objects
+        are shared for the same hall number, and the molecules are copied from
+        the templates instead of being rebuilt from the smiles.
+
+        Args:
+            ids: list of structure indices (default: all)
+
+        Returns:
+            a list of pyxtal objects
+        """
+        from pyxtal import pyxtal
+        from pyxtal.molecule import pyxtal_molecule
+
+        if ids is None:
+            ids = range(len(self))
+
+        groups = {}
+        templates = {}
+        xtals = []
+        for id in ids:
+            x = self.get_x(id)
+            hn = x[0][0]
+            if hn not in groups:
+                groups[hn] = Group(hn, use_hall=True)
+            g = groups[hn]
+            ltype = g.lattice_type
+            lattice = Lattice.from_1d_representation(x[0][1:], ltype)
+
+            struc = pyxtal(molecular=self.molecular)
+            struc.group = g
+            struc.lattice = lattice
+            struc.source = "1D rep."
+            struc.valid = True
+
+            if self.molecular:
+                struc.numMols = []
+                struc.molecules = []
+                struc.mol_sites = []
+                for smile, v in zip(self.get_smiles(id), x[1:]):
+                    if smile not in templates:
+                        templates[smile] = pyxtal_molecule(mol=smile + ".smi", fix=True)
+                    dicts = {
+                        "smile": smile,
+                        "dim": 3,
+                        "PBC": [1, 1, 1],
+                        "hn": hn,
+                        "index": v[0],
+                        "lattice": lattice.matrix,
+                        "lattice_type": ltype,
+                        "center": v[1:4],
+                    }
+                    if smile not in ["Cl-"]:
+                        dicts["orientation"] = np.array(v[4:7])
+                        dicts["rotor"] = v[7:-1]
+                        dicts["reflect"] = int(v[-1])
+                    site = mol_site.from_1D_dicts(dicts, templates[smile], g)
+
+                    for mol_id, molecule in enumerate(struc.molecules):
+                        if str(site.molecule) == str(molecule):
+                            site.type = mol_id
+                            break
+                    else:
+                        struc.molecules.append(site.molecule)
+                        struc.numMols.append(0)
+                        site.type = len(struc.molecules) - 1
+                    struc.numMols[site.type] += site.wp.multiplicity
+                    struc.mol_sites.append(site)
+            else:
+                struc.numIons = []
+                struc.species = []
+                struc.atom_sites = []
+                for v in x[1:]:
+                    specie, wp = v[0], g[v[1]].copy()
+                    pos = wp.get_position_from_free_xyzs(v[2:])
+                    site = atom_site(wp, pos, specie)
+                    struc.atom_sites.append(site)
+                    if specie not in struc.species:
+                        struc.species.append(specie)
+                        struc.numIons.append(0)
+                    struc.numIons[struc.species.index(specie)] += wp.multiplicity
+
+            struc._get_formula()
+            struc.standard_setting = site.wp.is_standard_setting()
+            xtals.append(struc)
+        return xtals
+
+
 if __name__ == "__main__":
     # aspirin
     smiles = ["CC(=O)OC1=CC=CC=C1C(=O)O"]
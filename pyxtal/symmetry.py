@@ -571,6 +571,11 @@ class Hall:
 
 
 # --------------------------- Group class -----------------------------
+# results of Group.check_compatible by (dim, number, hall_number, numIons)
+_compatible_cache = {}
+_compatible_cache_size = 10000
+
+
 class Group:
     """
     Class for storing a set of Wyckoff positions for a symmetry group.
@@ -842,142 +847,116 @@ class Group:
             has_freedom: list of boolean numbers
             indices: list of wp indices
         """
+        combinations = []
+        has_freedom = []
+        indices = []
+        for combination, freedom, ids in self.iter_wyckoff_combinations(numIons, quick, numWp):
+            combinations.append(combination)
+            has_freedom.append(freedom)
+            indices.append(ids)
+            if len(combinations) >= Nmax:
+                break
+
+        return combinations, has_freedom, indices
 
-        numIons = np.array(numIons)
+    def iter_wyckoff_combinations(self, numIons, quick=False, numWp=(None, None)):
+        """
+        Generate the wyckoff combinations for the given formula one by one,
+        in the same order as `list_wyckoff_combinations`. The solutions are
+        searched by a bounded knapsack over the wyckoff multiplicities so that
+        the freedom and numWp constraints are applied during the search.
+
+        Args:
+            numIons (list): [12, 8]
+            quick ()Boolean): skip the duplicate wps with the same multiplicity
+            numWp (tuple): (min_wp, max_wp)
+
+        Yields:
+            combination (list of sites), has_freedom (bool), wp indices
+        """
+        numIons = [int(n) for n in numIons]
         (min_wp, max_wp) = numWp
         # Must be greater than the number of smallest wp multiplicity
-        if numIons.min() < self[-1].multiplicity or max_wp is not None and sum(numIons) > self[0].multiplicity * max_wp:
-            return [], [], []
+        if min(numIons) < self[-1].multiplicity or max_wp is not None and sum(numIons) > self[0].multiplicity * max_wp:
+            return
 
         basis = []  # [8, 4, 4]
-        letters = []  # ['c', 'b', 'a']
+        labels = []  # ['8c', '4b', '4a']
         freedoms = []  # [False, False, False]
         ids = []  # [2, 3, 4]
         # obtain the basis
         for i, wp in enumerate(self):
             mul = wp.multiplicity
-            letter = wp.letter
             freedom = np.trace(wp.ops[0].rotation_matrix) > 0
-            if mul <= max(numIons):
-                if quick:
-                    if mul in basis and freedom:
-                        pass
-                    # elif mul in basis and basis.count(mul) >= 3:
-                    #    pass
-                    else:
-                        basis.append(mul)
-                        letters.append(letter)
-                        freedoms.append(freedom)
-                else:
-                    basis.append(mul)
-                    letters.append(letter)
-                    freedoms.append(freedom)
-                    ids.append(i)
-
-        basis = np.array(basis)
-
-        # quickly exit
-        if np.min(numIons) < np.min(basis):
-            # print(numIons, basis)
-            return [], []
-        # odd and even
-        elif np.mod(numIons, 2).sum() > 0 and np.mod(basis, 2).sum() == 0:
-            # print("odd-even", numIons, basis)
-            # return None, False
-            return [], [], []
-
-        # print("basis", basis)
-        # print("numIons", numIons)
-        # obtain the maximum numbers for each basis
-        # reset the maximum to 1 if there is no freedom
-        # find the integer solutions
-        # reset solutions according to max_wp
-        max_solutions = np.floor(numIons[:, None] / basis)
-        for i in range(len(freedoms)):
-            if not freedoms[i]:
-                max_solutions[:, i] = 1
-
-        if max_wp is not None:
-            N_max = max_wp - (len(numIons) - 1)
-            max_solutions[max_solutions > N_max] = N_max
-
-        list_solutions = []
+            if mul <= max(numIons) and not (quick and mul in basis and freedom):
+                basis.append(mul)
+                labels.append(str(mul) + wp.letter)
+                freedoms.append(freedom)
+                ids.append(i)
+
+        # the wp without freedom can be only used once
+        maxs = [[n // b if f else 1 for b, f in zip(basis, freedoms)] for n in numIons]
+
+        # minimum number of wps to get n atoms from basis[j:], -1 if impossible
+        N_basis = len(basis)
+        min_wps = []
         for i, numIon in enumerate(numIons):
-            lists = []
-            prod = 1
-            for a in max_solutions[i]:
-                if prod <= Nmax:  # 10000000:
-                    d = int(a) + 1
-                    lists.append(list(range(d)))
-                    prod *= d
-                else:
-                    # If the size is too big, we terminate it asap
-                    lists.append([0])
-                    # Terminate the list
-                    # break
-            # print(len(lists), prod)
-
-            sub_solutions = np.array(list(itertools.product(*lists)))
-            N = sub_solutions.dot(basis)
-            sub_solutions = sub_solutions[numIon == N]
-            list_solutions.append(sub_solutions.tolist())
-            # print(i)
-            # print(sub_solutions)#; import sys; sys.exit()
-            if len(sub_solutions) == 0:
-                return [], [], []
-
-        # Gather all solutions and remove very large number solutions
-        solutions = np.array(list(itertools.product(*list_solutions)))
-        dim1 = solutions.shape[0]
-        dim2 = np.prod(solutions.shape[1:])
-        solutions = solutions.reshape([dim1, dim2])
-        if max_wp is not None:
-            solutions_total = solutions.sum(axis=1)
-            solutions = solutions[solutions_total <= max_wp]
-        if min_wp is not None:
-            solutions_total = solutions.sum(axis=1)
-            solutions = solutions[solutions_total >= min_wp]
-
-        # convert the results to list
-        combinations = []
-        has_freedom = []
-        indices = []
-        for solution in solutions:
-            res = solution.reshape([len(numIons), len(basis)])
-            _com = []
-            _free = []
-            _ids = []
-
-            # QZ: check what's going on
-            for i, numIon in enumerate(numIons):
-                tmp = []
-                bad_resolution = False
-                frozen = []
-                ids_in = []
-                for j, b in enumerate(basis):
-                    if not freedoms[j] and (res[:, j]).sum() > 1:
-                        bad_resolution = True
+            table = np.full([N_basis + 1, numIon + 1], -1, dtype=int)
+            table[N_basis, 0] = 0
+            for j in range(N_basis - 1, -1, -1):
+                for c in range(maxs[i][j] + 1):
+                    shift = c * basis[j]
+                    if shift > numIon:
                         break
-                    else:
-                        if res[i, j] > 0:
-                            symbols = [str(b) + letters[j]] * res[i, j]
-                            tmp.extend(symbols)
-                            frozen.extend([freedoms[j]])
-                            ids_in.extend([ids[j]] * res[i, j])
-                if not bad_resolution:
-                    _com.append(tmp)
-                    _free.extend(frozen)
-                    _ids.append(ids_in)
-
-            if len(_com) == len(numIons):
-                combinations.append(_com)
-                indices.append(_ids)
-                if True in _free:
-                    has_freedom.append(True)
+                    prev = table[j + 1, : numIon + 1 - shift]
+                    new = np.where(prev >= 0, prev + c, -1)
+                    cur = table[j, shift:]
+                    mask = (new >= 0) & ((cur < 0) | (new < cur))
+                    cur[mask] = new[mask]
+            if table[0, numIon] < 0:
+                return
+            min_wps.append(table)
+
+        # minimum number of wps needed by the remaining species
+        min_rest = [sum(min_wps[k][0, numIons[k]] for k in range(i + 1, len(numIons))) for i in range(len(numIons))]
+        if max_wp is not None and min_rest[0] + min_wps[0][0, numIons[0]] > max_wp:
+            return
+
+        used = [False] * N_basis
+        counts = np.zeros([len(numIons), N_basis], dtype=int)
+
+        def search(i, j, remain, N_wp):
+            if j == N_basis:
+                if i == len(numIons) - 1:
+                    if min_wp is None or N_wp >= min_wp:
+                        yield
                 else:
-                    has_freedom.append(False)
-
-        return combinations, has_freedom, indices
+                    yield from search(i + 1, 0, numIons[i + 1], N_wp)
+                return
+
+            c_max = maxs[i][j] if freedoms[j] else int(not used[j])
+            for c in range(min(c_max, remain // basis[j]) + 1):
+                rest = min_wps[i][j + 1, remain - c * basis[j]]
+                if rest < 0:
+                    continue
+                if max_wp is not None and N_wp + c + rest + min_rest[i] > max_wp:
+                    continue
+                counts[i, j] = c
+                if not freedoms[j] and c > 0:
+                    used[j] = True
+                yield from search(i, j + 1, remain - c * basis[j], N_wp + c)
+                if not freedoms[j] and c > 0:
+                    used[j] = False
+            counts[i, j] = 0
+
+        for _ in search(0, 0, numIons[0], 0):
+            combination = []
+            wp_ids = []
+            for i in range(len(numIons)):
+                combination.append([labels[j] for j in range(N_basis) for _ in range(counts[i, j])])
+                wp_ids.append([ids[j] for j in range(N_basis) for _ in range(counts[i, j])])
+            has_freedom = any(freedoms[j] for j in range(N_basis) if counts[:, j].sum() > 0)
+            yield combination, has_freedom, wp_ids
 
     def get_spg_symmetry_object(self):
         """
@@ -1349,6 +1328,21 @@ class Group:
             Compatible: True/False
             has_freedom: True/False
         """
+        # the molecular orientations are not hashable, only cache the atomic case
+        if valid_orientations is None:
+            key = (self.dim, self.number, self.hall_number, tuple(int(n) for n in numIons))
+            if key not in _compatible_cache:
+                if len(_compatible_cache) >= _compatible_cache_size:
+                    _compatible_cache.pop(next(iter(_compatible_cache)))
+                _compatible_cache[key] = self._check_compatible(numIons)
+            return _compatible_cache[key]
+        else:
+            return self._check_compatible(numIons, valid_orientations)
+
+    def _check_compatible(self, numIons, valid_orientations=None):
+        """
+        Search a valid combination of WP's for `check_compatible`
+        """
         has_freedom = False  # whether or not one degree of freedom exists
         used_indices = []  # wp's already used that don't have any freedom
 
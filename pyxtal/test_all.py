@@ -16,6 +16,8 @@ from pyxtal import pyxtal
 from pyxtal.lattice import Lattice
 from pyxtal.molecule import pyxtal_molecule
 from pyxtal.operations import get_inverse
+from pyxtal.optimize.screen import Screener
+from pyxtal.representation import representation_atom, representation_batch
 from pyxtal.supergroup import supergroup, supergroups
 from pyxtal.symmetry import Group, Hall, Wyckoff_position, get_wyckoffs
 from pyxtal.util import generate_wp_lib
@@ -48,6 +50,15 @@ class TestGroup(unittest.TestCase):
         assert len(a1) == 0
         a2, _, _ = g.list_wyckoff_combinations([4, 8], quick=False)
         assert len(a2) == 8
+        a3, _, _ = g.list_wyckoff_combinations([4, 8], quick=True)
+        assert len(a3) == 4
+        # large solution space without truncation
+        g = Group(191)
+        gen = g.iter_wyckoff_combinations([24])
+        assert next(gen)[0] == [["2e"] * 9 + ["2d", "2c", "1b", "1a"]]
+        a4, _, _ = g.list_wyckoff_combinations([24], numWp=(None, 4))
+        assert len(a4) == 225
+        assert max(len(a[0]) for a in a4) == 4
 
     def test_print_group_and_dof(self):
         for d in [(1, 6), (15, 4), (60, 3), (143, 2), (208, 1)]:
@@ -96,6 +107,7 @@ class TestGroup(unittest.TestCase):
         assert Group(227).check_compatible([8]) == (True, False)
         assert Group(227).check_compatible([4]) == (False, False)
         assert Group(19).check_compatible([6]) == (False, False)
+        assert Group(225).check_compatible([64, 28, 24]) == (True, True)
 
     def test_search_supergroup_paths(self):
         paths = Group(59, quick=True).search_supergroup_paths(139, 2)
@@ -314,7 +326,13 @@ class TestSupergroup(unittest.TestCase):
             s2.from_seed(cif_path + cif2 + ".cif")
             pmg_s2 = s2.to_pymatgen()
 
-            strucs, _, _, _, _ = s2.get_transition(s1)
+            strucs, _, _, path, _ = s2.get_transition(s1)
+            res = s2.get_transition(s1, ncpu=2)
+            # the same path is chosen in parallel
+            assert res[3] == path
+            if strucs is not None:
+                assert res[0] is not None
+                assert abs(res[0][-1].disp - strucs[-1].disp) < 1e-6
 
             if strucs is None:
                 print("Problem between ", cif1, cif2)
@@ -697,6 +715,53 @@ class TestMolecule(unittest.TestCase):
         assert len(m.get_orientations_in_wp(g[1])) == 1
         assert len(m.get_orientations_in_wp(g[2])) == 1
 
+    def test_symmetry_cache(self):
+        from scipy.spatial.transform import Rotation
+
+        from pyxtal.molecule import symmetry_cache
+
+        m1 = pyxtal_molecule("H2O")
+        g = Group(191)
+        oris = [len(m1.get_orientations_in_wp(wp)) for wp in g]
+
+        # the same molecule in a different orientation
+        rot = Rotation.from_euler("zxy", [30, 50, 70], degrees=True).as_matrix()
+        mol = Molecule(m1.mol.species, m1.mol.cart_coords.dot(rot.T))
+        hits = symmetry_cache.hits
+        m2 = pyxtal_molecule(mol)
+        assert symmetry_cache.hits > hits
+        assert m2.pg.symbol == m1.pg.symbol
+        assert all(m2.pga.is_valid_op(op) for op in m2.symops)
+        assert oris == [len(m2.get_orientations_in_wp(wp)) for wp in g]
+
+    def test_collection(self):
+        import tempfile
+
+        import pytest
+
+        from pyxtal.database.collection import Collection
+
+        c = Collection("molecules")
+        m1 = c["nh3"]
+        m1.translate_sites(indices=[0], vector=[1, 0, 0])
+        assert c["NH3"] != m1
+        # an unknown name should not return the previous molecule
+        with pytest.raises(NameError):
+            pyxtal_molecule("CO2")
+
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "molecules.npz")
+            c.to_npz(filename)
+            c2 = Collection("molecules", filename=filename)
+            assert list(c2) == list(c)
+            assert np.allclose(c2["aspirin"].cart_coords, c["aspirin"].cart_coords)
+
+            # the rewritten file should be reloaded
+            c3 = Collection("clusters")
+            c3.to_npz(filename)
+            assert list(c2) == [str(name) for name in c3]
+            assert "aspirin" not in c2
+
 
 class TestMolecular(unittest.TestCase):
     def test_single_specie(self):
@@ -752,6 +817,139 @@ class TestMolecular(unittest.TestCase):
         pmg_s2 = C.to_pymatgen()
         assert sm.StructureMatcher().fit(pmg_struc, pmg_s2)
 
+    def test_search_molecules(self):
+        from pyxtal.io import search_molecules_in_crystal
+
+        pmg = Structure.from_file(cif_path + "resorcinol.cif")
+        mols = search_molecules_in_crystal(pmg, tol=0.2)
+        assert len(mols) == 8
+        for mol in mols:
+            assert mol.composition.formula == "H6 C6 O2"
+            # the molecule must be unwrapped across the cell boundary
+            assert np.ptp(mol.cart_coords, axis=0).max() < 7.0
+        mols = search_molecules_in_crystal(pmg, tol=0.2, once=True)
+        assert len(mols) == 1
+
+    def test_coords_cache(self):
+        c = pyxtal(molecular=True)
+        c.from_seed(seed=cif_path + "aspirin.cif", molecules=["aspirin"])
+        site = c.mol_sites[0]
+        xyz1, species = site._get_coords_and_species(absolute=True)
+        assert len(xyz1) == len(species) == site.wp.multiplicity * len(site.numbers)
+        # the first molecule
+        xyz0, _ = site._get_coords_and_species(absolute=True, first=True)
+        assert np.allclose(xyz0, xyz1[: len(site.numbers)])
+        # the cached result must not be modified by the caller
+        xyz1 += 1.0
+        xyz2, _ = site._get_coords_and_species(absolute=True)
+        assert np.allclose(xyz1 - 1.0, xyz2)
+        # update the cache after the site is changed
+        site.translate([0.1, 0, 0], absolute=True)
+        xyz3, _ = site._get_coords_and_species(absolute=True)
+        assert np.allclose(xyz3[: len(site.numbers)] - xyz0, [0.1, 0, 0])
+
+    def test_block_batch(self):
+        from pyxtal.block_crystal import _block_cache, block_crystals
+
+        smiles = [
+            "C1=C(C=C(C=C1[N+](=O)[O-])[N+](=O)[O-])C(=O)O.smi",
+            "CC1=CC2=C(C=C1)N3CC4=C(C=CC(=C4)C)N(C2)C3.smi",
+        ]
+        xtals = block_crystals(3, 14, smiles, "xxv")
+        assert len(xtals) == 3
+        assert len(_block_cache) > 0
+        for xtal in xtals:
+            assert xtal.valid
+            assert len(xtal.mol_sites) == 2
+        # each crystal owns its molecules
+        assert xtals[0].molecules[0] is not xtals[1].molecules[0]
+
+    def test_charmm_read(self):
+        import sys
+        import tempfile
+
+        from pyxtal.interface.charmm import CHARMM, copy_ff_files
+
+        c = pyxtal(molecular=True)
+        c.from_seed(seed=cif_path + "aspirin.cif", molecules=["aspirin"])
+        log = [
+            "\n",
+            "\n",
+            "  Chemistry at HARvard Macromolecular Mechanics\n",
+            "MINI>      100   -120.12345      0.00000      0.12345\n",
+            "                    $$$$$ JOB ACCOUNTING INFORMATION $$$$$\n",
+            "                     ELAPSED TIME:     1.50  SECONDS\n",
+            "                         CPU TIME:     1.20  SECONDS\n",
+        ]
+        cell = "REMARK CELL :  11.0  6.5  11.2  90.0  95.0  90.0\n"
+        with tempfile.TemporaryDirectory() as d:
+            # the executable is not called in read
+            calc = CHARMM(c, folder=d, exe=sys.executable)
+            with open(calc.get_path(calc.dump), "w") as f:
+                f.writelines(["REMARK ENERGY(KCAL): -120.1\n", cell])
+            # the trailing message from stderr does not hide a finished run
+            for lines, optimized in [(log, True), (log[:-1], False), ([*log, "warning\n"], True)]:
+                with open(calc.get_path(calc.output), "w") as f:
+                    f.writelines(lines)
+                calc.read()
+                assert calc.optimized == optimized
+            assert calc.structure.iter == 100
+            assert calc.cputime == 1.5
+            assert abs(calc.structure.lattice.a - 11.0) < 1e-6
+
+            # refresh the force field file if the scratch copy is replaced
+            scratch = os.path.join(d, "scratch")
+            os.makedirs(scratch)
+            with open(os.path.join(d, "pyxtal.prm"), "w") as f:
+                f.write("prm\n")
+            copy_ff_files(d, scratch, ["pyxtal.prm"])
+            with open(os.path.join(scratch, "pyxtal.prm"), "w") as f:
+                f.write("other prm\n")
+            copy_ff_files(d, scratch, ["pyxtal.prm"])
+            with open(os.path.join(scratch, "pyxtal.prm")) as f:
+                assert f.read() == "prm\n"
+
+    def test_ani_relax_batch(self):
+        import pytest
+
+        pytest.importorskip("torchani")
+        from ase.build import bulk
+
+        from pyxtal.interface.ani import ANI_relax_batch
+
+        c = pyxtal(molecular=True)
+        c.from_seed(seed=cif_path + "resorcinol.cif", molecules=["resorcinol"])
+        # Si is not supported by ANI and should not stop the batch
+        strucs = [c.to_ase(), bulk("Si", "diamond", a=5.43), c.to_ase()]
+        results = ANI_relax_batch(strucs, step=5)
+        assert len(results) == 3
+        assert results[1]["error"] is not None
+        for res in [results[0], results[2]]:
+            assert res["error"] is None
+            assert abs(res["energy"] - results[0]["energy"]) < 1e-6
+
+    def test_planes(self):
+        from pyxtal.plane import planes, search_close_packing_planes
+
+        xtals = []
+        for name in ["aspirin", "resorcinol"]:
+            c = pyxtal(molecular=True)
+            c.from_seed(seed=cif_path + name + ".cif", molecules=[name])
+            xtals.append(c)
+        p = planes()
+        p.set_xtal(xtals[0])
+        cp_planes = p.search_close_packing_planes()
+        assert len(cp_planes) > 0
+        for hkl, _, _ in cp_planes:
+            F = np.abs(p.get_structure_factor(hkl))
+            assert len(p.atoms) * p.cp_factor - 1e-8 <= F
+
+        results = search_close_packing_planes(xtals, ncpu=2)
+        assert len(results) == 2
+        for plane1, plane2 in zip(cp_planes, results[0]):
+            assert np.allclose(plane1[0], plane2[0])
+            assert np.allclose(plane1[2], plane2[2])
+
     def test_big_molecule(self):
         # print("test_big_molecule")
         for mol in ["ROY", "aspirin"]:
@@ -911,6 +1109,130 @@ class TestAtomic3D(unittest.TestCase):
                 pmg_struc = struc.to_pymatgen()
                 assert sm.StructureMatcher().fit(pmg_struc, pmg1)
 
+    def test_from_seeds(self):
+        names = ["FAU", "NaSb3F10", "PVO", "lt_quartz", "Fd3"]
+        cif_files = [cif_path + name + ".cif" for name in names]
+        xtals = pyxtal.from_seeds(cif_files + cif_files[:1])
+        for cif_file, xtal in zip(cif_files, xtals):
+            struc = pyxtal()
+            struc.from_seed(seed=cif_file)
+            assert str(struc) == str(xtal)
+        assert str(xtals[0]) == str(xtals[-1])
+
+        pmg1 = Structure.from_file(cif_path + "aspirin.cif", primitive=True)
+        struc = pyxtal()
+        for hn in Hall(14).hall_numbers:
+            struc.from_seed(pmg1, backend="spglib", hn=hn)
+            assert struc.group.hall_number == hn
+            assert sm.StructureMatcher().fit(struc.to_pymatgen(), pmg1)
+
+    def test_validity(self):
+        l1 = Lattice.from_para(2.46, 2.46, 6.70, 90, 90, 120)
+        l2 = Lattice.from_para(3.567, 3.567, 3.567, 90, 90, 90)
+        graphite, diamond = pyxtal(), pyxtal()
+        graphite.build(191, ["C"], [2], lattice=l1, sites=[[("2c", 1 / 3, 2 / 3, 0)]])
+        diamond.build(227, ["C"], [8], lattice=l2, sites=[[("8a", 1 / 8, 1 / 8, 1 / 8)]])
+        criteria = {"CN": {"C": [3]}, "cutoff": 1.8, "Dimension": 2}
+        assert graphite.check_validity(criteria)
+        assert not diamond.check_validity(criteria)
+        assert diamond.get_dimensionality(1.8) == 3
+        criteria = {"CN": {"C": [4]}, "cutoff": 1.8, "Dimension": 3}
+        assert diamond.check_validity(criteria)
+
+        # the neighbor list is only rebuilt when the structure changes
+        cache = diamond._neighbor_cache
+        diamond.set_site_coordination(1.6)
+        assert diamond._neighbor_cache is cache
+        diamond.lattice = diamond.lattice.scale(1.2)
+        diamond.set_site_coordination(1.8)
+        assert diamond._neighbor_cache is not cache
+        assert diamond.atom_sites[0].coordination == 0
+
+    def test_gulp_update(self):
+        import tempfile
+
+        from pyxtal.interface.gulp import GULP
+
+        struc = pyxtal()
+        struc.from_random(3, 191, ["C", "O"], [6, 12])
+        with tempfile.TemporaryDirectory() as path:
+            # mimic the relaxed coordinates from a nosymmetry run
+            calc = GULP(struc.copy(), path=path)
+            calc.frac_coords += 1e-4
+            assert calc.update_pyxtal()
+            assert [s.wp.letter for s in calc.pyxtal.atom_sites] == [s.wp.letter for s in struc.atom_sites]
+            assert calc.to_pyxtal() is calc.pyxtal
+
+            # broken symmetry
+            calc = GULP(struc.copy(), path=path)
+            calc.frac_coords[0] += 0.05
+            assert not calc.update_pyxtal()
+            assert calc.to_pyxtal().group.number < 191
+
+    def test_cif_reader(self):
+        import tempfile
+
+        from pyxtal.io import cif_reader
+
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "test.cif")
+            xtals = []
+            for sg in [14, 62, 191, 227]:
+                struc = pyxtal()
+                struc.from_random(3, sg, ["C"], [12] if sg == 191 else [8])
+                struc.to_file(filename, header=str(sg), permission="a+")
+                xtals.append(struc)
+
+            for xtal, record in zip(xtals, cif_reader(filename)):
+                struc = record.to_pyxtal()
+                assert struc.group.number == xtal.group.number
+                assert sm.StructureMatcher().fit(struc.to_pymatgen(), xtal.to_pymatgen())
+
+            reader = cif_reader(filename, index=True)
+            assert len(reader) == 4
+            assert os.path.exists(filename + ".idx")
+            xtals[0].to_file(filename, header="new", permission="a+")
+            reader = cif_reader(filename, index=True)
+            assert len(reader) == 5
+            assert reader[2].spg == 191
+            assert reader[-1].header == "new"
+
+    def test_write_cifs(self):
+        import tempfile
+
+        from pyxtal.io import cif_reader, write_cifs
+
+        xtals = []
+        for sg in [14, 62, 227]:
+            struc = pyxtal()
+            struc.from_random(3, sg, ["C"], [8])
+            xtals.append(struc)
+        cifs = write_cifs(xtals)
+        assert cifs == [xtal.to_file(header=str(i)) for i, xtal in enumerate(xtals)]
+
+        folder = tempfile.mkdtemp()
+        filename = os.path.join(folder, "all.cif")
+        write_cifs(xtals, filename=filename, chunksize=2)
+        assert [record.spg for record in cif_reader(filename)] == [14, 62, 227]
+        write_cifs(xtals, folder=folder, headers=["a", "b", "c"])
+        assert os.path.exists(os.path.join(folder, "c.cif"))
+
+    def test_elastic_batch(self):
+        from ase.build import bulk
+        from ase.calculators.emt import EMT
+
+        from pyxtal.elasticity import fit_elastic_constants_batch
+
+        atoms = [bulk("Cu", "fcc", a=3.6, cubic=True), bulk("Al", "fcc", a=4.05, cubic=True)]
+        Cs1 = fit_elastic_constants_batch(atoms, EMT, [225, "triclinic"])
+        Cs2 = fit_elastic_constants_batch(atoms, EMT, [225, "triclinic"], ncpu=2)
+        for (C1, _), (C2, _) in zip(Cs1, Cs2):
+            assert np.abs(C1 - C2).max() < 1e-6
+        C0, C1 = Cs1[0][0], Cs1[1][0]
+        assert abs(C0[0, 0] - C0[2, 2]) < 1e-6
+        assert abs(C1[0, 0] - C1[2, 2]) < 1e-1
+        assert C0[0, 0] > C0[0, 1] > 0
+
 
 class TestAtomic2D(unittest.TestCase):
     def test_single_specie(self):
@@ -991,6 +1313,25 @@ class TestLattice(unittest.TestCase):
         l7 = l7.transform_multi(trans)
         assert np.abs(l7.matrix - l6.matrix).sum() < 0.25
 
+    def test_search_transformations(self):
+        from pyxtal.lattice import get_cell_paras, matrix2para
+
+        l1 = Lattice.from_para(4.08, 9.13, 5.50, 85.0, 100.0, 95.0, ltype="triclinic")
+        trans, paras, valid = l1.get_candidate_transformations()
+        assert len(trans) == len(paras) == 4 * 16
+        for (tran1, tran2), para, v in zip(trans, paras, valid):
+            if v:
+                lat = l1.transform(tran1).transform(tran2)
+                assert np.allclose(lat.get_para(degree=True), para)
+        ms = np.array([l1.matrix, l1.matrix[::-1]])
+        assert np.allclose(get_cell_paras(ms)[1], matrix2para(l1.matrix[::-1]))
+
+        # the matched transformations restore the reference cell
+        l2 = l1.transform([[1, 0, 1], [0, 1, 0], [0, 0, 1]])
+        trans, tols = l2.search_transformations(l1)
+        assert len(trans) > 0
+        assert min(tol[0] for tol in tols) < 1e-3
+
     def test_is_valid_lattice(self):
         l8 = Lattice.from_para(3.454, 3.401, 5.908, 90.00, 105.80, 91.00, ltype="monoclinic")
         l9 = Lattice.from_para(3.454, 3.401, 5.908, 90.00, 105.80, 90.00, ltype="monoclinic")
@@ -1005,6 +1346,39 @@ class TestLattice(unittest.TestCase):
         assert abs(lat.c - 6.11) < 0.001
         assert abs(lat.gamma - 2 / 3 * np.pi) < 0.001
 
+    def test_generate_cellparas(self):
+        from pyxtal.lattice import check_cellparas, generate_cellparas, generate_cellparas_2D, para2matrix
+
+        for ltype in ["triclinic", "monoclinic", "hexagonal"]:
+            paras = generate_cellparas(ltype, 100.0, 50, min_l=3.0)
+            assert len(paras) > 0
+            assert check_cellparas(paras, min_l=3.0).all()
+            assert np.allclose([np.linalg.det(para2matrix(p)) for p in paras], 100.0)
+        paras = generate_cellparas_2D("orthorhombic", 100.0, 50, thickness=4.0)
+        assert np.allclose(paras[:, 2], 4.0)
+        l0 = Lattice("tetragonal", 100.0)
+        for _ in range(5):
+            l0.reset_matrix()
+            assert abs(l0.get_para()[0] - l0.get_para()[1]) < 1e-6
+
+    def test_generate_cellpara(self):
+        from pyxtal.lattice import check_cellpara, generate_cellpara, generate_cellpara_2D, random_vector
+
+        # the scalar sampler returns the first valid draw without a batch
+        np.random.seed(0)
+        para = generate_cellpara("orthorhombic", 100.0)
+        np.random.seed(0)
+        vec = random_vector()
+        assert np.allclose(para[:3], vec * np.cbrt(100.0 / np.prod(vec)))
+
+        # a narrow window rejects most draws, the rest are drawn in batch
+        kwargs = {"min_l": 2.0, "mid_l": 4.0, "max_l": 7.0}
+        for _ in range(10):
+            para = generate_cellpara("orthorhombic", 100.0, **kwargs)
+            assert check_cellpara(para, **kwargs)
+            para = generate_cellpara_2D("orthorhombic", 100.0, thickness=8.0, **kwargs)
+            assert check_cellpara(para, **kwargs)
+
 
 class TestSymmetry(unittest.TestCase):
     def test_from_symops_wo_grou(self):
@@ -1072,6 +1446,149 @@ class TestNeighbour(unittest.TestCase):
             assert len(ds) == CN
 
 
+class TestScreener(unittest.TestCase):
+    def test_check(self):
+        s = Screener()
+        c = pyxtal(molecular=True)
+        for name in ["aspirin", "coumarin", "resorcinol", "PAHYON01"]:
+            c.from_seed(seed=cif_path + name + ".cif", molecules=[name])
+            passed, scores = s.check(c)
+            assert passed
+            assert 0.6 < scores["packing"] < 0.8
+
+        # compress the cell to create overlaps
+        c.lattice = Lattice.from_matrix(c.lattice.matrix * 0.85, ltype=c.lattice.ltype)
+        for site in c.mol_sites:
+            site.lattice = c.lattice
+        passed, _ = s.check(c)
+        assert not passed
+        assert s.N_total == 5
+        assert s.N_pass == 4
+
+        # collect the statistics from the parallel workers
+        s0 = Screener()
+        s0.merge_stats(s.get_stats())
+        s0.merge_stats(s.get_stats())
+        assert s0.N_total == 10
+        assert s0.rejections == {k: 2 * v for k, v in s.rejections.items()}
+
+
+class TestGlobalOptimize(unittest.TestCase):
+    def test_apply_gaussian(self):
+        import pytest
+
+        pytest.importorskip("ost")
+        from pyxtal.optimize.base import GlobalOptimize
+
+        def brute_force(reps, engs, best_reps, h1=0.1, h2=0.1, w1=0.2, w2=3):
+            def get_tors(rep):
+                tor = [t for v in rep[1:] if len(v) >= 8 for t in v[7:-1]]
+                return np.array(tor + [0.0] * (go.N_torsion - len(tor)))
+
+            engs_gau = np.array(engs, dtype=float)
+            for i, rep in enumerate(reps):
+                if rep is None or engs[i] >= 9999:
+                    continue
+                for ref in best_reps:
+                    if rep[0][0] == ref[0][0]:
+                        diff1 = np.sum((np.array(rep[0][1:]) - np.array(ref[0][1:])) ** 2) / w1**2
+                        engs_gau[i] += h1 * np.exp(-0.5 * diff1)
+                    diff2 = (get_tors(rep) - get_tors(ref) + 180.0) % 360.0 - 180.0
+                    engs_gau[i] += h2 * np.exp(-0.5 * np.sum(diff2**2) / w2**2)
+            return engs_gau
+
+        def get_rep(hn, cell, tors):
+            # [wp, x, y, z, ori, rotors, reflect] with and without rotors, and a Cl- ion
+            site1 = [0, 0.1, 0.2, 0.3, 10.0, 20.0, 30.0, *tors, 0]
+            site2 = [0, 0.5, 0.5, 0.5, 10.0, 20.0, 30.0, 0]
+            return [[hn, *cell], site1, site2, [1, 0.0, 0.0, 0.0, 0]]
+
+        go = GlobalOptimize.__new__(GlobalOptimize)
+        go.N_torsion = 2
+        go.best_reps = [
+            get_rep(14, [5.0, 6.0, 7.0, 1.7], [179.0, 60.0]),
+            get_rep(4, [5.1, 6.0, 7.0, 1.7], [-90.0, 10.0]),
+        ]
+        reps = [
+            get_rep(14, [5.1, 6.0, 7.1, 1.7], [-179.0, 61.0]),
+            get_rep(4, [5.1, 6.1, 7.0, 1.7], [-92.0, 12.0]),
+            get_rep(14, [5.0, 6.0, 7.0, 1.7], [0.0, 0.0]),
+            None,
+            get_rep(4, [5.1, 6.0, 7.0, 1.7], [-90.0, 10.0]),
+        ]
+        engs = [1.0, 2.0, 3.0, 4.0, 9999]
+        engs_gau = go._apply_gaussian(reps, engs)
+        assert np.allclose(engs_gau, brute_force(reps, engs, go.best_reps))
+        # the torsions across +-180 are close
+        assert engs_gau[0] - engs[0] > 0.1
+        assert engs_gau[3] == 4.0
+        assert engs_gau[4] == 9999
+
+        # the reference arrays are updated as the history grows
+        go.best_reps.append(get_rep(4, [5.1, 6.1, 7.0, 1.7], [-92.0, 12.0]))
+        engs_gau = go._apply_gaussian(reps, engs)
+        assert np.allclose(engs_gau, brute_force(reps, engs, go.best_reps))
+        go.best_reps = go.best_reps[:1]
+        engs_gau = go._apply_gaussian(reps, engs)
+        assert np.allclose(engs_gau, brute_force(reps, engs, go.best_reps))
+
+
+class TestVasprun(unittest.TestCase):
+    def test_stream(self):
+        import tempfile
+
+        from pyxtal.interface.vasprun import read_vasprun_folder, vasprun_stream
+
+        def structure(a, name=None):
+            tag = "<structure>" if name is None else f'<structure name="{name}">'
+            basis = "".join(f"<v>{a * (i == 0):.1f} {a * (i == 1):.1f} {a * (i == 2):.1f}</v>" for i in range(3))
+            pos = "<v>0.0 0.0 0.0</v><v>0.5 0.5 0.5</v>"
+            cell = f'<crystal><varray name="basis">{basis}</varray></crystal>'
+            return f'{tag}{cell}<varray name="positions">{pos}</varray></structure>'
+
+        xml = '<?xml version="1.0"?><modeling><incar><i name="NSW">3</i></incar>'
+        atom = "<rc><c>Si</c><c>1</c></rc>"
+        xml += f'<atominfo><array name="atoms"><set>{atom}{atom}</set></array></atominfo>'
+        xml += structure(4.0, "initialpos")
+        for i in range(3):
+            xml += "<calculation>"
+            xml += '<scstep><energy><i name="e_fr_energy">0.0</i></energy></scstep>' * (i + 1)
+            xml += structure(4.0 + 0.1 * i)
+            xml += f'<varray name="forces"><v>{i}.0 0.0 0.0</v><v>-{i}.0 0.0 0.0</v></varray>'
+            xml += '<varray name="stress"><v>1.0 0.0 0.0</v><v>0.0 1.0 0.0</v><v>0.0 0.0 1.0</v></varray>'
+            xml += f'<energy><i name="e_fr_energy">{-10.0 - i}</i></energy>'
+            xml += '<dos><i name="efermi">5.0</i><total><array><set><set><r>0 0 0</r></set></set></array></total></dos>'
+            xml += "</calculation>"
+        end = structure(4.2, "finalpos") + "</modeling>"
+
+        with tempfile.TemporaryDirectory() as d:
+            for sub in ["a", "b"]:
+                os.makedirs(os.path.join(d, sub))
+                with open(os.path.join(d, sub, "vasprun.xml"), "w") as f:
+                    f.write(xml + end if sub == "a" else xml[:-200])
+
+            fields = ["energy", "forces", "finalpos", "efermi", "scf", "trajectory"]
+            run = vasprun_stream(os.path.join(d, "a", "vasprun.xml"), fields)
+            assert not run.error
+            vals = run.values
+            calc = vals["calculation"]
+            assert calc["energy"] == -12.0
+            assert calc["energy_per_atom"] == -6.0
+            assert calc["efermi"] == 5.0
+            assert calc["scf"] == [1, 2, 3]
+            assert "stress" not in calc
+            assert np.allclose(calc["force"], [[2, 0, 0], [-2, 0, 0]])
+            assert np.allclose(vals["finalpos"]["basis"], 4.2 * np.eye(3))
+            assert vals["trajectory"]["positions"].shape == (3, 2, 3)
+
+            # truncated file keeps the completed steps
+            runs = read_vasprun_folder(d, fields)
+            run = runs[os.path.join(d, "b", "vasprun.xml")]
+            vals = run.values
+            assert run.error
+            assert len(vals["trajectory"]["energy"]) == 2
+
+
 class TestSubgroup(unittest.TestCase):
     def test_cubic_cubic(self):
         sites = ["8a", "32e"]
@@ -1096,6 +1613,24 @@ class TestSubgroup(unittest.TestCase):
 
         C1.subgroup(perms={"C": "Si"}, H=216)
 
+    def test_generator(self):
+        from pyxtal.wyckoff_split import get_wyckoff_split
+
+        C1 = pyxtal()
+        C1.from_random(3, 227, ["C"], [8], sites=[["8a"]])
+        C2s = C1.subgroup(eps=0, idx=[0, 1, 2])
+        C3s = list(C1.subgroup_generator(eps=0, idx=[0, 1, 2]))
+        C4s = C1.subgroup(eps=0, idx=[0, 1, 2], ncpu=2)
+        assert len(C2s) == len(C3s)
+        assert len(C2s) == len(C4s)
+        for C2, C3, C4 in zip(C2s, C3s, C4s):
+            assert C2.group.number == C3.group.number
+            assert C2.group.number == C4.group.number
+
+        s1 = get_wyckoff_split(227, 0, ["8a"])
+        s2 = get_wyckoff_split(227, 0, ["8a"])
+        assert s1 is s2
+
     def test_from_seed(self):
         coords = [[0, 0, 0], [0.75, 0.5, 0.75]]
         lattice = pmg_Lattice.from_parameters(a=3.84, b=3.84, c=3.84, alpha=120, beta=90, gamma=60)
@@ -1190,6 +1725,100 @@ class TestLoad(unittest.TestCase):
         pmg_s2 = s2.to_pymatgen()
         assert sm.StructureMatcher().fit(pmg_s1, pmg_s2)
 
+    def test_batch_rep(self):
+        import tempfile
+
+        reps = []
+        for sg in [36, 194, 225]:
+            s = pyxtal()
+            s.from_random(3, sg, ["C", "Si"], [4, 8])
+            reps.append(representation_atom.from_pyxtal(s))
+        batch = representation_batch.from_reps(reps, engs=[-1.0, -2.0, -3.0])
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "pop.npz")
+            batch.save(filename)
+            batch = representation_batch.load(filename)
+        assert batch.xtals["energy"][1] == -2.0
+        for rep1, rep2 in zip(reps, batch.to_reps()):
+            assert rep1.to_string() == rep2.to_string()
+        for rep, s in zip(reps, batch.to_pyxtals()):
+            pmg_s1 = rep.to_pyxtal().to_pymatgen()
+            assert sm.StructureMatcher().fit(pmg_s1, s.to_pymatgen())
+
+    def test_batch_rep_molecular(self):
+        import tempfile
+
+        reps, strucs = [], []
+        for name, smi in [("aspirin", "CC(=O)Oc1ccccc1C(O)=O"), ("resorcinol", "Oc1cccc(O)c1")]:
+            s = pyxtal(molecular=True)
+            s.from_seed(seed=cif_path + name + ".cif", molecules=[smi + ".smi"])
+            reps.append(s.get_1D_representation())
+            strucs.append(s)
+        batch = representation_batch.from_reps(reps, engs=[-1.0, -2.0])
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "pop.npz")
+            batch.save(filename)
+            batch = representation_batch.load(filename)
+        assert batch.molecular
+        for rep1, rep2 in zip(reps, batch.to_reps()):
+            assert rep1.to_string() == rep2.to_string()
+        for s1, s2 in zip(strucs, batch.to_pyxtals()):
+            assert len(s1.mol_sites) == len(s2.mol_sites)
+            assert sm.StructureMatcher().fit(s1.to_pymatgen(), s2.to_pymatgen())
+
+    def test_csd_cache(self):
+        import shutil
+        import tempfile
+        from concurrent.futures import ThreadPoolExecutor
+
+        import pytest
+
+        from pyxtal.database.cache import CSD_cache
+
+        with tempfile.TemporaryDirectory() as d:
+            for name in ["ACBNZA01", "aspirin"]:
+                shutil.copy(cif_path + name + ".cif", d)
+            cache = CSD_cache(os.path.join(d, "cache"))
+            smi = "CC(=O)Nc1ccccc1C(N)=O"
+            smiles = {"ACBNZA01": smi + "." + smi, "aspirin": "CC(=O)Oc1ccccc1C(O)=O"}
+            codes = cache.import_cifs(d, smiles, parse=False)
+            assert sorted(codes) == ["ACBNZA01", "aspirin"]
+            assert cache.get("ACBNZA01")["ccdc_number"] == 1100480
+
+            # parse the cached cif at the first call and reuse it later
+            s1 = pyxtal(molecular=True)
+            s1.from_CSD("ACBNZA01", cache=cache.folder)
+            assert cache.get("ACBNZA01")["xtal"] is not None
+            s2 = pyxtal(molecular=True)
+            s2.from_CSD("ACBNZA01", cache=cache)
+            assert s2.tag["csd_code"] == "ACBNZA01"
+            assert s1.tag["smiles"] == s2.tag["smiles"] == smi
+            assert s2.group.number == 14
+            assert sm.StructureMatcher().fit(s1.to_pymatgen(), s2.to_pymatgen())
+
+            # a failed write to the cache should not stop the parsing
+            cache2 = CSD_cache(os.path.join(d, "cache2"))
+            cache2.import_cifs(d, smiles, parse=False)
+
+            def put(*args):
+                raise OSError("read-only")
+
+            cache2.put = put
+            s3 = pyxtal(molecular=True)
+            s3.from_CSD("ACBNZA01", cache=cache2)
+            assert s3.group.number == 14
+            assert cache2.get("ACBNZA01")["xtal"] is None
+            with pytest.raises(ValueError, match="smiles"):
+                cache2.import_cifs(d, None)
+
+            # the concurrent writes should keep all entries
+            cache3 = CSD_cache(os.path.join(d, "cache3"))
+            codes = [f"CODE{i:02d}" for i in range(40)]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda code: cache3.put(code, code, "C"), codes))
+            assert sorted(cache3) == codes
+            assert cache3.get("CODE07")["cif"] == "CODE07"
+
 
 class TestPartial(unittest.TestCase):
     def test_Al2SiO5(self):
@@ -2,6 +2,7 @@
 some utilities
 """
 
+import hashlib
 import re
 
 import numpy as np
@@ -133,6 +134,112 @@ def get_symmetrized_pmg(pmg, tol=1e-3, a_tol=5.0, style="pyxtal", hn=None):
     return s.get_symmetrized_structure(), s.get_space_group_number()
 
 
+class SymmetryCache:
+    """
+    A bounded cache to store the spglib results by the structure hash and
+    tolerances, so that the duplicate structures are analyzed only once.
+
+    Args:
+        maxsize: maximum number of entries, the oldest ones are dropped first
+        decimals: number of decimals to round the structure for hashing
+    """
+
+    def __init__(self, maxsize=10000, decimals=4):
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.active = True
+        self.clear()
+
+    def clear(self):
+        self.data = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, lattice, positions, numbers, *args):
+        """
+        Hash the rounded lattice, wrapped positions and numbers, together
+        with the additional arguments (e.g., tol, a_tol, style, hn)
+        """
+        positions = np.array(positions, dtype=float)
+        positions = np.round(positions - np.floor(positions), self.decimals) % 1.0
+        lattice = np.round(np.array(lattice, dtype=float), self.decimals)
+        sha = hashlib.sha1()
+        sha.update((lattice + 0.0).tobytes())
+        sha.update((positions + 0.0).tobytes())
+        sha.update(np.array(numbers, dtype=int).tobytes())
+        sha.update(str(args).encode())
+        return sha.hexdigest()
+
+    def get(self, key):
+        if self.active and key in self.data:
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key, value):
+        if self.active:
+            if len(self.data) >= self.maxsize:
+                self.data.pop(next(iter(self.data)))
+            self.data[key] = value
+
+
+symmetry_cache = SymmetryCache()
+
+
+def get_symmetry_sites(lattice, positions, numbers, tol=1e-3, a_tol=5.0, style="pyxtal", hn=None):
+    """
+    A lean symmetry analysis that calls spglib on the raw arrays and maps
+    the atoms of the standardized cell to the Wyckoff letters directly,
+    without the pymatgen Structure/SymmetrizedStructure round trips.
+    The results are stored in `symmetry_cache`.
+
+    Args:
+        lattice: 3*3 matrix
+        positions: N*3 fractional coordinates
+        numbers: N atomic numbers
+        tol: symmetry tolerance
+        a_tol: angle tolerance
+        style: 'pyxtal' or spglib, differing in the choice of origin
+        hn: hall_number
+
+    Returns:
+        number: space group number
+        hn: hall_number
+        matrix: the standardized lattice matrix
+        sites: list of (atomic number, wyckoff letter, position) per orbit
+    """
+    key = symmetry_cache.get_key(lattice, positions, numbers, tol, a_tol, style, hn)
+    res = symmetry_cache.get(key)
+    if res is not None:
+        return res
+
+    atoms = (lattice, positions, numbers)
+    dataset = get_symmetry_dataset(atoms, tol, angle_tolerance=a_tol)
+    if hn is None:
+        hn = Hall(dataset.number, style=style).hall_default
+    if hn != dataset.hall_number:
+        dataset = get_symmetry_dataset(atoms, tol, angle_tolerance=a_tol, hall_number=hn)
+
+    # map the atoms in the standardized cell to the input atoms
+    ids = {}
+    for i, p in enumerate(dataset.mapping_to_primitive):
+        ids.setdefault(p, i)
+    sites = []
+    orbits = set()
+    for i, p in enumerate(dataset.std_mapping_to_primitive):
+        j = ids[p]
+        orbit = dataset.equivalent_atoms[j]
+        if orbit not in orbits:
+            orbits.add(orbit)
+            pos = dataset.std_positions[i]
+            sites.append((int(dataset.std_types[i]), dataset.wyckoffs[j], pos))
+
+    res = (dataset.number, hn, dataset.std_lattice, sites)
+    symmetry_cache.set(key, res)
+    return res
+
+
 def extract_ase_db(db_file, id):
     """
     a short cut to extract the structural information
@@ -224,6 +331,14 @@ def parse_cif(filename, header=False, spg=False, eng=False, csd=False, sim=False
         return strings
 
 
+def get_unique_smiles(smi):
+    """
+    remove the duplicate molecules in the smiles string and keep the order,
+    e.g., `CO.O.CO` -> `CO.O`
+    """
+    return ".".join(dict.fromkeys(smi.split(".")))
+
+
 def process_csd_cif(cif, remove_H=False):
     """
     process cif from CSD, sometimes it contains multiple
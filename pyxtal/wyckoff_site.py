@@ -485,10 +485,18 @@ class mol_site:
         return dict0
 
     @classmethod
-    def from_1D_dicts(cls, dicts):
+    def from_1D_dicts(cls, dicts, molecule=None, group=None):
+        """
+        load the site from the 1D representation dictionary
+
+        Args:
+            dicts: dictionary from `to_1D_dicts`
+            molecule: an optional pyxtal_molecule template to copy
+            group: an optional pyxtal.symmetry.Group object to reuse
+        """
         from pyxtal.molecule import Orientation, pyxtal_molecule
 
-        mol = pyxtal_molecule(mol=dicts["smile"] + ".smi", fix=True)
+        mol = pyxtal_molecule(mol=dicts["smile"] + ".smi", fix=True) if molecule is None else molecule.copy()
         if len(mol.mol) > 1:
             if len(dicts["smile"]) > 1:
                 conf = mol.rdkit_mol().GetConformer(0)
@@ -514,10 +522,13 @@ class mol_site:
         g = dicts["hn"]
         index = int(dicts["index"])
         dim = dicts["dim"]
-        wp = Wyckoff_position.from_group_and_index(g, index, dim, dicts["PBC"])
+        wp = Wyckoff_position.from_group_and_index(g, index, dim, dicts["PBC"]) if group is None else group[index]
         lattice = Lattice.from_matrix(dicts["lattice"], ltype=dicts["lattice_type"])
         position = dicts["center"]  # np.dot(dicts["center"], lattice.inv_matrix)
-        position, wp, _ = wp.merge(position, lattice.matrix, 0.01)
+        position, wp, _ = wp.merge(position, lattice.matrix, 0.01, group=group)
+        if group is not None and wp is group[wp.index]:
+            # avoid sharing the merged wp among different sites
+            wp = wp.copy()
 
         return cls(mol, position, orientation, wp, lattice)
 
@@ -529,9 +540,37 @@ class mol_site:
 
         return display_molecular_site(self, id, **kwargs)
 
+    def _get_affine_ops(self):
+        """
+        Stack the wp operations as (n_ops, 4, 4) and the rotations of the
+        wp generators as (n_ops, 3, 3) arrays. The arrays are reused until
+        any operation of the wp is replaced.
+
+        Returns:
+            affine matrices of ops, rotation matrices of generators
+        """
+        if not hasattr(self.wp, "generators"):
+            self.wp.set_generators()
+        ops, gens = self.wp.ops, self.wp.generators
+        cache = getattr(self, "_affine_cache", None)
+        if (
+            cache is None
+            or len(cache[0]) != len(ops)
+            or len(cache[1]) != len(gens)
+            or any(op1 is not op2 for op1, op2 in zip(cache[0], ops))
+            or any(op1 is not op2 for op1, op2 in zip(cache[1], gens))
+        ):
+            affines = np.array([op.affine_matrix for op in ops])
+            rots = np.array([op.rotation_matrix for op in gens[: len(ops)]])
+            self._affine_cache = (list(ops), list(gens), affines, rots)
+        return self._affine_cache[2], self._affine_cache[3]
+
     def _get_coords_and_species(self, absolute=False, PBC=False, first=False, unitcell=False):
         """
-        Used to generate coords and species for get_coords_and_species
+        Used to generate coords and species for get_coords_and_species.
+        The coordinates of all molecules are computed at once, and the result
+        is reused until the position, orientation, lattice, molecule or wp
+        of the site changes.
 
         Args:
             absolute: return absolute or relative coordinates
@@ -543,37 +582,43 @@ class mol_site:
             atomic coords: a numpy array of atomic coordinates in the site
             species: a list of atomic species for the atomic coords
         """
-        coord0 = self.molecule.mol.cart_coords.dot(self.orientation.matrix.T)
-        wp_atomic_sites = []
-        wp_atomic_coords = None
-
-        for point_index, op2 in enumerate(self.wp.ops):
-            # Obtain the center in absolute coords
-            center_relative = op2.operate(self.position)
-            if unitcell:
-                center_relative -= np.floor(center_relative)
-            center_absolute = np.dot(center_relative, self.lattice.matrix)
-
-            # Rotate the molecule (Euclidean metric)
-            # op2_m = self.wp.generators_m[point_index]
-            op2_m = self.wp.get_euclidean_generator(self.lattice.matrix, point_index)
-            rot = op2_m.affine_matrix[:3, :3].T
-            # NOTE=====the euclidean_generator has wrong translation vectors,
-            # but we don't care. This needs to be fixed later
-
-            # if self.diag and self.wp.index > 0:
-            #    tau = op2.translation_vector
-            # else:
-            #    tau = op2_m.translation_vector
-            tmp = np.dot(coord0, rot)  # + tau
-
-            # Add absolute center to molecule
-            tmp += center_absolute
-            tmp = tmp.dot(self.lattice.inv_matrix)
-            wp_atomic_coords = tmp if wp_atomic_coords is None else np.append(wp_atomic_coords, tmp, axis=0)
-            wp_atomic_sites.extend(self.symbols)
-            if first:
-                break
+        affines, rots = self._get_affine_ops()
+        coord0 = self.molecule.mol.cart_coords
+        key = (
+            np.asarray(self.position, dtype=float).tobytes(),
+            self.orientation.matrix.tobytes(),
+            self.lattice.matrix.tobytes(),
+            coord0.tobytes(),
+            id(affines),
+            absolute,
+            PBC,
+            first,
+            unitcell,
+        )
+        cache = getattr(self, "_coords_cache", None)
+        if cache is not None and cache[0] == key:
+            return cache[1].copy(), list(cache[2])
+
+        if first:
+            affines, rots = affines[:1], rots[:1]
+        coord0 = coord0.dot(self.orientation.matrix.T)
+
+        # Obtain the centers in relative coords
+        centers = np.einsum("nij,j->ni", affines[:, :3, :3], self.position) + affines[:, :3, 3]
+        if unitcell:
+            centers -= np.floor(centers)
+
+        # Rotate the molecule (Euclidean metric)
+        # NOTE=====the euclidean_generator has wrong translation vectors,
+        # but we don't care. This needs to be fixed later
+        if self.wp.euclidean:
+            hat = self.lattice.matrix.T
+            rots = np.einsum("ij,njk,kl->nil", hat, rots, np.linalg.inv(hat))
+
+        # Add the rotated molecules to the centers
+        tmp = np.einsum("aj,nij->nai", coord0, rots).dot(self.lattice.inv_matrix)
+        wp_atomic_coords = (tmp + centers[:, None, :]).reshape([-1, 3])
+        wp_atomic_sites = self.symbols * len(affines)
 
         if PBC:
             # Filter PBC of wp_atomic_coords
@@ -590,7 +635,8 @@ class mol_site:
         if absolute:
             wp_atomic_coords = wp_atomic_coords.dot(self.lattice.matrix)
 
-        return wp_atomic_coords, wp_atomic_sites
+        self._coords_cache = (key, wp_atomic_coords, wp_atomic_sites)
+        return wp_atomic_coords.copy(), list(wp_atomic_sites)
 
     def get_coords_and_species(self, absolute=False, PBC=False, unitcell=False):
         """
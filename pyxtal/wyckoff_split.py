@@ -522,6 +522,39 @@ def in_lists(mat1, mat2, eps=1e-2, PBC=True):
         return False
 
 
+# memoized splitters by (hall number, idx, group_type, wp1, elements)
+_split_cache = {}
+_split_cache_size = 2000
+
+
+def get_wyckoff_split(G, idx, wp1, group_type="t", elements=None):
+    """
+    Memoized version of `wyckoff_split`. The same splitter object is returned
+    for the same (hall number of G, idx, group_type, wp1, elements), so it
+    should be treated as read-only. A random idx (None) is not cached.
+
+    Args:
+        G (int): 1-230, number of super space group or object
+        idx (int): index of splitting scheme
+        wp1: list of strings ("4a") or integers (1)
+        group_type (string): 't' or 'k'
+        elements: corresponding chemical species for each wp
+
+    Returns:
+        a wyckoff_split object
+    """
+    if idx is None:
+        return wyckoff_split(G, idx, wp1, group_type, elements)
+
+    hn = sym.pyxtal_hall_numbers[G - 1] if type(G) in [int, np.int64] else G.hall_number
+    key = (hn, idx, group_type, tuple(wp1), None if elements is None else tuple(elements))
+    if key not in _split_cache:
+        if len(_split_cache) >= _split_cache_size:
+            _split_cache.pop(next(iter(_split_cache)))
+        _split_cache[key] = wyckoff_split(G, idx, wp1, group_type, elements)
+    return _split_cache[key]
+
+
 if __name__ == "__main__":
     # sp = wyckoff_split(G=14, idx=1, wp1=['2c', '4e'], group_type='t')
     # print(sp)
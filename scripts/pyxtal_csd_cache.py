@@ -0,0 +1,56 @@
+#!/usr/bin/env  python
+
+from argparse import ArgumentParser
+
+from pyxtal import print_logo
+from pyxtal.database.cache import CSD_cache
+
+if __name__ == "__main__":
+    # -------------------------------- Options -------------------------
+    parser = ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--folder",
+        dest="folder",
+        type=str,
+        help="folder of the CSD cif files to import",
+    )
+    parser.add_argument(
+        "-s",
+        "--smiles",
+        dest="smiles",
+        type=str,
+        help="json or text file of the `refcode smiles` pairs",
+    )
+    parser.add_argument(
+        "-c",
+        "--cache",
+        dest="cache",
+        default=None,
+        type=str,
+        help="cache folder: default $PYXTAL_CSD_CACHE or ~/.cache/pyxtal/csd",
+    )
+    parser.add_argument(
+        "-n",
+        "--ncpu",
+        dest="ncpu",
+        default=1,
+        type=int,
+        help="number of processes to parse the cif files: default 1",
+    )
+    parser.add_argument(
+        "--no-parse",
+        dest="parse",
+        action="store_false",
+        help="only store the cif and smiles without parsing",
+    )
+
+    print_logo()
+    options = parser.parse_args()
+    if options.folder is not None and options.smiles is None:
+        parser.error("-s/--smiles is required to import the cif files")
+
+    cache = CSD_cache(options.cache)
+    if options.folder is not None:
+        cache.import_cifs(options.folder, options.smiles, parse=options.parse, ncpu=options.ncpu)
+    print(cache)
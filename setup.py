@@ -35,6 +35,7 @@ setup(
     scripts=[
         "scripts/pyxtal_main.py",
         "scripts/pyxtal_symmetry.py",
+        "scripts/pyxtal_csd_cache.py",
     ],
     classifiers=[
         "Programming Language :: Python :: 3",